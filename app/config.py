@@ -20,10 +20,44 @@ class Settings(BaseSettings):
     CRAWLER_INTERVAL: int = int(os.environ.get("CRAWLER_INTERVAL", 3600))  # 1 hour in seconds
     NEWS_RETENTION_DAYS: int = int(os.environ.get("NEWS_RETENTION_DAYS", 30))  # Keep news for 30 days
     NEWS_MAX_ITEMS: int = int(os.environ.get("NEWS_MAX_ITEMS", 10000))  # Maximum number of news items to keep
+    NEWS_RETENTION_INTERVAL: int = int(os.environ.get("NEWS_RETENTION_INTERVAL", 3600))  # seconds between retention cleanups
+    NEWS_RETENTION_BATCH_SIZE: int = int(os.environ.get("NEWS_RETENTION_BATCH_SIZE", 500))  # news items deleted per transaction
+    NEWS_RETENTION_BATCH_PAUSE: float = float(os.environ.get("NEWS_RETENTION_BATCH_PAUSE", 0.5))  # seconds between delete batches
+    HIT_FLUSH_INTERVAL: float = float(os.environ.get("HIT_FLUSH_INTERVAL", 30))  # seconds between bulk hit count writes
+    HIT_BUFFER_MAX_URLS: int = int(os.environ.get("HIT_BUFFER_MAX_URLS", 5000))  # buffered URLs that trigger an early write
+    FEED_ONLY_INGEST: bool = os.environ.get("FEED_ONLY_INGEST", "False").lower() in ("true", "1", "t")  # Build RSS items from feed entries without fetching the article
+    ENRICHMENT_INTERVAL: float = float(os.environ.get("ENRICHMENT_INTERVAL", 30))  # seconds between article enrichment batches
+    ENRICHMENT_BATCH_SIZE: int = int(os.environ.get("ENRICHMENT_BATCH_SIZE", 20))  # requested articles fetched per batch
+    ENRICHMENT_MAX_ATTEMPTS: int = int(os.environ.get("ENRICHMENT_MAX_ATTEMPTS", 3))  # failed fetches before giving up on an article
+    ENRICHMENT_REQUEST_FLUSH_INTERVAL: float = float(os.environ.get("ENRICHMENT_REQUEST_FLUSH_INTERVAL", 10))  # seconds between bulk writes of page view requests
+    NEGATIVE_CACHE_RETRY_DELAY: float = float(os.environ.get("NEGATIVE_CACHE_RETRY_DELAY", 3600))  # seconds before a failed article URL is tried again, doubling per failure
+    NEGATIVE_CACHE_TTL: float = float(os.environ.get("NEGATIVE_CACHE_TTL", 604800))  # seconds a failed article URL is remembered
+    NEAR_DUPLICATE_DETECTION: bool = os.environ.get("NEAR_DUPLICATE_DETECTION", "True").lower() in ("true", "1", "t")  # Skip embedding republished copies of stored articles
+    NEAR_DUPLICATE_THRESHOLD: float = float(os.environ.get("NEAR_DUPLICATE_THRESHOLD", 0.6))  # estimated Jaccard similarity of title + summary shingles
     EMBED_TITLE_ONLY: bool = os.environ.get("EMBED_TITLE_ONLY", "True").lower() in ("true", "1", "t")  # Use only title for embeddings
     
     # Crawler Concurrency settings
     MAX_CONCURRENT_REQUESTS: int = int(os.environ.get("MAX_CONCURRENT_REQUESTS", 5))
+    CRAWLER_CONCURRENT_SOURCES: int = int(os.environ.get("CRAWLER_CONCURRENT_SOURCES", 20))  # sources crawled at once
+    CRAWLER_HOST_CONNECTIONS: int = int(os.environ.get("CRAWLER_HOST_CONNECTIONS", 2))  # concurrent requests per host
+    CRAWLER_HOST_DELAY: float = float(os.environ.get("CRAWLER_HOST_DELAY", 1.0))  # seconds between requests to a host
+    INGEST_QUEUE_SIZE: int = int(os.environ.get("INGEST_QUEUE_SIZE", 100))  # articles waiting per ingest stage
+    INGEST_FETCH_WORKERS: int = int(os.environ.get("INGEST_FETCH_WORKERS", 10))  # concurrent article downloads
+    INGEST_EXTRACT_WORKERS: int = int(os.environ.get("INGEST_EXTRACT_WORKERS", 2))  # concurrent content extractions
+    INGEST_CANONICAL_WORKERS: int = int(os.environ.get("INGEST_CANONICAL_WORKERS", 4))  # concurrent canonical link lookups
+    INGEST_DEDUPE_WORKERS: int = int(os.environ.get("INGEST_DEDUPE_WORKERS", 4))  # concurrent near-duplicate checks
+    INGEST_EMBED_WORKERS: int = int(os.environ.get("INGEST_EMBED_WORKERS", 96))  # articles waiting on embeddings at once
+    INGEST_PERSIST_WORKERS: int = int(os.environ.get("INGEST_PERSIST_WORKERS", 4))  # concurrent inserts
+    CRAWLER_MIN_INTERVAL: int = int(os.environ.get("CRAWLER_MIN_INTERVAL", 300))  # shortest adaptive interval per source
+    CRAWLER_MAX_INTERVAL: int = int(os.environ.get("CRAWLER_MAX_INTERVAL", 86400))  # longest adaptive interval per source
+    CRAWLER_TARGET_NEW_ITEMS: float = float(os.environ.get("CRAWLER_TARGET_NEW_ITEMS", 5))  # new items per crawl to aim for
+    CRAWLER_BACKOFF: float = float(os.environ.get("CRAWLER_BACKOFF", 1.5))  # interval growth after a crawl without new items
+    CRAWLER_CYCLE_TIMEOUT: int = int(os.environ.get("CRAWLER_CYCLE_TIMEOUT", 0))  # seconds per crawl cycle, 0 = CRAWLER_INTERVAL
+    CRAWLER_STATS_PATH: str = os.environ.get("CRAWLER_STATS_PATH", "/app/data/crawler_stats.json")  # metrics published for the web app
+    EXTRACTION_WORKERS: int = int(os.environ.get("EXTRACTION_WORKERS", 2))  # processes parsing HTML
+    EXTRACTION_TIMEOUT: float = float(os.environ.get("EXTRACTION_TIMEOUT", 20))  # seconds per page extraction
+    EXTRACTION_MAX_HTML_CHARS: int = int(os.environ.get("EXTRACTION_MAX_HTML_CHARS", 2000000))  # longer pages are cut
+    FETCH_MAX_BYTES: int = int(os.environ.get("FETCH_MAX_BYTES", 5000000))  # bytes read per page, the rest is cut
     REQUEST_TIMEOUT: int = int(os.environ.get("REQUEST_TIMEOUT", 30))  # seconds
     
     # User agent for crawler
@@ -34,14 +68,38 @@ class Settings(BaseSettings):
     
     # Vector dimensions
     VECTOR_DIMENSIONS: int = 1024  # Cohere embed-english-v3.0
+    VECTOR_LOAD_BATCH_SIZE: int = int(os.environ.get("VECTOR_LOAD_BATCH_SIZE", 2000))  # rows per fetch when streaming embeddings
 
     # Visualization Settings
     VISUALIZATION_TIME_RANGE: int = int(os.environ.get("VISUALIZATION_TIME_RANGE", 48))  # hours
     VISUALIZATION_SIMILARITY: float = float(os.environ.get("VISUALIZATION_SIMILARITY", 0.55))  # similarity threshold
+    CLUSTER_SIMILARITY_FLOOR: float = float(os.environ.get("CLUSTER_SIMILARITY_FLOOR", 0.3))  # lowest threshold served from the cluster tree
     
     # FAISS Settings
     FAISS_UPDATE_INTERVAL: int = int(os.environ.get("FAISS_UPDATE_INTERVAL", 3600))  # 1 hour in seconds
     FAISS_MAX_VECTORS: int = int(os.environ.get("FAISS_MAX_VECTORS", 10000))  # Maximum vectors to keep in memory
+    FAISS_INDEX_FACTORY: str = os.environ.get("FAISS_INDEX_FACTORY", "Flat")  # e.g. Flat, HNSW32, IVF256,PQ64, SQ8
+    FAISS_SEARCH_PARAMS: str = os.environ.get("FAISS_SEARCH_PARAMS", "")  # e.g. nprobe=16 (IVF) or efSearch=64 (HNSW)
+    FAISS_RETRAIN_FACTOR: float = float(os.environ.get("FAISS_RETRAIN_FACTOR", 2.0))  # Retrain once the window outgrows the training set by this factor
+    FAISS_SNAPSHOT_DIR: str = os.environ.get("FAISS_SNAPSHOT_DIR", "/app/data/faiss")  # Shared index snapshots
+    FAISS_SNAPSHOT_KEEP: int = int(os.environ.get("FAISS_SNAPSHOT_KEEP", 2))  # Snapshot versions kept on disk
+    FAISS_SNAPSHOT_CHECK_INTERVAL: int = int(os.environ.get("FAISS_SNAPSHOT_CHECK_INTERVAL", 10))  # seconds between checks for a newer snapshot
+    
+    # Embedding Settings
+    EMBEDDING_BATCH_SIZE: int = int(os.environ.get("EMBEDDING_BATCH_SIZE", 96))  # texts per Cohere embed call (max 96)
+    EMBEDDING_BATCH_WAIT: float = float(os.environ.get("EMBEDDING_BATCH_WAIT", 0.2))  # seconds to wait for a batch to fill
+    EMBEDDING_RATE_LIMIT: int = int(os.environ.get("EMBEDDING_RATE_LIMIT", 100))  # Cohere embed calls per minute
+    EMBEDDING_CALL_TIMEOUT: float = float(os.environ.get("EMBEDDING_CALL_TIMEOUT", 30))  # seconds per embed call
+    EMBEDDING_BACKOFF_MAX: float = float(os.environ.get("EMBEDDING_BACKOFF_MAX", 30))  # longest retry delay in seconds
+    EMBEDDING_BREAKER_THRESHOLD: int = int(os.environ.get("EMBEDDING_BREAKER_THRESHOLD", 5))  # consecutive failures before pausing calls
+    EMBEDDING_BREAKER_COOLDOWN: float = float(os.environ.get("EMBEDDING_BREAKER_COOLDOWN", 60))  # seconds calls stay paused
+    EMBEDDING_CACHE_PATH: str = os.environ.get("EMBEDDING_CACHE_PATH", "/app/data/embeddings.db")  # SQLite embedding cache
+    EMBEDDING_CACHE_MAX_ENTRIES: int = int(os.environ.get("EMBEDDING_CACHE_MAX_ENTRIES", 50000))  # ~4 KB per cached embedding
+    EMBEDDING_SEARCH_TIMEOUT: float = float(os.environ.get("EMBEDDING_SEARCH_TIMEOUT", 5))  # seconds interactive requests wait for an embedding
+    
+    # Compute Settings
+    COMPUTE_WORKERS: int = int(os.environ.get("COMPUTE_WORKERS", 2))  # threads running FAISS/NumPy work off the event loop
+    COMPUTE_OMP_THREADS: int = int(os.environ.get("COMPUTE_OMP_THREADS", 2))  # OpenMP/BLAS threads per compute worker
     
     # Ensure SQLite directory exists
     def __init__(self, **data):
@@ -10,7 +10,11 @@ from datetime import datetime
 
 from app.routes import web, api
 from app.services.crawler import start_crawler, stop_crawler
+from app.services.db import AsyncSessionLocal
+from app.services.enrichment import enrichment_requests
 from app.services.faiss_service import get_faiss_service
+from app.services.compute import get_compute_executor
+from app.services.visualization import ensure_dendrogram_table
 from app.config import settings
 
 # Configure logging
@@ -64,7 +68,17 @@ async def startup_event():
     try:
         # Initialize FAISS service
         faiss_service = get_faiss_service()
-        logger.info("FAISS service initialized")
+        if faiss_service.load_snapshot(settings.VISUALIZATION_TIME_RANGE):
+            logger.info(f"FAISS service initialized from snapshot with {faiss_service.index.ntotal} vectors")
+        else:
+            logger.info("FAISS service initialized")
+        
+        # Databases created before the cluster tree lack its table
+        async with AsyncSessionLocal() as session:
+            await ensure_dendrogram_table(session)
+        
+        # Write the enrichment requests of viewed news items in the background
+        app.state.enrichment_requests_task = asyncio.ensure_future(enrichment_requests.run_forever())
         
         # Start crawler if this is the crawler service
         if os.environ.get("SERVICE_TYPE") == "crawler":
@@ -85,6 +99,14 @@ async def shutdown_event():
         if os.environ.get("SERVICE_TYPE") == "crawler":
             await stop_crawler()
             logger.info("Crawler service stopped")
+        
+        # Flush the enrichment requests still in memory
+        enrichment_requests.stop()
+        task = getattr(app.state, "enrichment_requests_task", None)
+        if task:
+            await asyncio.gather(task, return_exceptions=True)
+        
+        get_compute_executor().shutdown()
             
     except Exception as e:
         logger.error(f"Error during shutdown: {str(e)}")
@@ -1,6 +1,6 @@
 from datetime import datetime
 from typing import List, Optional, Any, Dict
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, func, UniqueConstraint, JSON, Index
+from sqlalchemy import Column, Integer, LargeBinary, String, Text, DateTime, ForeignKey, func, UniqueConstraint, JSON, Index
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.dialects.postgresql import ARRAY, FLOAT
 from pgvector.sqlalchemy import Vector
@@ -58,6 +58,88 @@ class NewsClusters(Base):
         return f"<NewsClusters(hours={self.hours}, min_similarity={self.min_similarity})>"
 
 
+class NewsDendrogram(Base):
+    """SQLAlchemy model for pre-generated single-linkage cluster trees."""
+    __tablename__ = "news_dendrogram"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    hours = Column(Integer, nullable=False, unique=True)
+    floor_similarity = Column(FLOAT, nullable=False)  # Lowest threshold the tree can be cut at
+    news_ids = Column(JSON, nullable=False)  # News IDs in tree vertex order
+    edges = Column(JSON, nullable=False)  # [[row, col, similarity], ...] sorted by similarity desc
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    
+    def __repr__(self):
+        return f"<NewsDendrogram(hours={self.hours}, floor_similarity={self.floor_similarity})>"
+
+
+class NewsEnrichment(Base):
+    """SQLAlchemy model for feed-only news items whose article page has not been extracted yet."""
+    __tablename__ = "news_enrichment"
+    
+    news_id = Column(Integer, ForeignKey("news.id", ondelete="CASCADE"), primary_key=True)
+    requested_at = Column(DateTime(timezone=True), nullable=True)  # Set once someone needs the full summary
+    attempts = Column(Integer, nullable=False, default=0)
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    
+    __table_args__ = (
+        # Add index on requested_at for picking the next items to enrich
+        Index('news_enrichment_requested_idx', requested_at),
+    )
+    
+    def __repr__(self):
+        return f"<NewsEnrichment(news_id={self.news_id}, requested_at={self.requested_at})>"
+
+
+class NewsURLAlias(Base):
+    """SQLAlchemy model for other URLs of a news item's article, such as the one it was discovered by."""
+    __tablename__ = "news_url_aliases"
+    
+    alias = Column(Text, primary_key=True)  # Canonicalized URL
+    news_id = Column(Integer, ForeignKey("news.id", ondelete="CASCADE"), nullable=False)
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    
+    __table_args__ = (
+        # Add index on news_id for deleting aliases with their item
+        Index('news_url_aliases_news_id_idx', news_id),
+    )
+    
+    def __repr__(self):
+        return f"<NewsURLAlias(alias={self.alias}, news_id={self.news_id})>"
+
+
+class NewsFingerprint(Base):
+    """SQLAlchemy model for the MinHash signature of a news item's title and summary, used to find near-duplicates."""
+    __tablename__ = "news_fingerprints"
+    
+    news_id = Column(Integer, ForeignKey("news.id", ondelete="CASCADE"), primary_key=True)
+    minhash = Column(LargeBinary, nullable=False)  # 32-bit minimum hashes, big-endian
+    
+    def __repr__(self):
+        return f"<NewsFingerprint(news_id={self.news_id})>"
+
+
+class FailedURL(Base):
+    """SQLAlchemy model for article URLs that recently failed to be ingested."""
+    __tablename__ = "failed_urls"
+    
+    url = Column(Text, primary_key=True)  # Canonicalized URL
+    reason = Column(String(50), nullable=False)  # Why the last attempt failed, e.g. http_404 or extract
+    failures = Column(Integer, nullable=False, default=1)  # Failures since the entry was created
+    first_failed_at = Column(DateTime(timezone=True), nullable=False)
+    last_failed_at = Column(DateTime(timezone=True), nullable=False)
+    retry_at = Column(DateTime(timezone=True), nullable=False)  # Skipped until then
+    expires_at = Column(DateTime(timezone=True), nullable=False)  # Forgotten after then
+    
+    __table_args__ = (
+        # Add index on expires_at for pruning expired entries
+        Index('failed_urls_expires_idx', expires_at),
+    )
+    
+    def __repr__(self):
+        return f"<FailedURL(url={self.url}, reason={self.reason}, failures={self.failures})>"
+
+
 class NewsUMAP(Base):
     """SQLAlchemy model for pre-generated UMAP visualizations."""
     __tablename__ = "news_umap"
@@ -1,5 +1,5 @@
 import sqlite3
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from typing import List, Optional
 from pydantic import BaseModel, HttpUrl, validator
 
@@ -30,11 +30,74 @@ class URL(URLBase):
     created_at: datetime
     updated_at: datetime
     last_crawled_at: Optional[datetime] = None
+    next_crawl_at: Optional[datetime] = None
+    crawl_interval: Optional[int] = None  # Seconds between crawls, adapted to how often the source changes
+    new_items_avg: Optional[float] = None  # Moving average of new items per crawl
+    change_interval_avg: Optional[float] = None  # Moving average of seconds between crawls that found new items
+    last_changed_at: Optional[datetime] = None
+    etag: Optional[str] = None  # Cache validators of the last crawl's response
+    last_modified: Optional[str] = None
+    body_hash: Optional[str] = None  # SHA-256 of the last crawl's response body
+    body_bytes: Optional[int] = None
+    parse_seconds: Optional[float] = None  # Time the last crawl spent parsing the body
     
     class Config:
         from_attributes = True
 
 
+# Per-source crawl statistics, schedule and response cache, added to the urls table
+ADDED_COLUMNS = {
+    'next_crawl_at': 'TEXT',
+    'crawl_interval': 'INTEGER',
+    'new_items_avg': 'REAL',
+    'change_interval_avg': 'REAL',
+    'last_changed_at': 'TEXT',
+    'etag': 'TEXT',
+    'last_modified': 'TEXT',
+    'body_hash': 'TEXT',
+    'body_bytes': 'INTEGER',
+    'parse_seconds': 'REAL'
+}
+
+# Weight of the latest crawl in the moving averages
+STATS_SMOOTHING = 0.3
+
+
+def _parse_time(value: Optional[str]) -> Optional[datetime]:
+    """Parse a stored ISO timestamp."""
+    return datetime.fromisoformat(value) if value else None
+
+
+def _format_time(value: datetime) -> str:
+    """Format a timestamp so stored values sort chronologically as text."""
+    return value.astimezone(timezone.utc).isoformat(timespec='microseconds')
+
+
+def next_crawl_interval(
+    interval: float,
+    new_items: int,
+    change_interval_avg: Optional[float],
+    min_interval: float,
+    max_interval: float,
+    target_new_items: float,
+    backoff: float
+) -> float:
+    """
+    Adapt a source's crawl interval to the result of its latest crawl.
+    
+    Crawls that find nothing new back off geometrically. Crawls that find new
+    items reset the interval to the average time between changes, shortened
+    in proportion when a crawl finds more than target_new_items, so fast
+    feeds are polled often enough not to miss items.
+    """
+    if new_items > 0:
+        interval = change_interval_avg or interval
+        interval *= min(1.0, target_new_items / new_items)
+    else:
+        interval *= backoff
+    return min(max(interval, min_interval), max_interval)
+
+
 class URLDatabase:
     """SQLite database operations for URL management."""
     
@@ -42,6 +105,27 @@ class URLDatabase:
         self.db_path = db_path
         self._create_tables()
     
+    def _row_to_url(self, row: sqlite3.Row) -> URL:
+        """Convert a database row to a URL model."""
+        return URL(
+            id=row['id'],
+            url=row['url'],
+            type=row['type'],
+            created_at=datetime.fromisoformat(row['created_at']),
+            updated_at=datetime.fromisoformat(row['updated_at']),
+            last_crawled_at=_parse_time(row['last_crawled_at']),
+            next_crawl_at=_parse_time(row['next_crawl_at']),
+            crawl_interval=row['crawl_interval'],
+            new_items_avg=row['new_items_avg'],
+            change_interval_avg=row['change_interval_avg'],
+            last_changed_at=_parse_time(row['last_changed_at']),
+            etag=row['etag'],
+            last_modified=row['last_modified'],
+            body_hash=row['body_hash'],
+            body_bytes=row['body_bytes'],
+            parse_seconds=row['parse_seconds']
+        )
+    
     def _create_tables(self):
         """Create tables if they don't exist."""
         conn = sqlite3.connect(self.db_path)
@@ -58,6 +142,14 @@ class URLDatabase:
         )
         ''')
         
+        # Add the crawl schedule and cache columns to databases created before they existed
+        existing = {row[1] for row in cursor.execute('PRAGMA table_info(urls)')}
+        for column, column_type in ADDED_COLUMNS.items():
+            if column not in existing:
+                cursor.execute(f'ALTER TABLE urls ADD COLUMN {column} {column_type}')
+        
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_urls_next_crawl_at ON urls (next_crawl_at)')
+        
         conn.commit()
         conn.close()
     
@@ -101,15 +193,7 @@ class URLDatabase:
         
         urls = []
         for row in rows:
-            url = URL(
-                id=row['id'],
-                url=row['url'],
-                type=row['type'],
-                created_at=datetime.fromisoformat(row['created_at']),
-                updated_at=datetime.fromisoformat(row['updated_at']),
-                last_crawled_at=datetime.fromisoformat(row['last_crawled_at']) if row['last_crawled_at'] else None
-            )
-            urls.append(url)
+            urls.append(self._row_to_url(row))
         
         conn.close()
         return urls
@@ -127,33 +211,119 @@ class URLDatabase:
             conn.close()
             return None
         
-        url = URL(
-            id=row['id'],
-            url=row['url'],
-            type=row['type'],
-            created_at=datetime.fromisoformat(row['created_at']),
-            updated_at=datetime.fromisoformat(row['updated_at']),
-            last_crawled_at=datetime.fromisoformat(row['last_crawled_at']) if row['last_crawled_at'] else None
-        )
+        url = self._row_to_url(row)
         
         conn.close()
         return url
     
-    def update_url_crawl_time(self, url_id: int) -> bool:
-        """Update the last crawled time for a URL."""
+    def update_url_crawl_time(
+        self,
+        url_id: int,
+        new_items: Optional[int] = None,
+        crawled_at: Optional[datetime] = None,
+        default_interval: float = 3600,
+        min_interval: float = 300,
+        max_interval: float = 86400,
+        target_new_items: float = 5,
+        backoff: float = 1.5
+    ) -> bool:
+        """
+        Record a crawl of a URL and schedule its next one.
+        
+        Args:
+            url_id: URL ID
+            new_items: Number of new items the crawl found, None if it failed
+            crawled_at: Time the crawl started, defaults to now
+            default_interval: Crawl interval of sources without history
+            min_interval: Shortest crawl interval in seconds
+            max_interval: Longest crawl interval in seconds
+            target_new_items: New items per crawl the interval aims for
+            backoff: Factor the interval grows by after a crawl without new items
+        """
         conn = sqlite3.connect(self.db_path)
+        conn.row_factory = sqlite3.Row
         cursor = conn.cursor()
         
+        cursor.execute('SELECT * FROM urls WHERE id = ?', (url_id,))
+        row = cursor.fetchone()
+        if not row:
+            conn.close()
+            return False
+        
         # Use timezone-aware UTC time
-        now = datetime.now(timezone.utc).isoformat()
+        now = crawled_at or datetime.now(timezone.utc)
+        interval = row['crawl_interval'] or default_interval
+        new_items_avg = row['new_items_avg']
+        change_interval_avg = row['change_interval_avg']
+        last_changed_at = _parse_time(row['last_changed_at'])
+        
+        # Failed crawls keep the current interval and statistics
+        if new_items is not None:
+            new_items_avg = new_items if new_items_avg is None else \
+                STATS_SMOOTHING * new_items + (1 - STATS_SMOOTHING) * new_items_avg
+            
+            if new_items > 0:
+                if last_changed_at is not None:
+                    since_change = (now - last_changed_at).total_seconds()
+                    change_interval_avg = since_change if change_interval_avg is None else \
+                        STATS_SMOOTHING * since_change + (1 - STATS_SMOOTHING) * change_interval_avg
+                last_changed_at = now
+            
+            interval = next_crawl_interval(
+                interval,
+                new_items,
+                change_interval_avg,
+                min_interval,
+                max_interval,
+                target_new_items,
+                backoff
+            )
+        
+        cursor.execute(
+            '''
+            UPDATE urls
+            SET last_crawled_at = ?, updated_at = ?, next_crawl_at = ?, crawl_interval = ?,
+                new_items_avg = ?, change_interval_avg = ?, last_changed_at = ?
+            WHERE id = ?
+            ''',
+            (
+                now.isoformat(),
+                datetime.now(timezone.utc).isoformat(),
+                _format_time(now + timedelta(seconds=interval)),
+                int(interval),
+                new_items_avg,
+                change_interval_avg,
+                last_changed_at.isoformat() if last_changed_at else None,
+                url_id
+            )
+        )
+        
+        rows_affected = cursor.rowcount
+        conn.commit()
+        conn.close()
+        
+        return rows_affected > 0
+    
+    def update_url_validators(
+        self,
+        url_id: int,
+        etag: Optional[str],
+        last_modified: Optional[str],
+        body_hash: str,
+        body_bytes: int,
+        parse_seconds: Optional[float]
+    ) -> bool:
+        """Store the cache validators and body hash of a URL's latest response."""
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
         
         cursor.execute(
             '''
             UPDATE urls
-            SET last_crawled_at = ?, updated_at = ?
+            SET etag = ?, last_modified = ?, body_hash = ?, body_bytes = ?, parse_seconds = ?
             WHERE id = ?
             ''',
-            (now, now, url_id)
+            (etag, last_modified, body_hash, body_bytes, parse_seconds, url_id)
         )
         
         rows_affected = cursor.rowcount
@@ -176,25 +346,37 @@ class URLDatabase:
         return rows_affected > 0
     
     def get_urls_to_crawl(self) -> List[URL]:
-        """Get all URLs that need to be crawled."""
+        """Get the URLs that are due for a crawl, most overdue first."""
         conn = sqlite3.connect(self.db_path)
         conn.row_factory = sqlite3.Row
         cursor = conn.cursor()
         
-        cursor.execute('SELECT * FROM urls')
+        # New URLs have no schedule yet and sort first
+        cursor.execute(
+            'SELECT * FROM urls WHERE next_crawl_at IS NULL OR next_crawl_at <= ? ORDER BY next_crawl_at',
+            (_format_time(datetime.now(timezone.utc)),)
+        )
         rows = cursor.fetchall()
         
         urls = []
         for row in rows:
-            url = URL(
-                id=row['id'],
-                url=row['url'],
-                type=row['type'],
-                created_at=datetime.fromisoformat(row['created_at']),
-                updated_at=datetime.fromisoformat(row['updated_at']),
-                last_crawled_at=datetime.fromisoformat(row['last_crawled_at']) if row['last_crawled_at'] else None
-            )
-            urls.append(url)
+            urls.append(self._row_to_url(row))
         
         conn.close()
         return urls
+    
+    def get_next_crawl_time(self) -> Optional[datetime]:
+        """Get the time the next URL becomes due, or None if there are no URLs."""
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        
+        cursor.execute('SELECT COUNT(*), COUNT(next_crawl_at), MIN(next_crawl_at) FROM urls')
+        total, scheduled, next_crawl_at = cursor.fetchone()
+        
+        conn.close()
+        if not total:
+            return None
+        # URLs without a schedule are due right away
+        if scheduled < total:
+            return datetime.now(timezone.utc)
+        return _parse_time(next_crawl_at)
@@ -20,8 +20,10 @@ from app.models.news import (
 )
 from app.services.db import get_db, url_db
 from app.services.embedding import get_embedding_service, EmbeddingService
-from app.services.visualization import generate_clusters, generate_umap_visualization
+from app.services.visualization import generate_clusters, generate_umap_visualization, get_clusters_at_threshold
 from app.services.faiss_service import get_faiss_service
+from app.services.compute import get_compute_executor
+from app.services.crawler_stats import read_crawler_stats
 from app.config import settings
 
 logger = logging.getLogger(__name__)
@@ -51,6 +53,32 @@ async def get_news_umap(db: AsyncSession = Depends(get_db)):
         logging.error(f"UMAP visualization error: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
+# ---- Stats Endpoints ----
+
+@router.get("/stats/compute", response_model=Dict)
+async def get_compute_stats():
+    """Get queue depth and execution time metrics of the compute executor."""
+    return get_compute_executor().stats()
+
+@router.get("/stats/embedding-cache", response_model=Dict)
+async def get_embedding_cache_stats(embedding_service: EmbeddingService = Depends(get_embedding_service)):
+    """Get hit/miss counters and size of the embedding cache."""
+    return await embedding_service.cache.stats()
+
+@router.get("/stats/crawler", response_model=Dict)
+async def get_crawler_stats():
+    """
+    Get the metrics the crawler service last published.
+
+    Covers crawl cycles, sources, fetches, the ingest pipeline, extraction,
+    the hit buffer, retention, enrichment, the negative cache, URL aliases
+    and the near-duplicate index.
+    """
+    stats = read_crawler_stats()
+    if stats is None:
+        raise HTTPException(status_code=404, detail="The crawler has not published any stats yet")
+    return stats
+
 # ---- URL Endpoints ----
 
 @router.get("/urls", response_model=List[URL])
@@ -124,7 +152,7 @@ async def search_news(
             raise HTTPException(status_code=422, detail="Cohere API key not configured")
         
         # Generate embedding for the query
-        query_embedding = await embedding_service.get_embedding(query)
+        query_embedding = await embedding_service.get_embedding(query, timeout=settings.EMBEDDING_SEARCH_TIMEOUT)
         
         if not query_embedding:
             raise HTTPException(status_code=422, detail="Failed to generate embedding")
@@ -219,10 +247,86 @@ async def search_news(
         logging.error(f"Search error: {str(e)}")
         raise HTTPException(status_code=422, detail=str(e))
 
+def _serialize_clusters(cluster_data: Dict) -> Dict[str, List[Dict]]:
+    """Convert clusters to a dictionary with string keys and serialized items."""
+    serialized_clusters = {}
+    for cluster_id, items in cluster_data.items():
+        serialized_items = []
+        for item in items:
+            # Handle both dictionaries and objects
+            if isinstance(item, dict):
+                # Use get() for all fields to handle missing values safely
+                item_dict = {
+                    'id': item.get('id', 0),
+                    'title': item.get('title', ''),
+                    'summary': item.get('summary', None),
+                    'url': item.get('url', ''),
+                    'source_url': item.get('source_url', ''),
+                    'similarity': item.get('similarity', 0.0),
+                    'hit_count': item.get('hit_count', 1),
+                }
+                
+                # Handle datetime fields carefully
+                first_seen = item.get('first_seen_at')
+                if first_seen:
+                    item_dict['first_seen_at'] = first_seen.isoformat() if hasattr(first_seen, 'isoformat') else first_seen
+                else:
+                    item_dict['first_seen_at'] = datetime.now().isoformat()
+                    
+                last_seen = item.get('last_seen_at')
+                if last_seen:
+                    item_dict['last_seen_at'] = last_seen.isoformat() if hasattr(last_seen, 'isoformat') else last_seen
+                else:
+                    item_dict['last_seen_at'] = datetime.now().isoformat()
+                    
+                created_at = item.get('created_at')
+                if created_at:
+                    item_dict['created_at'] = created_at.isoformat() if hasattr(created_at, 'isoformat') else created_at
+                else:
+                    item_dict['created_at'] = datetime.now().isoformat()
+                    
+                updated_at = item.get('updated_at')
+                if updated_at:
+                    item_dict['updated_at'] = updated_at.isoformat() if hasattr(updated_at, 'isoformat') else updated_at
+                else:
+                    item_dict['updated_at'] = datetime.now().isoformat()
+            else:
+                item_dict = {
+                    'id': item.id,
+                    'title': item.title,
+                    'summary': item.summary,
+                    'url': item.url,
+                    'source_url': item.source_url,
+                    'similarity': item.similarity,
+                    'first_seen_at': item.first_seen_at.isoformat() if hasattr(item.first_seen_at, 'isoformat') else item.first_seen_at,
+                    'last_seen_at': item.last_seen_at.isoformat() if hasattr(item.last_seen_at, 'isoformat') else item.last_seen_at,
+                    'hit_count': item.hit_count,
+                    'created_at': item.created_at.isoformat() if hasattr(item.created_at, 'isoformat') else item.created_at,
+                    'updated_at': item.updated_at.isoformat() if hasattr(item.updated_at, 'isoformat') else item.updated_at
+                }
+            serialized_items.append(item_dict)
+        
+        # Convert numeric cluster_id to string for JSON compatibility
+        serialized_clusters[str(cluster_id)] = serialized_items
+        
+    return serialized_clusters
+
 @router.get("/news/clusters", response_model=Dict[str, List[Dict]])
-async def get_news_clusters(db: AsyncSession = Depends(get_db)):
+async def get_news_clusters(
+    db: AsyncSession = Depends(get_db),
+    min_similarity: Optional[float] = Query(None, ge=0.0, le=1.0)
+):
     """Get clustered news items based on vector similarity."""
     try:
+        if min_similarity is not None and min_similarity != settings.VISUALIZATION_SIMILARITY:
+            # Serve other thresholds from the pre-generated cluster tree
+            cluster_data = await get_clusters_at_threshold(
+                db,
+                settings.VISUALIZATION_TIME_RANGE,
+                min_similarity
+            )
+            return _serialize_clusters(cluster_data)
+        
         # Try to get pre-generated clusters
         result = await db.execute(
             select(NewsClusters).filter(
@@ -236,7 +340,11 @@ async def get_news_clusters(db: AsyncSession = Depends(get_db)):
             cluster_data = clusters.clusters
         else:
             # If no pre-generated clusters, generate them now
-            cluster_data = await generate_clusters(db)
+            cluster_data = await generate_clusters(
+                db,
+                settings.VISUALIZATION_TIME_RANGE,
+                settings.VISUALIZATION_SIMILARITY
+            )
             
             # Store the newly generated clusters in the database
             new_clusters = NewsClusters(
@@ -247,68 +355,7 @@ async def get_news_clusters(db: AsyncSession = Depends(get_db)):
             db.add(new_clusters)
             await db.commit()
         
-        # Convert to dictionary with string keys and serialized items
-        serialized_clusters = {}
-        for cluster_id, items in cluster_data.items():
-            serialized_items = []
-            for item in items:
-                # Handle both dictionaries and objects
-                if isinstance(item, dict):
-                    # Use get() for all fields to handle missing values safely
-                    item_dict = {
-                        'id': item.get('id', 0),
-                        'title': item.get('title', ''),
-                        'summary': item.get('summary', None),
-                        'url': item.get('url', ''),
-                        'source_url': item.get('source_url', ''),
-                        'similarity': item.get('similarity', 0.0),
-                        'hit_count': item.get('hit_count', 1),
-                    }
-                    
-                    # Handle datetime fields carefully
-                    first_seen = item.get('first_seen_at')
-                    if first_seen:
-                        item_dict['first_seen_at'] = first_seen.isoformat() if hasattr(first_seen, 'isoformat') else first_seen
-                    else:
-                        item_dict['first_seen_at'] = datetime.now().isoformat()
-                        
-                    last_seen = item.get('last_seen_at')
-                    if last_seen:
-                        item_dict['last_seen_at'] = last_seen.isoformat() if hasattr(last_seen, 'isoformat') else last_seen
-                    else:
-                        item_dict['last_seen_at'] = datetime.now().isoformat()
-                        
-                    created_at = item.get('created_at')
-                    if created_at:
-                        item_dict['created_at'] = created_at.isoformat() if hasattr(created_at, 'isoformat') else created_at
-                    else:
-                        item_dict['created_at'] = datetime.now().isoformat()
-                        
-                    updated_at = item.get('updated_at')
-                    if updated_at:
-                        item_dict['updated_at'] = updated_at.isoformat() if hasattr(updated_at, 'isoformat') else updated_at
-                    else:
-                        item_dict['updated_at'] = datetime.now().isoformat()
-                else:
-                    item_dict = {
-                        'id': item.id,
-                        'title': item.title,
-                        'summary': item.summary,
-                        'url': item.url,
-                        'source_url': item.source_url,
-                        'similarity': item.similarity,
-                        'first_seen_at': item.first_seen_at.isoformat() if hasattr(item.first_seen_at, 'isoformat') else item.first_seen_at,
-                        'last_seen_at': item.last_seen_at.isoformat() if hasattr(item.last_seen_at, 'isoformat') else item.last_seen_at,
-                        'hit_count': item.hit_count,
-                        'created_at': item.created_at.isoformat() if hasattr(item.created_at, 'isoformat') else item.created_at,
-                        'updated_at': item.updated_at.isoformat() if hasattr(item.updated_at, 'isoformat') else item.updated_at
-                    }
-                serialized_items.append(item_dict)
-            
-            # Convert numeric cluster_id to string for JSON compatibility
-            serialized_clusters[str(cluster_id)] = serialized_items
-            
-        return serialized_clusters
+        return _serialize_clusters(cluster_data)
         
     except Exception as e:
         logging.error(f"Clustering error: {str(e)}")
@@ -3,6 +3,7 @@ from fastapi import APIRouter, Request, Form, Depends, HTTPException, Query
 from fastapi.responses import HTMLResponse, RedirectResponse, JSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func, text
+from sqlalchemy.orm import defer
 from typing import List, Optional, Dict
 import time
 from datetime import datetime, timedelta, timezone
@@ -12,9 +13,12 @@ from app.models.url import URL, URLCreate, URLDatabase
 from app.models.news import NewsItem, NewsClusters, NewsUMAP
 from app.models.preference_vector import PreferenceVector, PreferenceVectorCreate, PreferenceVectorResponse
 from app.services.db import get_db, url_db
-from app.services.visualization import generate_clusters, generate_umap_visualization, update_visualizations
+from app.services.visualization import generate_clusters, generate_umap_visualization, get_clusters_at_threshold, update_visualizations
 from app.services.embedding import get_embedding_service
+from app.services.enrichment import enrichment_requests
 from app.services.faiss_service import get_faiss_service
+from app.services.vector_loader import VectorBatch, load_vectors
+from app.services.compute import get_compute_executor
 from app.config import settings
 
 # Configure logging
@@ -22,14 +26,66 @@ import logging
 logger = logging.getLogger(__name__)    
 router = APIRouter()
 
+def _score_news_items(
+    batch: VectorBatch,
+    news_items: List[NewsItem],
+    preference_vectors: List[PreferenceVector]
+) -> List[dict]:
+    """Score news items by their positive cosine similarity to the preference vectors."""
+    scored_items = []
+    
+    try:
+        # Normalize news and preference vectors, dropping zero vectors
+        news_norms = np.linalg.norm(batch.vectors, axis=1)
+        news_valid = news_norms > 0
+        news_matrix = batch.vectors[news_valid] / news_norms[news_valid, None]
+        positions = {int(news_id): i for i, news_id in enumerate(batch.ids[news_valid])}
+
+        pv_list = [pv for pv in preference_vectors if pv.embedding is not None]
+        pv_matrix = np.array([pv.embedding.tolist() for pv in pv_list], dtype=np.float32).reshape(-1, news_matrix.shape[1])
+        pv_norms = np.linalg.norm(pv_matrix, axis=1)
+        pv_valid = np.flatnonzero(pv_norms > 0)
+        pv_matrix = pv_matrix[pv_valid] / pv_norms[pv_valid, None]
+
+        # Cosine similarity of every news item to every preference vector at once
+        similarities = news_matrix @ pv_matrix.T
+        # Only consider positive similarities
+        positive = np.where(similarities > 0, similarities, 0)
+        total_scores = positive.sum(axis=1)
+        
+        for item in news_items:
+            row = positions.get(item.id)
+            if row is None:
+                continue
+            
+            # Top 5 positively similar vectors
+            top = np.argsort(-similarities[row], kind="stable")[:5]
+            top_vectors = [
+                {'vector': pv_list[pv_valid[j]], 'score': float(similarities[row, j])}
+                for j in top
+                if similarities[row, j] > 0
+            ]
+            
+            scored_items.append({
+                'item': item,
+                'total_score': float(total_scores[row]),
+                'top_vectors': top_vectors
+            })
+    except Exception as e:
+        logger.error(f"Error scoring news items: {str(e)}")
+    
+    return scored_items
+
 @router.get("/", response_class=HTMLResponse)
 async def index(request: Request, db: AsyncSession = Depends(get_db)):
     """Render the home page."""
-    # Get news items from last 24 hours
+    # Get news item embeddings from last 24 hours
     time_filter = datetime.now(timezone.utc) - timedelta(hours=24)
-    query = select(NewsItem).filter(
-        NewsItem.last_seen_at >= time_filter,
-        NewsItem.embedding.isnot(None)  # Use isnot(None) for proper NULL check
+    batch = await load_vectors(db, since=time_filter)
+    
+    # Load the listed items without their embedding column
+    query = select(NewsItem).options(defer(NewsItem.embedding)).filter(
+        NewsItem.id.in_(batch.ids.tolist())
     ).order_by(NewsItem.last_seen_at.desc())
     result = await db.execute(query)
     news_items = result.scalars().all()
@@ -40,59 +96,13 @@ async def index(request: Request, db: AsyncSession = Depends(get_db)):
     result = await db.execute(query)
     preference_vectors = result.scalars().all()
     
-    # Calculate proximity scores for each news item
-    scored_items = []
-    
-    for item in news_items:
-        try:
-            # Skip if no embedding
-            if item.embedding is None:
-                continue
-                
-            # Calculate similarity to each preference vector
-            vector_scores = []
-            total_score = 0
-            
-            for pv in preference_vectors:
-                if pv.embedding is None:
-                    continue
-                    
-                # Calculate cosine similarity
-                news_vector = np.array(item.embedding.tolist(), dtype=np.float32)
-                pv_vector = np.array(pv.embedding.tolist(), dtype=np.float32)
-                
-                # Normalize vectors
-                news_norm = np.linalg.norm(news_vector)
-                pv_norm = np.linalg.norm(pv_vector)
-                
-                if news_norm == 0 or pv_norm == 0:
-                    continue
-                    
-                news_vector = news_vector / news_norm
-                pv_vector = pv_vector / pv_norm
-                
-                # Calculate similarity
-                similarity = float(np.dot(news_vector, pv_vector))
-                
-                if similarity > 0:  # Only consider positive similarities
-                    vector_scores.append({
-                        'vector': pv,
-                        'score': similarity
-                    })
-                    total_score += similarity
-            
-            # Sort vector scores and get top 5
-            vector_scores.sort(key=lambda x: x['score'], reverse=True)
-            top_vectors = vector_scores[:5]
-            
-            scored_items.append({
-                'item': item,
-                'total_score': total_score,
-                'top_vectors': top_vectors
-            })
-        except Exception as e:
-            logger.error(f"Error processing item {item.id}: {str(e)}")
-            continue
+    # Calculate proximity scores for each news item on a compute worker
+    scored_items = await get_compute_executor().run(
+        _score_news_items,
+        batch,
+        news_items,
+        preference_vectors
+    )
     
     # Sort items by total score
     scored_items.sort(key=lambda x: x['total_score'], reverse=True)
@@ -269,6 +279,9 @@ async def view_news_item(
     if not news_item:
         raise HTTPException(status_code=404, detail="News item not found")
     
+    # Have the crawler extract the full article if the item came from a feed entry alone
+    enrichment_requests.add([news_item.id])
+    
     # Get related news items (from same source)
     related_query = select(NewsItem).filter(
         NewsItem.source_url == news_item.source_url,
@@ -306,28 +319,40 @@ async def search_form(request: Request):
 @router.get("/clusters", response_class=HTMLResponse)
 async def view_clusters(
     request: Request,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    min_similarity: Optional[float] = Query(None, ge=0.0, le=1.0)
 ):
     """Render the news clusters page."""
     try:
-        # Try to get pre-generated clusters
-        result = await db.execute(
-            select(NewsClusters).filter(
-                NewsClusters.hours == settings.VISUALIZATION_TIME_RANGE,
-                NewsClusters.min_similarity == settings.VISUALIZATION_SIMILARITY
-            ).order_by(NewsClusters.created_at.desc())
-        )
-        clusters = result.scalars().first()
+        if min_similarity is None:
+            min_similarity = settings.VISUALIZATION_SIMILARITY
         
-        # If no pre-generated clusters found, generate them with parameters
-        if not clusters:
-            clusters_data = await generate_clusters(
+        if min_similarity != settings.VISUALIZATION_SIMILARITY:
+            # Cut the pre-generated cluster tree at the requested threshold
+            clusters_data = await get_clusters_at_threshold(
                 db,
                 hours=settings.VISUALIZATION_TIME_RANGE,
-                min_similarity=settings.VISUALIZATION_SIMILARITY
+                min_similarity=min_similarity
             )
         else:
-            clusters_data = clusters.clusters
+            # Try to get pre-generated clusters
+            result = await db.execute(
+                select(NewsClusters).filter(
+                    NewsClusters.hours == settings.VISUALIZATION_TIME_RANGE,
+                    NewsClusters.min_similarity == settings.VISUALIZATION_SIMILARITY
+                ).order_by(NewsClusters.created_at.desc())
+            )
+            clusters = result.scalars().first()
+            
+            # If no pre-generated clusters found, generate them with parameters
+            if not clusters:
+                clusters_data = await generate_clusters(
+                    db,
+                    hours=settings.VISUALIZATION_TIME_RANGE,
+                    min_similarity=settings.VISUALIZATION_SIMILARITY
+                )
+            else:
+                clusters_data = clusters.clusters
             
         # Convert clusters data to JSON-serializable format
         serializable_clusters = {}
@@ -359,7 +384,8 @@ async def view_clusters(
                 "request": request,
                 "initial_clusters": serializable_clusters,
                 "hours": settings.VISUALIZATION_TIME_RANGE,
-                "min_similarity": settings.VISUALIZATION_SIMILARITY * 100,  # Convert to percentage for display
+                "min_similarity": min_similarity * 100,  # Convert to percentage for display
+                "similarity_floor": settings.CLUSTER_SIMILARITY_FLOOR * 100,
                 "enable_url_management": settings.ENABLE_URL_MANAGEMENT,
                 "enable_preference_management": settings.ENABLE_PREFERENCE_MANAGEMENT
             }
@@ -499,7 +525,7 @@ async def create_preference_vector(
         embedding_service = get_embedding_service()
         
         # Generate embedding from description
-        embedding = await embedding_service.get_embedding(description)
+        embedding = await embedding_service.get_embedding(description, timeout=settings.EMBEDDING_SEARCH_TIMEOUT)
         
         # Create vector with embedding
         vector = PreferenceVector(
@@ -562,7 +588,7 @@ async def update_preference_vector(
         embedding_service = get_embedding_service()
         
         # Generate new embedding from updated description
-        embedding = await embedding_service.get_embedding(description)
+        embedding = await embedding_service.get_embedding(description, timeout=settings.EMBEDDING_SEARCH_TIMEOUT)
         
         # Update vector with new embedding
         result = await db.execute(select(PreferenceVector).filter(PreferenceVector.id == vector_id))
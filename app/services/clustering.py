@@ -0,0 +1,215 @@
+"""Similarity-graph clustering for normalized embedding vectors."""
+import logging
+from typing import Dict, Iterator, List, Sequence, Tuple
+import numpy as np
+from scipy.sparse import coo_matrix
+from scipy.sparse.csgraph import connected_components, minimum_spanning_tree
+
+logger = logging.getLogger(__name__)
+
+# Number of query rows compared against the full matrix per block
+DEFAULT_BLOCK_SIZE = 1024
+
+# Number of buffered edges above which single_linkage_tree reduces them to a forest early
+MAX_PENDING_EDGES = 20_000_000
+
+
+def _similarity_blocks(
+    vectors: np.ndarray,
+    min_similarity: float,
+    block_size: int
+) -> Iterator[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+    """Yield the (rows, cols, similarities) edges of each row block with rows < cols."""
+    n = vectors.shape[0]
+    for start in range(0, n, block_size):
+        end = min(start + block_size, n)
+        # Only compare against later rows so every pair is visited once
+        block = vectors[start:end] @ vectors[start:].T
+        r, c = np.nonzero(block >= min_similarity)
+        upper = c + start > r + start
+        r, c = r[upper], c[upper]
+        yield r + start, c + start, block[r, c].astype(np.float32)
+
+
+def similarity_edges(
+    vectors: np.ndarray,
+    min_similarity: float,
+    block_size: int = DEFAULT_BLOCK_SIZE
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Build the thresholded cosine similarity graph of a set of vectors.
+
+    Args:
+        vectors: Row-normalized float32 matrix of shape (n, d)
+        min_similarity: Minimum cosine similarity for an edge
+        block_size: Number of rows compared per matrix product
+
+    Returns:
+        Tuple of (rows, cols, similarities) with rows < cols
+    """
+    rows, cols, sims = [], [], []
+    for r, c, s in _similarity_blocks(vectors, min_similarity, block_size):
+        rows.append(r)
+        cols.append(c)
+        sims.append(s)
+
+    if not rows:
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty, np.empty(0, dtype=np.float32)
+
+    return np.concatenate(rows), np.concatenate(cols), np.concatenate(sims)
+
+
+def component_labels(n: int, rows: np.ndarray, cols: np.ndarray) -> np.ndarray:
+    """Label the connected components of an undirected graph given as an edge list."""
+    graph = coo_matrix((np.ones(len(rows), dtype=np.int8), (rows, cols)), shape=(n, n))
+    _, labels = connected_components(graph, directed=False)
+    return labels
+
+
+def _label_groups(labels: np.ndarray) -> List[np.ndarray]:
+    """Split component labels into member index arrays ordered by lowest member."""
+    order = np.argsort(labels, kind="stable")
+    boundaries = np.flatnonzero(np.diff(labels[order])) + 1
+    groups = [g for g in np.split(order, boundaries) if len(g) > 1]
+    groups.sort(key=lambda g: g[0])
+    return groups
+
+
+def clusters_from_edges(
+    news_ids: Sequence[int],
+    rows: np.ndarray,
+    cols: np.ndarray,
+    sims: np.ndarray
+) -> Dict[int, List[dict]]:
+    """
+    Turn a similarity edge list into the cluster format used by the visualizations.
+
+    Clusters are the connected components of the edges, numbered in order of
+    their lowest member index, with singletons dropped. Each item's similarity
+    is its strongest edge to the rest of its cluster, which is its similarity
+    to its nearest neighbour whether the edges are the full thresholded graph
+    or a cut of its spanning forest.
+    """
+    n = len(news_ids)
+    labels = component_labels(n, rows, cols)
+
+    strongest = np.zeros(n, dtype=np.float64)
+    np.maximum.at(strongest, rows, sims)
+    np.maximum.at(strongest, cols, sims)
+
+    return {
+        cluster_id: [
+            {'id': news_ids[idx], 'similarity': float(strongest[idx])}
+            for idx in members
+        ]
+        for cluster_id, members in enumerate(_label_groups(labels))
+    }
+
+
+def transitive_clusters(
+    vectors: np.ndarray,
+    news_ids: Sequence[int],
+    min_similarity: float
+) -> Dict[int, List[dict]]:
+    """
+    Group vectors that are transitively connected above a similarity threshold.
+
+    This is single-linkage clustering at a fixed cut: two items share a cluster
+    if a chain of pairwise similarities >= min_similarity connects them.
+    Clusters are numbered and scored as described in clusters_from_edges.
+    """
+    n = vectors.shape[0]
+    if n == 0:
+        return {}
+
+    rows, cols, sims = similarity_edges(vectors, min_similarity)
+    clusters = clusters_from_edges(news_ids, rows, cols, sims)
+
+    logger.info(f"Found {len(clusters)} clusters from {len(rows)} edges over {n} vectors")
+    return clusters
+
+
+def _spanning_forest(
+    n: int,
+    rows: np.ndarray,
+    cols: np.ndarray,
+    sims: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Reduce an edge list to its maximum-similarity spanning forest."""
+    # Similarities lie in [-1, 1]; shift them into strictly positive distances
+    # because the sparse MST treats zero weights as missing edges
+    graph = coo_matrix((2.0 - sims.astype(np.float64), (rows, cols)), shape=(n, n))
+    forest = minimum_spanning_tree(graph).tocoo()
+    return forest.row.astype(np.int64), forest.col.astype(np.int64), (2.0 - forest.data).astype(np.float32)
+
+
+def single_linkage_tree(
+    vectors: np.ndarray,
+    floor_similarity: float,
+    block_size: int = DEFAULT_BLOCK_SIZE
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Compute the single-linkage dendrogram of a set of vectors as a spanning forest.
+
+    The spanning forest is built once from all edges above the floor. Only if
+    more than MAX_PENDING_EDGES edges pile up are they reduced to their forest
+    early, so memory stays bounded on very dense graphs. Cutting it at any
+    threshold >= floor_similarity yields the same clusters as transitive_clusters.
+
+    Args:
+        vectors: Row-normalized float32 matrix of shape (n, d)
+        floor_similarity: Lowest threshold the tree can be cut at
+        block_size: Number of rows compared per matrix product
+
+    Returns:
+        Tuple of (rows, cols, similarities) sorted by descending similarity
+    """
+    n = vectors.shape[0]
+    rows, cols, sims = [], [], []
+    pending = 0
+
+    for r, c, s in _similarity_blocks(vectors, floor_similarity, block_size):
+        rows.append(r)
+        cols.append(c)
+        sims.append(s)
+        pending += len(r)
+        if pending > MAX_PENDING_EDGES:
+            # The MST of (forest so far + new edges) equals the MST of all edges seen
+            forest = _spanning_forest(n, np.concatenate(rows), np.concatenate(cols), np.concatenate(sims))
+            rows, cols, sims = [forest[0]], [forest[1]], [forest[2]]
+            pending = len(forest[0])
+
+    if rows:
+        rows, cols, sims = _spanning_forest(n, np.concatenate(rows), np.concatenate(cols), np.concatenate(sims))
+    else:
+        rows, cols = np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+        sims = np.empty(0, dtype=np.float32)
+
+    order = np.argsort(-sims, kind="stable")
+    return rows[order], cols[order], sims[order]
+
+
+def cut_tree(
+    news_ids: Sequence[int],
+    tree: Sequence[Sequence[float]],
+    min_similarity: float
+) -> Dict[int, List[dict]]:
+    """
+    Cut a persisted single-linkage tree at a similarity threshold.
+
+    Args:
+        news_ids: News IDs in the order the tree's vertex indices refer to
+        tree: Edges as [row, col, similarity] sorted by descending similarity
+        min_similarity: Similarity threshold for the cut
+
+    Returns:
+        Clusters keyed by cluster ID, numbered and scored like transitive_clusters
+    """
+    n = len(news_ids)
+    if n == 0:
+        return {}
+
+    edges = np.asarray(tree, dtype=np.float64).reshape(-1, 3)
+    kept = edges[edges[:, 2] >= min_similarity]
+    return clusters_from_edges(news_ids, kept[:, 0].astype(np.int64), kept[:, 1].astype(np.int64), kept[:, 2])
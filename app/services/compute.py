@@ -0,0 +1,119 @@
+"""Thread pool for CPU-bound FAISS and NumPy work, kept off the event loop."""
+import asyncio
+import functools
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict
+import faiss
+from threadpoolctl import threadpool_limits
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def _init_worker(omp_threads: int):
+    """Limit the OpenMP threads FAISS uses in a worker."""
+    # OpenMP thread counts are per calling thread, so set it in every worker
+    faiss.omp_set_num_threads(omp_threads)
+
+
+class ComputeExecutor:
+    """
+    Runs CPU-bound functions in a bounded thread pool.
+
+    FAISS and NumPy release the GIL in their heavy loops, so the event loop keeps
+    serving requests while a search or a clustering pass runs. Each worker uses
+    at most COMPUTE_OMP_THREADS OpenMP/BLAS threads, which keeps
+    COMPUTE_WORKERS x COMPUTE_OMP_THREADS below the number of cores.
+    """
+
+    def __init__(self, max_workers: int, omp_threads: int):
+        """Initialize the executor and its metrics."""
+        self.max_workers = max_workers
+        self.omp_threads = omp_threads
+        # BLAS pools are process-wide, unlike OpenMP's per-thread setting
+        self._blas_limits = threadpool_limits(limits=omp_threads, user_api="blas")
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="compute",
+            initializer=_init_worker,
+            initargs=(omp_threads,)
+        )
+        self._lock = threading.Lock()
+        self.queued = 0  # Submitted tasks waiting for a worker
+        self.running = 0  # Tasks currently executing
+        self.completed = 0
+        self.failed = 0
+        self.max_queued = 0
+        self.wait_seconds = 0.0  # Total time tasks spent queued
+        self.exec_seconds = 0.0  # Total time tasks spent executing
+        self.max_exec_seconds = 0.0
+
+    def _execute(self, submitted: float, fn: Callable, *args, **kwargs) -> Any:
+        """Run a task on a worker thread and record its timings."""
+        started = time.perf_counter()
+        with self._lock:
+            self.queued -= 1
+            self.running += 1
+            self.wait_seconds += started - submitted
+
+        ok = False
+        try:
+            result = fn(*args, **kwargs)
+            ok = True
+            return result
+        finally:
+            elapsed = time.perf_counter() - started
+            with self._lock:
+                self.running -= 1
+                if ok:
+                    self.completed += 1
+                else:
+                    self.failed += 1
+                self.exec_seconds += elapsed
+                self.max_exec_seconds = max(self.max_exec_seconds, elapsed)
+            if elapsed > 1.0:
+                logger.info(f"Compute task {getattr(fn, '__qualname__', fn)} took {elapsed:.2f}s")
+
+    async def run(self, fn: Callable, *args, **kwargs) -> Any:
+        """Run fn(*args, **kwargs) in the pool and await its result."""
+        with self._lock:
+            self.queued += 1
+            self.max_queued = max(self.max_queued, self.queued)
+
+        loop = asyncio.get_running_loop()
+        task = functools.partial(self._execute, time.perf_counter(), fn, *args, **kwargs)
+        return await loop.run_in_executor(self._executor, task)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get queue depth and execution time metrics."""
+        with self._lock:
+            finished = self.completed + self.failed
+            started = finished + self.running
+            return {
+                "workers": self.max_workers,
+                "omp_threads": self.omp_threads,
+                "queued": self.queued,
+                "running": self.running,
+                "max_queued": self.max_queued,
+                "completed": self.completed,
+                "failed": self.failed,
+                "avg_wait_ms": 1000 * self.wait_seconds / started if started else 0.0,
+                "avg_exec_ms": 1000 * self.exec_seconds / finished if finished else 0.0,
+                "max_exec_ms": 1000 * self.max_exec_seconds
+            }
+
+    def shutdown(self):
+        """Wait for running tasks and stop the workers."""
+        self._executor.shutdown(wait=True)
+
+
+# Global instance
+compute_executor = ComputeExecutor(settings.COMPUTE_WORKERS, settings.COMPUTE_OMP_THREADS)
+
+def get_compute_executor() -> ComputeExecutor:
+    """Get the global compute executor instance."""
+    return compute_executor
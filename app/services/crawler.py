@@ -1,23 +1,41 @@
 import asyncio
 import feedparser
+import hashlib
 import logging
+import time
 import httpx
-from datetime import datetime, timedelta, timezone
-from typing import List, Dict, Any, Optional
-from sqlalchemy import select, delete, func
+from datetime import datetime, timezone
+from typing import List, Dict, Any, Optional, Tuple
+from urllib.parse import urlparse
+from sqlalchemy import union_all, update
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
 
 from app.config import settings
 from app.models.url import URL, URLDatabase
-from app.models.news import NewsItem, NewsItemCreate
+from app.models.news import NewsEnrichment, NewsItem, NewsItemCreate
+from app.services.enrichment import EnrichmentJob
+from app.services.extraction_pool import ExtractionExecutor
 from app.services.extractor import ContentExtractor
-from app.services.embedding import EmbeddingService
+from app.services.fetcher import FEED_TYPES, HTML_TYPES, FetchedPage, Fetcher, FetchRejected
+from app.services.crawler_stats import publish_crawler_stats
+from app.services.hit_buffer import HitBuffer
+from app.services.near_duplicates import NearDuplicateIndex, minhash
+from app.services.negative_cache import NegativeCache
+from app.services.embedding import EmbeddingBatcher, EmbeddingService
+from app.services.pipeline import IngestJob, IngestPipeline, Stage
+from app.services.retention import RetentionJob
+from app.services.scheduler import CrawlScheduler, HostLimiter
+from app.services.url_aliases import URLAliases
+from app.utils.helpers import alternate_scheme, canonicalize_url, strip_tracking_params
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Longest sleep between checks for due URLs, so newly added URLs are picked up
+SCHEDULE_POLL_INTERVAL = 60
+
 # Set up PostgreSQL connection
 pg_engine = create_async_engine(
     settings.DATABASE_URL.replace("postgresql://", "postgresql+asyncpg://"),
@@ -31,194 +49,552 @@ class Crawler:
     def __init__(self, url_db: URLDatabase):
         """Initialize the crawler."""
         self.url_db = url_db
-        self.extractor = ContentExtractor()
+        # Parses pages in worker processes so extraction never blocks the event loop
+        self.extractor = ExtractionExecutor(
+            settings.EXTRACTION_WORKERS,
+            settings.EXTRACTION_TIMEOUT,
+            settings.EXTRACTION_MAX_HTML_CHARS
+        )
+        # Feed summaries are short enough to clean up on the event loop
+        self.summary_extractor = ContentExtractor()
         self.embedding_service = EmbeddingService(settings.COHERE_API_KEY)
+        # Shares embedding calls between all items in flight
+        self.embedding_batcher = EmbeddingBatcher(self.embedding_service)
         self.http_client = httpx.AsyncClient(
             timeout=settings.REQUEST_TIMEOUT,
             headers={"User-Agent": settings.USER_AGENT},
             follow_redirects=True
         )
         self.semaphore = asyncio.Semaphore(settings.MAX_CONCURRENT_REQUESTS)
+        self.host_limiter = HostLimiter(settings.CRAWLER_HOST_CONNECTIONS, settings.CRAWLER_HOST_DELAY)
+        # Streams pages within a byte budget, skipping content types that cannot be parsed
+        self.fetcher = Fetcher(self.http_client, self.host_limiter, settings.FETCH_MAX_BYTES)
+        self.scheduler = CrawlScheduler(
+            self.crawl_url,
+            settings.CRAWLER_CONCURRENT_SOURCES,
+            settings.CRAWLER_CYCLE_TIMEOUT or settings.CRAWLER_INTERVAL
+        )
+
+        # Deletes expired news items on its own schedule, off the ingest path
+        self.retention = RetentionJob(AsyncSessionLocal)
+        # Coalesces sightings of known items into periodic bulk updates
+        self.hit_buffer = HitBuffer(AsyncSessionLocal)
+        # Skips article URLs that recently failed, backing off on repeated failures
+        self.negative_cache = NegativeCache(AsyncSessionLocal)
+        # Maps the URLs articles were discovered by to their canonical items
+        self.url_aliases = URLAliases(AsyncSessionLocal)
+        # Finds stored items that new articles are republished copies of
+        self.near_duplicates = NearDuplicateIndex(AsyncSessionLocal, settings.NEAR_DUPLICATE_THRESHOLD)
+        self._indexed_deletions: Optional[int] = None  # Items retention had deleted when the index was last loaded
+        # Extracts the article pages of feed-only items once they are requested
+        self.enrichment = EnrichmentJob(AsyncSessionLocal, self._load_article)
+        self._background_tasks: List[asyncio.Task] = []
+        self._hit_flush_task: Optional[asyncio.Task] = None
+
+        self.savings = self._new_savings()  # Work saved in the current cycle
+        self.pipeline = IngestPipeline([
+            Stage("fetch", self._fetch_article, settings.INGEST_FETCH_WORKERS, settings.INGEST_QUEUE_SIZE),
+            Stage("extract", self._extract_article, settings.INGEST_EXTRACT_WORKERS, settings.INGEST_QUEUE_SIZE),
+            Stage("canonical", self._resolve_canonical, settings.INGEST_CANONICAL_WORKERS, settings.INGEST_QUEUE_SIZE),
+            Stage("dedupe", self._dedupe_article, settings.INGEST_DEDUPE_WORKERS, settings.INGEST_QUEUE_SIZE),
+            # Enough embed workers to fill a batch
+            Stage("embed", self._embed_article, settings.INGEST_EMBED_WORKERS, settings.INGEST_QUEUE_SIZE),
+            Stage("persist", self._persist_article, settings.INGEST_PERSIST_WORKERS, settings.INGEST_QUEUE_SIZE)
+        ])
+
+    async def _load_article(self, url: str) -> Optional[Dict[str, str]]:
+        """Download and extract an article outside the ingest pipeline."""
+        page = await self.fetcher.fetch(url)
+        return await self.extractor.extract_content(page.content, url, page.encoding)
+
+    def _new_savings(self) -> Dict[str, Any]:
+        """Get empty conditional GET counters."""
+        return {
+            "not_modified": 0,  # Sources answering 304 Not Modified
+            "unchanged_body": 0,  # Sources whose body hash matched the last crawl
+            "bytes_saved": 0,
+            "parse_seconds_saved": 0.0,
+            "article_fetches_saved": 0,  # New items built from their feed entries alone
+            "failed_urls_suppressed": 0,  # Article URLs skipped because they recently failed
+            "near_duplicates_merged": 0  # New articles recorded as sightings of a stored copy instead of embedded
+        }
+
+    async def run_cycle(self, urls: List[URL]) -> Dict[str, Any]:
+        """Crawl the given sources and report what conditional GETs saved."""
+        self.savings = self._new_savings()
+        await self.negative_cache.prune()
+        if settings.NEAR_DUPLICATE_DETECTION and self._indexed_deletions != self.retention.total_deleted:
+            # Reload so the items retention deleted leave the index
+            self._indexed_deletions = self.retention.total_deleted
+            await self.near_duplicates.load()
+        cycle = await self.scheduler.run_cycle(urls)
+        # Only the due sources were crawled; forget the metrics of removed ones
+        self.scheduler.prune(url_item.id for url_item in self.url_db.get_all_urls())
+        cycle["savings"] = self.savings
+        logger.info(
+            f"Skipped {self.savings['not_modified'] + self.savings['unchanged_body']} unchanged sources, "
+            f"saving {self.savings['bytes_saved']} bytes and {self.savings['parse_seconds_saved']:.2f}s of parsing; "
+            f"skipped {self.savings['failed_urls_suppressed']} recently failed article URLs "
+            f"and {self.savings['near_duplicates_merged']} near-duplicate articles"
+        )
+        return cycle
+
+    async def _fetch_source(self, url_item: URL) -> Optional[FetchedPage]:
+        """
+        Fetch a feed or homepage unless it is unchanged since its last crawl.
+        
+        Returns:
+            The response to parse, or None if the server answered 304 Not
+            Modified or the body is identical to the last crawl's. The items
+            the source still lists are then marked as seen without parsing.
+        """
+        headers = {}
+        if url_item.etag:
+            headers["If-None-Match"] = url_item.etag
+        if url_item.last_modified:
+            headers["If-Modified-Since"] = url_item.last_modified
+        
+        # Article downloads are bounded by the pipeline's fetch workers instead
+        response = await self.fetcher.fetch(
+            url_item.url,
+            headers,
+            accept=FEED_TYPES if url_item.type == "rss" else HTML_TYPES,
+            source=url_item.url,
+            limit=self.semaphore
+        )
+        
+        if response.status_code == 304:
+            self.savings["not_modified"] += 1
+            self.savings["bytes_saved"] += url_item.body_bytes or 0
+        elif hashlib.sha256(response.content).hexdigest() == url_item.body_hash:
+            self.savings["unchanged_body"] += 1
+            # Keep any validators the server started sending
+            self._record_validators(url_item, response, url_item.parse_seconds)
+        else:
+            return response
+        
+        self.savings["parse_seconds_saved"] += url_item.parse_seconds or 0.0
+        await self._refresh_source_items(url_item)
+        return None
+
+    def _record_validators(self, url_item: URL, response: FetchedPage, parse_seconds: Optional[float]):
+        """Store the response's cache validators and body hash for the next crawl."""
+        self.url_db.update_url_validators(
+            url_item.id,
+            etag=response.headers.get("ETag"),
+            last_modified=response.headers.get("Last-Modified"),
+            body_hash=hashlib.sha256(response.content).hexdigest(),
+            body_bytes=len(response.content),
+            parse_seconds=parse_seconds
+        )
 
-    async def _cleanup_old_news(self, session: AsyncSession):
-        """Clean up old news items based on retention settings."""
+    async def _refresh_source_items(self, url_item: URL):
+        """Mark the items seen in a source's last crawl as seen again."""
+        if not url_item.last_crawled_at:
+            return
+        
         try:
-            # Delete items older than retention period using timezone-aware UTC time
-            retention_date = datetime.now(timezone.utc) - timedelta(days=settings.NEWS_RETENTION_DAYS)
-            delete_stmt = delete(NewsItem).where(NewsItem.last_seen_at < retention_date)
-            await session.execute(delete_stmt)
-
-            # Get total count of items
-            result = await session.execute(select(func.count(NewsItem.id)))
-            total_items = result.scalar()
-
-            # If we're over the max items limit, delete oldest items
-            if total_items > settings.NEWS_MAX_ITEMS:
-                items_to_delete = total_items - settings.NEWS_MAX_ITEMS
-                subquery = select(NewsItem.id).order_by(NewsItem.last_seen_at.desc()).offset(settings.NEWS_MAX_ITEMS)
+            async with AsyncSessionLocal() as session:
+                # The last crawl saw exactly the items it touched after it started
                 await session.execute(
-                    delete(NewsItem).where(NewsItem.id.in_(subquery))
+                    update(NewsItem).where(
+                        NewsItem.source_url == url_item.url,
+                        NewsItem.last_seen_at >= url_item.last_crawled_at
+                    ).values(
+                        hit_count=NewsItem.hit_count + 1,
+                        last_seen_at=datetime.now(timezone.utc)
+                    )
                 )
-
-            await session.commit()
-            logger.info("Completed news items cleanup")
+                await session.commit()
         except Exception as e:
-            logger.error(f"Error during news cleanup: {str(e)}")
-            await session.rollback()
+            logger.error(f"Error refreshing items of unchanged source {url_item.url}: {str(e)}")
 
-    async def crawl_url(self, url_item: URL):
-        """Crawl a single URL."""
+    async def crawl_url(self, url_item: URL) -> Optional[int]:
+        """Crawl a single URL and schedule its next crawl; returns the number of new items."""
+        crawled_at = datetime.now(timezone.utc)
+        new_items = None
         try:
             if url_item.type == "rss":
-                await self._crawl_rss(url_item)
+                new_items = await self._crawl_rss(url_item)
             else:
-                await self._crawl_homepage(url_item)
+                new_items = await self._crawl_homepage(url_item)
         except Exception as e:
             logger.error(f"Error crawling {url_item.url}: {str(e)}")
+        
+        # Adapt the source's crawl interval to how much it changed
+        self.url_db.update_url_crawl_time(
+            url_item.id,
+            new_items,
+            crawled_at=crawled_at,
+            default_interval=settings.CRAWLER_INTERVAL,
+            min_interval=settings.CRAWLER_MIN_INTERVAL,
+            max_interval=settings.CRAWLER_MAX_INTERVAL,
+            target_new_items=settings.CRAWLER_TARGET_NEW_ITEMS,
+            backoff=settings.CRAWLER_BACKOFF
+        )
+        return new_items
 
-    async def _crawl_rss(self, url_item: URL):
-        """Crawl an RSS feed."""
+    async def _crawl_rss(self, url_item: URL) -> Optional[int]:
+        """Crawl an RSS feed; returns the number of new items, or None on failure."""
         try:
-            async with self.semaphore:
-                response = await self.http_client.get(url_item.url)
-                response.raise_for_status()
+            response = await self._fetch_source(url_item)
+            if response is None:
+                return 0
             
             # Use feedparser to parse the RSS content
-            feed = feedparser.parse(response.text)
+            parse_start = time.perf_counter()
+            # feedparser decodes the raw body itself, honouring the charset header and XML declaration
+            feed = feedparser.parse(
+                response.content,
+                response_headers={"content-type": response.headers.get("Content-Type", "")}
+            )
             
-            # Process each entry in the feed
-            tasks = []
-            for entry in feed.entries:
-                # Extract required data
-                title = entry.get("title", "")
-                link = entry.get("link", "")
-                
-                # Skip entries without title or link
-                if not title or not link:
-                    continue
-                
-                # Process each item
-                tasks.append(self._process_news_item(title, link, url_item.url))
+            # Collect the title and link of each entry in the feed
+            items = [(entry.get("title", ""), entry.get("link", "")) for entry in feed.entries]
+            summaries = None
+            if settings.FEED_ONLY_INGEST:
+                # Keep the entry summaries so new items need no article fetch
+                summaries = {
+                    entry.get("link", ""): self.summary_extractor.extract_summary(entry.get("summary", ""))
+                    for entry in feed.entries
+                }
+            parse_seconds = time.perf_counter() - parse_start
             
-            # Wait for all tasks to complete
-            await asyncio.gather(*tasks)
+            # Process all items of the feed together
+            results = await self._process_news_items(items, url_item.url, summaries)
+            self._record_crawl(url_item, response, parse_seconds, results)
+            return sum(1 for added in results if added)
             
         except httpx.HTTPError as e:
             logger.error(f"HTTP error crawling RSS feed {url_item.url}: {str(e)}")
         except Exception as e:
             logger.error(f"Error crawling RSS feed {url_item.url}: {str(e)}")
+        return None
 
-    async def _crawl_homepage(self, url_item: URL):
-        """Crawl a homepage and extract news links."""
+    async def _crawl_homepage(self, url_item: URL) -> Optional[int]:
+        """Crawl a homepage and extract news links; returns the number of new items, or None on failure."""
         try:
-            async with self.semaphore:
-                response = await self.http_client.get(url_item.url)
-                response.raise_for_status()
+            response = await self._fetch_source(url_item)
+            if response is None:
+                return 0
             
             # Extract links using the extractor
-            links = self.extractor.extract_links(response.text, url_item.url)
-            
-            # Process each link
-            tasks = []
-            for link_info in links:
-                tasks.append(self._process_news_item(
-                    link_info["title"], 
-                    link_info["url"],
-                    url_item.url
-                ))
+            parse_start = time.perf_counter()
+            links = await self.extractor.extract_links(response.content, url_item.url, response.encoding)
+            parse_seconds = time.perf_counter() - parse_start
+            if links is None:
+                return None
             
-            # Wait for all tasks to complete
-            await asyncio.gather(*tasks)
+            # Process all links of the page together
+            results = await self._process_news_items(
+                [(link_info["title"], link_info["url"]) for link_info in links],
+                url_item.url
+            )
+            self._record_crawl(url_item, response, parse_seconds, results)
+            return sum(1 for added in results if added)
             
         except httpx.HTTPError as e:
             logger.error(f"HTTP error crawling homepage {url_item.url}: {str(e)}")
         except Exception as e:
             logger.error(f"Error crawling homepage {url_item.url}: {str(e)}")
+        return None
 
-    async def _fetch_content(self, url: str) -> Optional[Dict[str, str]]:
-        """Fetch and extract content from a URL."""
-        try:
-            async with self.semaphore:
-                response = await self.http_client.get(url)
-                response.raise_for_status()
-            
-            # Extract content using the extractor
-            content = self.extractor.extract_content(response.text, url)
-            if not content:
-                logger.warning(f"Failed to extract content from {url}")
-                return None
-                
-            return content
-            
-        except httpx.HTTPError as e:
-            logger.error(f"HTTP error fetching content from {url}: {str(e)}\nFor more information check: https://httpstatuses.com/{e.response.status_code}")
-            return None
-        except Exception as e:
-            logger.error(f"Error fetching content from {url}: {str(e)}")
-            return None
-
-    async def _process_news_item(self, title: str, url: str, source_url: str):
-        """Process a news item link."""
-        # Skip if title or URL is empty
-        if not title or not url:
+    def _record_crawl(self, url_item: URL, response: FetchedPage, parse_seconds: float, results: List[Optional[bool]]):
+        """Store the source's validators unless some items need another try."""
+        # An unchanged body would skip the failed items until the source changes
+        if any(added is None for added in results):
+            logger.info(f"Not caching {url_item.url}, {sum(1 for added in results if added is None)} items failed")
             return
+        self._record_validators(url_item, response, parse_seconds)
+
+    async def _process_news_items(
+        self,
+        items: List[Tuple[str, str]],
+        source_url: str,
+        summaries: Optional[Dict[str, str]] = None
+    ) -> List[Optional[bool]]:
+        """
+        Process the (title, URL) pairs found on a source (the discover stage).
+        
+        URLs other than http(s) are skipped. The others are fetched and
+        stored as listed minus fragments and tracking parameters, while their
+        canonical form serves as the lookup key, so parameter order, AMP and
+        http/https variants of an article count as one URL. All URLs are
+        looked up with a single query, among the news items and their aliases
+        and in the negative cache; the URLs as listed match too. Sightings of known items go to the hit buffer, recently
+        failed URLs are skipped, and only the remaining unseen URLs go
+        through the ingest pipeline. URLs with a feed summary in `summaries`
+        skip the article fetch and extraction and are queued for enrichment
+        instead.
+        
+        Returns:
+            For each distinct URL, True if a new item was added, False if it
+            was known, recently failed or cannot be extracted, None if it failed in a way
+            worth retrying, now or in an earlier crawl
+        """
+        # Skip items without title or URL, and URLs listed more than once in any variant
+        titles: Dict[str, str] = {}
+        fetch_urls: Dict[str, str] = {}  # Canonical URL -> URL to fetch and store
+        candidates: Dict[str, List[str]] = {}  # Canonical URL -> URLs an existing item may have
+        entry_summaries: Dict[str, str] = {}
+        for title, url in items:
+            stripped = strip_tracking_params(url) if title and url else None
+            if not stripped:
+                continue
+            canonical = canonicalize_url(stripped)
+            if alternate_scheme(canonical) in titles:
+                canonical = alternate_scheme(canonical)
+            if canonical not in titles:
+                titles[canonical] = title
+                fetch_urls[canonical] = stripped
+                candidates[canonical] = [canonical, alternate_scheme(canonical)]
+                if summaries is not None and url in summaries:
+                    entry_summaries[stripped] = summaries[url]
+            # Items stored before canonicalization have the URL as listed
+            for listed in (stripped, url):
+                if listed not in candidates[canonical]:
+                    candidates[canonical].append(listed)
+        if not titles:
+            return []
         
         try:
-            # Create a database session
             async with AsyncSessionLocal() as session:
-                # Run cleanup before processing new items
-                await self._cleanup_old_news(session)
-
-                # Check if the URL already exists in the database
-                result = await session.execute(select(NewsItem).filter(NewsItem.url == url))
-                existing_item = result.scalars().first()
-                
-                if existing_item:
-                    # Update existing item with timezone-aware UTC time
-                    existing_item.hit_count += 1
-                    existing_item.last_seen_at = datetime.now(timezone.utc)
-                    await session.commit()
-                    logger.info(f"Updated existing news item: {title}")
-                else:
-                    # Get content and summary for new item
-                    content_info = await self._fetch_content(url)
-                    
-                    if not content_info:
-                        logger.warning(f"Failed to extract content from {url}")
-                        return
-                    
-                    # Create embedding based on settings
-                    text_for_embedding = title if settings.EMBED_TITLE_ONLY else f"{title}. {content_info['summary']}"
-                    embedding = await self.embedding_service.get_embedding(text_for_embedding)
-                    
-                    # Skip if embedding generation failed
-                    if not embedding:
-                        logger.warning(f"Failed to generate embedding for {url}")
-                        return
-                    
-                    # Create new news item with timezone-aware UTC time
-                    now = datetime.now(timezone.utc)
-                    news_item = NewsItem(
-                        title=title,
-                        summary=content_info["summary"],
-                        url=url,
-                        source_url=source_url,
-                        first_seen_at=now,
-                        last_seen_at=now,
-                        hit_count=1,
-                        embedding=embedding
-                    )
-                    
-                    # Add to database
-                    session.add(news_item)
-                    await session.commit()
-                    logger.info(f"Added new news item: {title}")
+                # Look up all URLs of the source in one round trip
+                result = await session.execute(union_all(
+                    self.url_aliases.lookup_query({url for urls in candidates.values() for url in urls}),
+                    self.negative_cache.lookup_query(titles)
+                ))
+                rows = result.all()
+        except Exception as e:
+            logger.error(f"Error looking up news items of {source_url}: {str(e)}")
+            return [None] * len(titles)
+        
+        item_urls = {url: item_url for url, item_url, failed, _ in rows if not failed}
+        failed_urls = {url for url, _, failed, _ in rows if failed}
+        retry_urls = {url for url, _, failed, retry in rows if failed and retry}
+        known: Dict[str, str] = {}  # Canonical URL -> URL of its item
+        for canonical, urls in candidates.items():
+            item_url = next((item_urls[url] for url in urls if url in item_urls), None)
+            if item_url is not None:
+                known[canonical] = item_url
+                if item_url not in urls:
+                    self.url_aliases.resolved += 1
+        suppressed = [url for url in titles if url not in known and url in failed_urls]
+        self.savings["failed_urls_suppressed"] += len(suppressed)
+        self.negative_cache.suppressed += len(suppressed)
+        
+        # The hit counts of known items are written in bulk by the hit buffer
+        self.hit_buffer.add(set(known.values()))
+        
+        # Waits while the pipeline is full
+        added = await asyncio.gather(*[
+            self._submit(title, fetch_urls[url], source_url, None if summaries is None else entry_summaries)
+            for url, title in titles.items()
+            if url not in known and url not in failed_urls
+        ])
+        # Suppressed items whose embedding failed still need a retry, so the source keeps no validators
+        return [False] * len(known) + [None if url in retry_urls else False for url in suppressed] + list(added)
+
+    async def _submit(
+        self,
+        title: str,
+        url: str,
+        source_url: str,
+        summaries: Optional[Dict[str, str]]
+    ) -> Optional[bool]:
+        """Send an unseen URL through the pipeline, from its feed entry if that is enough to embed it."""
+        summary = (summaries or {}).get(url)
+        if summaries is None or not (summary or settings.EMBED_TITLE_ONLY):
+            return await self.pipeline.submit(title, url, source_url)
         
+        self.savings["article_fetches_saved"] += 1
+        return await self.pipeline.submit(
+            title,
+            url,
+            source_url,
+            content={"title": title, "summary": summary},
+            start="dedupe",
+            enrich=True
+        )
+
+    async def _fetch_article(self, job: IngestJob) -> bool:
+        """Download an article page (the fetch stage)."""
+        try:
+            page = await self.fetcher.fetch(job.url, source=job.source_url)
+            job.html, job.encoding = page.content, page.encoding
+            return True
+        except FetchRejected as e:
+            logger.info(str(e))
+            reason = "content_type"
+        except httpx.HTTPStatusError as e:
+            logger.error(f"HTTP error fetching content from {job.url}: {str(e)}\nFor more information check: https://httpstatuses.com/{e.response.status_code}")
+            reason = f"http_{e.response.status_code}"
         except Exception as e:
-            logger.error(f"Error processing news item {url}: {str(e)}")
+            logger.error(f"Error fetching content from {job.url}: {str(e)}")
+            reason = "fetch"
+        await self.negative_cache.record(job.url, reason)
+        job.finish(False)
+        return False
+
+    async def _extract_article(self, job: IngestJob) -> bool:
+        """Extract title and summary from an article page (the extract stage)."""
+        html, job.html = job.html, None
+        job.content = await self.extractor.extract_content(html, job.url, job.encoding)
+        if not job.content:
+            logger.warning(f"Failed to extract content from {job.url}")
+            await self.negative_cache.record(job.url, "extract")
+            job.finish(False)
+            return False
+        return True
+
+    async def _resolve_canonical(self, job: IngestJob) -> bool:
+        """Merge an article into the item of its <link rel="canonical"> URL (the canonical stage)."""
+        canonical = job.content.get("canonical_url")
+        canonical = strip_tracking_params(canonical) if canonical else None
+        # Some sites point every page's canonical link at their homepage
+        if not canonical or urlparse(canonical).path in ("", "/"):
+            return True
+        key = canonicalize_url(canonical)
+        if key == canonicalize_url(job.url):
+            return True
+        
+        item = await self.url_aliases.find_item([canonical, key, alternate_scheme(key)])
+        if item is None:
+            # Store the item under its canonical URL, remembering the one it was found by
+            job.aliases.append(job.url)
+            job.url = canonical
+            return True
+        
+        # Already ingested under its canonical URL; skip embedding a duplicate
+        news_id, item_url = item
+        await self.url_aliases.add(news_id, [job.url])
+        self.url_aliases.duplicates += 1
+        self.hit_buffer.add([item_url])
+        logger.info(f"Merged {job.url} into existing news item {item_url}")
+        job.finish(False)
+        return False
+
+    async def _dedupe_article(self, job: IngestJob) -> bool:
+        """Merge an article into a stored item it nearly duplicates (the dedupe stage)."""
+        if not settings.NEAR_DUPLICATE_DETECTION:
+            return True
+        signature = minhash(f"{job.title} {job.content['summary'] or ''}")
+        if signature is None:
+            return True
+        
+        match = self.near_duplicates.find(signature)
+        if match is not None:
+            news_id, item_url = match
+            try:
+                await self.url_aliases.add(news_id, [job.url])
+            except Exception as e:
+                # The item was deleted since the index was loaded; store the article as new
+                logger.warning(f"Error recording {job.url} as an alias of news item {item_url}: {str(e)}")
+                self.near_duplicates.remove(news_id)
+            else:
+                # Skip embedding a copy of a stored item
+                self.savings["near_duplicates_merged"] += 1
+                self.hit_buffer.add([item_url])
+                logger.info(f"Merged near-duplicate {job.url} into existing news item {item_url}")
+                job.finish(False)
+                return False
+        
+        job.signature = signature
+        return True
+
+    async def _embed_article(self, job: IngestJob) -> bool:
+        """Embed an article through the shared batcher (the embed stage)."""
+        # Create embedding based on settings
+        text_for_embedding = job.title if settings.EMBED_TITLE_ONLY else f"{job.title}. {job.content['summary']}"
+        job.embedding = await self.embedding_batcher.embed(text_for_embedding)
+        
+        # Skip if embedding generation failed
+        if not job.embedding:
+            logger.warning(f"Failed to generate embedding for {job.url}")
+            await self.negative_cache.record(job.url, "embed")
+            job.finish(None)
+            return False
+        return True
+
+    async def _persist_article(self, job: IngestJob) -> bool:
+        """Insert a new news item (the persist stage)."""
+        async with AsyncSessionLocal() as session:
+            # Create new news item with timezone-aware UTC time
+            now = datetime.now(timezone.utc)
+            news_item = NewsItem(
+                title=job.title,
+                summary=job.content["summary"] or None,
+                url=job.url,
+                source_url=job.source_url,
+                first_seen_at=now,
+                last_seen_at=now,
+                hit_count=1,
+                embedding=job.embedding
+            )
+            
+            # Later sightings are looked up by canonical URL
+            aliases = list(dict.fromkeys(
+                [*job.aliases, *(canonicalize_url(url) for url in [job.url, *job.aliases])]
+            ))
+            aliases = [alias for alias in aliases if alias and alias != job.url]
+            
+            # Add to database
+            session.add(news_item)
+            if job.enrich or aliases or job.signature is not None:
+                await session.flush()
+            if job.enrich:
+                # Queue the item so its article can be extracted once it is requested
+                session.add(NewsEnrichment(news_id=news_item.id))
+            if job.signature is not None:
+                session.add(NearDuplicateIndex.row(news_item.id, job.signature))
+            await self.url_aliases.add(news_item.id, aliases, session)
+            await session.commit()
+            logger.info(f"Added new news item: {job.title}")
+        if job.signature is not None:
+            self.near_duplicates.add(news_item.id, job.url, job.signature)
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        """Get the metrics of the scheduler and of every crawler component."""
+        return {
+            **self.scheduler.stats(),
+            "fetch": self.fetcher.stats(),
+            "pipeline": self.pipeline.stats(),
+            "extraction": self.extractor.stats(),
+            "hits": self.hit_buffer.stats(),
+            "retention": self.retention.stats(),
+            "enrichment": self.enrichment.stats(),
+            "negative_cache": self.negative_cache.stats(),
+            "url_aliases": self.url_aliases.stats(),
+            "near_duplicates": self.near_duplicates.stats()
+        }
+
+    def start_background_jobs(self):
+        """Start the scheduled retention cleanup, hit buffer flushes and enrichment in the background."""
+        if not self._background_tasks:
+            self._background_tasks = [
+                asyncio.ensure_future(self.retention.run_forever()),
+                asyncio.ensure_future(self.enrichment.run_forever())
+            ]
+            self._hit_flush_task = asyncio.ensure_future(self.hit_buffer.run_forever())
 
     async def close(self):
-        """Close the HTTP client."""
+        """Stop the background jobs, ingest pipeline and extraction workers, flush buffered hits and close the HTTP client."""
+        self.retention.stop()
+        self.hit_buffer.stop()
+        self.enrichment.stop()
+        for task in self._background_tasks:
+            task.cancel()
+        await asyncio.gather(*self._background_tasks, return_exceptions=True)
+        self._background_tasks = []
+        if self._hit_flush_task:
+            # Let a flush in progress finish rather than cancelling it mid-write
+            await asyncio.gather(self._hit_flush_task, return_exceptions=True)
+            self._hit_flush_task = None
+        await self.pipeline.stop()
+        # Write the sightings still in memory before exiting
+        await self.hit_buffer.flush()
+        self.extractor.shutdown()
         await self.http_client.aclose()
 
 # Global instance
@@ -232,19 +608,31 @@ async def start_crawler():
     try:
         # Initialize crawler
         crawler = Crawler(url_db)
+        await crawler.enrichment.ensure_table()
+        await crawler.negative_cache.ensure_table()
+        await crawler.url_aliases.ensure_table()
+        await crawler.near_duplicates.ensure_table()
+        crawler.start_background_jobs()
         logger.info("Crawler service initialized")
         
         while True:
-            # Get all URLs to crawl
-            urls = url_db.get_all_urls()
+            # Get the URLs whose adaptive crawl interval has elapsed
+            urls = url_db.get_urls_to_crawl()
             
-            # Crawl each URL
-            for url in urls:
-                await crawler.crawl_url(url)
+            # Crawl the URLs concurrently within the cycle's time budget
+            if urls:
+                await crawler.run_cycle(urls)
+            # Share the metrics with the web app, which serves them at /api/stats/crawler
+            publish_crawler_stats(crawler.stats())
             
-            # Sleep for the configured interval
-            logger.info(f"Crawler cycle completed, sleeping for {settings.CRAWLER_INTERVAL} seconds")
-            await asyncio.sleep(settings.CRAWLER_INTERVAL)
+            # Sleep until the next URL is due, checking regularly for added URLs
+            next_crawl_at = url_db.get_next_crawl_time()
+            delay = SCHEDULE_POLL_INTERVAL
+            if next_crawl_at is not None:
+                delay = (next_crawl_at - datetime.now(timezone.utc)).total_seconds()
+                delay = min(max(delay, 1), SCHEDULE_POLL_INTERVAL)
+            logger.info(f"Crawler cycle completed, sleeping for {delay:.0f} seconds")
+            await asyncio.sleep(delay)
             
     except Exception as e:
         logger.error(f"Crawler service error: {str(e)}")
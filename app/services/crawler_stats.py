@@ -0,0 +1,35 @@
+"""Crawler metrics shared with the other services through the data volume."""
+import json
+import logging
+import os
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def publish_crawler_stats(stats: Dict[str, Any], path: str = None):
+    """Atomically replace the published crawler metrics."""
+    path = path or settings.CRAWLER_STATS_PATH
+    tmp_path = f"{path}.tmp"
+    try:
+        with open(tmp_path, "w") as f:
+            json.dump({**stats, "published_at": datetime.now(timezone.utc).isoformat()}, f, default=str)
+        os.replace(tmp_path, path)
+    except (OSError, TypeError, ValueError) as e:
+        logger.error(f"Error publishing crawler stats: {str(e)}")
+
+
+def read_crawler_stats(path: str = None) -> Optional[Dict[str, Any]]:
+    """Get the metrics the crawler service last published, if any."""
+    path = path or settings.CRAWLER_STATS_PATH
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        logger.error(f"Error reading crawler stats: {str(e)}")
+        return None
@@ -3,7 +3,7 @@ import time
 import logging
 import asyncio
 from datetime import datetime, timedelta
-from typing import List, Optional
+from typing import List, Optional, Tuple
 import numpy as np
 from sqlalchemy import select, func
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
@@ -13,10 +13,32 @@ from pgvector.sqlalchemy import Vector
 from app.config import settings
 from app.models.news import NewsItem
 from app.services.faiss_service import get_faiss_service
+from app.services.embedding_cache import EmbeddingCache, cache_key
+from app.services.resilience import CircuitBreaker, TokenBucket, backoff_delay
 from app.services.visualization import update_visualizations
 
 logger = logging.getLogger(__name__)
 
+# Most texts Cohere's embed endpoint accepts per call
+MAX_BATCH_TEXTS = 96
+
+EMBEDDING_MODEL = "embed-english-v3.0"  # Using v3.0 model which provides 1024-dimensional embeddings
+EMBEDDING_INPUT_TYPE = "search_document"  # Required for v3 models
+
+# Shared by every embedding call in the process
+embedding_rate_limiter = TokenBucket(
+    rate=settings.EMBEDDING_RATE_LIMIT / 60,
+    capacity=max(1, settings.EMBEDDING_RATE_LIMIT // 10)
+)
+embedding_breaker = CircuitBreaker(
+    "cohere",
+    threshold=settings.EMBEDDING_BREAKER_THRESHOLD,
+    cooldown=settings.EMBEDDING_BREAKER_COOLDOWN
+)
+
+# Shared by all services through the data volume
+embedding_cache = EmbeddingCache(settings.EMBEDDING_CACHE_PATH, settings.EMBEDDING_CACHE_MAX_ENTRIES)
+
 # Set up PostgreSQL connection
 pg_engine = create_async_engine(
     settings.DATABASE_URL.replace("postgresql://", "postgresql+asyncpg://"),
@@ -24,6 +46,11 @@ pg_engine = create_async_engine(
 )
 AsyncSessionLocal = sessionmaker(pg_engine, expire_on_commit=False, class_=AsyncSession)
 
+
+class EmbeddingRejected(Exception):
+    """Raised when the API rejects an embedding request itself (a 4xx other than 429)."""
+
+
 class EmbeddingService:
     """Service for generating embeddings and managing vector operations."""
     
@@ -33,7 +60,8 @@ class EmbeddingService:
         if not self.api_key:
             raise ValueError("Cohere API key is required")
         
-        self.client = cohere.Client(self.api_key)
+        self.client = cohere.AsyncClient(api_key=self.api_key)
+        self.cache = embedding_cache
         self.max_retries = 3
         self.retry_delay = 1  # seconds
         self.max_text_length = 2048  # Cohere's token limit is higher, but we'll be conservative
@@ -50,44 +78,157 @@ class EmbeddingService:
             
         return text
     
-    async def get_embedding(self, text: str) -> Optional[List[float]]:
-        """Get embedding for a text with retries."""
+    async def get_embedding(self, text: str, timeout: Optional[float] = None) -> Optional[List[float]]:
+        """Get embedding for a text with retries, giving up after timeout seconds."""
         if not text:
             logger.warning("Empty text provided for embedding")
             return None
             
-        text = self.preprocess_text(text)
+        embeddings = await self.get_embeddings([text], timeout)
+        return embeddings[0] if embeddings else None
+    
+    def _cache_key(self, text: str) -> str:
+        """Get the cache key of a preprocessed text."""
+        return cache_key(text, EMBEDDING_MODEL, EMBEDDING_INPUT_TYPE)
+    
+    async def cached_embedding(self, text: str) -> Optional[List[float]]:
+        """Get the cached embedding of a text, if any."""
+        key = self._cache_key(self.preprocess_text(text))
+        return (await self.cache.get_many([key])).get(key)
+    
+    async def get_embeddings(
+        self,
+        texts: List[str],
+        timeout: Optional[float] = None,
+        check_cache: bool = True,
+        raise_rejected: bool = False
+    ) -> Optional[List[List[float]]]:
+        """
+        Get embeddings for up to MAX_BATCH_TEXTS texts.
+        
+        Texts embedded before are served from the cache without an API call;
+        the others are embedded in one call and added to the cache.
+        
+        Args:
+            texts: Texts to embed
+            timeout: Seconds after which to give up, including retries
+            check_cache: Skip the cache lookup when the caller already did it
+            raise_rejected: Raise EmbeddingRejected instead of returning None
+                when the API rejects the request itself
+        
+        Returns:
+            One embedding per text in the same order, or None if the call failed
+        """
+        texts = [self.preprocess_text(text) for text in texts]
+        keys = [self._cache_key(text) for text in texts]
+        found = await self.cache.get_many(keys) if check_cache else {}
+        
+        # Embed each distinct uncached text once
+        missing = {key: text for key, text in zip(keys, texts) if key not in found}
+        if missing:
+            try:
+                embeddings = await self._request_embeddings(list(missing.values()), timeout)
+            except EmbeddingRejected:
+                if raise_rejected:
+                    raise
+                return None
+            if embeddings is None:
+                return None
+            fetched = dict(zip(missing, embeddings))
+            await self.cache.put_many(fetched)
+            found.update(fetched)
+        
+        return [found[key] for key in keys]
+    
+    async def _request_embeddings(
+        self,
+        texts: List[str],
+        timeout: Optional[float] = None
+    ) -> Optional[List[List[float]]]:
+        """
+        Embed preprocessed texts in one API call, with retries.
+        
+        Calls share the process-wide rate limiter and circuit breaker. Failed
+        calls are retried with jittered exponential backoff, unless the request
+        itself was rejected.
+        
+        Args:
+            texts: Texts to embed
+            timeout: Seconds after which to give up, including retries
+        
+        Returns:
+            One embedding per text in the same order, or None if the call failed
+        
+        Raises:
+            EmbeddingRejected: If the API rejected the request itself
+        """
+        deadline = time.monotonic() + timeout if timeout else None
         
         for attempt in range(self.max_retries):
+            if not await embedding_rate_limiter.acquire(deadline):
+                logger.warning("Embedding rate limit wait would exceed the deadline")
+                return None
+            # Only a call holding a rate limit token may take the half-open probe slot
+            probe = embedding_breaker.state == "half-open"
+            if not embedding_breaker.allow():
+                logger.warning("Cohere API circuit breaker is open, skipping embedding call")
+                return None
+            
+            call_timeout = settings.EMBEDDING_CALL_TIMEOUT
+            if deadline is not None:
+                call_timeout = min(call_timeout, max(deadline - time.monotonic(), 0.001))
+            
             try:
-                # Use async version if available in your Cohere client
-                # For now, this is a synchronous call
-                response = self.client.embed(
-                    texts=[text],
-                    model="embed-english-v3.0",  # Using v3.0 model which provides 1024-dimensional embeddings
-                    input_type="search_document",  # Required for v3 models
-                    embedding_types=["float"]  # Get float embeddings for maximum precision
+                response = await asyncio.wait_for(
+                    self.client.embed(
+                        texts=texts,
+                        model=EMBEDDING_MODEL,
+                        input_type=EMBEDDING_INPUT_TYPE,
+                        embedding_types=["float"]  # Get float embeddings for maximum precision
+                    ),
+                    timeout=call_timeout
                 )
                 
                 # Handle different response types
                 if response.response_type == "embeddings_floats":
-                    return response.embeddings[0]
+                    embeddings = response.embeddings
                 else:  # embeddings_by_type
                     embeddings = response.embeddings.float_  # This is already a list of embeddings
-                    return embeddings[0]
+                
+                if len(embeddings) != len(texts):
+                    raise ValueError(f"Expected {len(texts)} embeddings, got {len(embeddings)}")
+                embedding_breaker.record_success()
+                return embeddings
                 
             except Exception as e:
-                logger.warning(f"Cohere API error (attempt {attempt + 1}/{self.max_retries}): {e}")
-                if "rate" in str(e).lower():
-                    # Rate limit hit, wait longer
-                    time.sleep(self.retry_delay * (attempt + 1))
-                elif attempt == self.max_retries - 1:
-                    # Last attempt failed
-                    logger.error(f"Failed to generate embedding after {self.max_retries} attempts: {e}")
-                    return None
-                else:
-                    # Other error, wait standard delay
-                    time.sleep(self.retry_delay)
+                status = getattr(e, "status_code", None)
+                if isinstance(status, int) and 400 <= status < 500 and status != 429:
+                    # The request itself was rejected, retrying will not help
+                    logger.error(f"Cohere API rejected {len(texts)} texts ({status}): {e}")
+                    raise EmbeddingRejected(f"Cohere API rejected {len(texts)} texts ({status})") from e
+                
+                embedding_breaker.record_failure()
+                error = "timed out" if isinstance(e, asyncio.TimeoutError) else str(e)
+                logger.warning(f"Cohere API error (attempt {attempt + 1}/{self.max_retries}): {error}")
+            
+            finally:
+                if probe:
+                    # A probe ended by a rejected request or cancellation recorded no outcome
+                    embedding_breaker.end_probe()
+            
+            if attempt == self.max_retries - 1:
+                # Last attempt failed
+                logger.error(f"Failed to generate {len(texts)} embeddings after {self.max_retries} attempts: {error}")
+                return None
+            
+            # Rate limits back off from a longer base delay
+            base = self.retry_delay * (4 if status == 429 else 1)
+            delay = backoff_delay(attempt, base, settings.EMBEDDING_BACKOFF_MAX)
+            if deadline is not None and time.monotonic() + delay > deadline:
+                logger.warning(f"Embedding retry would exceed the deadline, giving up: {error}")
+                return None
+            await asyncio.sleep(delay)
+        return None
 
     def _validate_vector(self, vector_data) -> Optional[np.ndarray]:
         """Validate vector from database."""
@@ -113,15 +254,21 @@ class EmbeddingService:
             logger.error(f"Error validating vector from database: {e}")
             return None
 
-    async def update_faiss_index(self):
+    async def update_faiss_index(self, full_rebuild: bool = False):
         """Update FAISS index with recent vectors from PostgreSQL."""
         try:
             async with AsyncSessionLocal() as session:
                 # Get FAISS service
                 faiss_service = get_faiss_service()
                 
-                # Update FAISS index with recent vectors
-                await faiss_service.update_index(session, settings.VISUALIZATION_TIME_RANGE)
+                # Sync FAISS index with vectors changed since the last update
+                if full_rebuild:
+                    await faiss_service.rebuild_index(session, settings.VISUALIZATION_TIME_RANGE)
+                else:
+                    await faiss_service.update_index(session, settings.VISUALIZATION_TIME_RANGE)
+                
+                # Share the updated index with the web processes
+                faiss_service.publish_snapshot()
                 
                 logger.info("Successfully updated FAISS index")
                 
@@ -155,6 +302,98 @@ class EmbeddingService:
         """Stop background tasks."""
         self.running = False
 
+class EmbeddingBatcher:
+    """
+    Collects texts from concurrent callers into batched embedding calls.
+    
+    A batch is sent once EMBEDDING_BATCH_SIZE texts are pending or the oldest
+    pending text has waited EMBEDDING_BATCH_WAIT seconds, and each caller gets
+    its own embedding back.
+    """
+    
+    def __init__(
+        self,
+        service: EmbeddingService,
+        batch_size: int = None,
+        max_wait: float = None
+    ):
+        """Initialize the batcher."""
+        self.service = service
+        self.batch_size = min(batch_size or settings.EMBEDDING_BATCH_SIZE, MAX_BATCH_TEXTS)
+        self.max_wait = settings.EMBEDDING_BATCH_WAIT if max_wait is None else max_wait
+        self._pending: List[Tuple[str, asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+    
+    async def embed(self, text: str) -> Optional[List[float]]:
+        """Queue a text for the next batch and wait for its embedding."""
+        if not text:
+            logger.warning("Empty text provided for embedding")
+            return None
+        
+        # Cached texts skip the batch wait as well as the API call
+        embedding = await self.service.cached_embedding(text)
+        if embedding is not None:
+            return embedding
+        
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((text, future))
+        
+        if len(self._pending) >= self.batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(self.max_wait, self._flush)
+        
+        return await future
+    
+    def _flush(self):
+        """Send all pending texts, in batches of at most batch_size."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        
+        while self._pending:
+            batch = self._pending[:self.batch_size]
+            del self._pending[:self.batch_size]
+            asyncio.ensure_future(self._send(batch))
+    
+    async def _send(self, batch: List[Tuple[str, asyncio.Future]]):
+        """
+        Embed a batch and hand each caller its result.
+        
+        A batch the API rejects is retried in halves, so one bad text does not
+        fail the rest. Transient failures have already been retried with backoff
+        by the service, and an open circuit breaker would refuse the halves as
+        well, so those fail the whole batch.
+        """
+        try:
+            try:
+                embeddings = await self.service.get_embeddings(
+                    [text for text, _ in batch],
+                    check_cache=False,
+                    raise_rejected=len(batch) > 1
+                )
+            except EmbeddingRejected:
+                middle = len(batch) // 2
+                logger.warning(f"Embedding batch of {len(batch)} was rejected, retrying in halves")
+                await asyncio.gather(self._send(batch[:middle]), self._send(batch[middle:]))
+                return
+            
+            if embeddings is None:
+                logger.warning(f"Embedding batch of {len(batch)} texts failed")
+                embeddings = [None] * len(batch)
+            else:
+                logger.info(f"Embedded {len(batch)} texts in one call")
+            
+            for (_, future), embedding in zip(batch, embeddings):
+                if not future.done():
+                    future.set_result(embedding)
+        
+        except Exception as e:
+            logger.error(f"Error embedding batch of {len(batch)} texts: {str(e)}")
+            for _, future in batch:
+                if not future.done():
+                    future.set_result(None)
+
 # Create a global instance
 embedding_service = EmbeddingService()
 
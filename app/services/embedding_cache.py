@@ -0,0 +1,184 @@
+"""Persistent content-addressed cache of text embeddings in SQLite."""
+import asyncio
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Buffered cache hits whose last use is written in one statement
+TOUCH_BATCH = 256
+
+# Inserted entries between checks of the cache size
+EVICT_CHECK_INTERVAL = 500
+
+
+def cache_key(text: str, model: str, input_type: str) -> str:
+    """Hash a text together with the model and input type that embed it."""
+    return hashlib.sha256(f"{model}\0{input_type}\0{text}".encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    """
+    SQLite-backed embedding cache keyed by content hash.
+
+    The database lives on the volume shared by all services, so an embedding
+    computed by the crawler is reused by the web app and vice versa. Once the
+    cache holds more than max_entries vectors, the least recently used ones
+    are evicted; the size is only checked every EVICT_CHECK_INTERVAL inserts,
+    so it can briefly overshoot by that much per process.
+
+    Queries run in a worker thread to keep the event loop free. Last-use
+    times of hits are buffered and written TOUCH_BATCH at a time or with
+    the next eviction check, so plain reads rarely write.
+    """
+
+    def __init__(self, db_path: str, max_entries: int):
+        """Open the cache database and create its table."""
+        self.db_path = db_path
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._touched: Dict[str, float] = {}  # Key -> last use not yet written
+        self._inserted = 0  # Entries inserted since the last size check
+        # Worker threads share the connection, one statement batch at a time
+        self._lock = threading.Lock()
+
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(db_path, timeout=10, check_same_thread=False)
+        # Let the crawler, web app and embedding worker read while one writes
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute('''
+        CREATE TABLE IF NOT EXISTS embedding_cache (
+            key TEXT PRIMARY KEY,
+            vector BLOB NOT NULL,
+            created_at REAL NOT NULL,
+            last_used_at REAL NOT NULL
+        )
+        ''')
+        self.conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_embedding_cache_last_used ON embedding_cache (last_used_at)"
+        )
+        self.conn.commit()
+
+    async def get_many(self, keys: Iterable[str]) -> Dict[str, List[float]]:
+        """Get the cached embeddings of the given keys, counting hits and misses."""
+        keys = list(dict.fromkeys(keys))
+        if not keys:
+            return {}
+
+        found = await asyncio.to_thread(self._read, keys)
+        self.hits += len(found)
+        self.misses += len(keys) - len(found)
+        return found
+
+    async def put_many(self, entries: Dict[str, List[float]]):
+        """Store embeddings and evict the least recently used beyond max_entries."""
+        if entries:
+            await asyncio.to_thread(self._write, entries)
+
+    def _read(self, keys: List[str]) -> Dict[str, List[float]]:
+        """Look up keys and buffer the hits' last use."""
+        with self._lock:
+            try:
+                placeholders = ",".join("?" * len(keys))
+                rows = self.conn.execute(
+                    f"SELECT key, vector FROM embedding_cache WHERE key IN ({placeholders})",
+                    keys
+                ).fetchall()
+            except sqlite3.Error as e:
+                logger.error(f"Error reading embedding cache: {str(e)}")
+                return {}
+
+            now = time.time()
+            for key, _ in rows:
+                self._touched[key] = now
+            if len(self._touched) >= TOUCH_BATCH:
+                try:
+                    self._flush_touched()
+                    self.conn.commit()
+                except sqlite3.Error as e:
+                    logger.error(f"Error updating embedding cache use times: {str(e)}")
+                    self.conn.rollback()
+
+            return {key: np.frombuffer(vector, dtype=np.float32).tolist() for key, vector in rows}
+
+    def _write(self, entries: Dict[str, List[float]]):
+        """Insert embeddings, pruning the cache every EVICT_CHECK_INTERVAL inserts."""
+        now = time.time()
+        with self._lock:
+            try:
+                self.conn.executemany(
+                    '''
+                    INSERT OR REPLACE INTO embedding_cache (key, vector, created_at, last_used_at)
+                    VALUES (?, ?, ?, ?)
+                    ''',
+                    [
+                        (key, np.asarray(vector, dtype=np.float32).tobytes(), now, now)
+                        for key, vector in entries.items()
+                    ]
+                )
+                self._inserted += len(entries)
+                if self._inserted >= EVICT_CHECK_INTERVAL:
+                    self._inserted = 0
+                    self._flush_touched()
+                    self._evict()
+                self.conn.commit()
+            except sqlite3.Error as e:
+                logger.error(f"Error writing embedding cache: {str(e)}")
+                self.conn.rollback()
+
+    def _flush_touched(self):
+        """Write the buffered last-use times of cache hits."""
+        touched = [(used_at, key) for key, used_at in self._touched.items()]
+        self._touched = {}
+        self.conn.executemany("UPDATE embedding_cache SET last_used_at = ? WHERE key = ?", touched)
+
+    def _evict(self):
+        """Delete the least recently used entries beyond max_entries."""
+        count = self.conn.execute("SELECT COUNT(*) FROM embedding_cache").fetchone()[0]
+        overflow = count - self.max_entries
+        if overflow <= 0:
+            return
+
+        self.conn.execute(
+            '''
+            DELETE FROM embedding_cache WHERE key IN (
+                SELECT key FROM embedding_cache ORDER BY last_used_at LIMIT ?
+            )
+            ''',
+            (overflow,)
+        )
+        self.evictions += overflow
+        logger.info(f"Evicted {overflow} embeddings from the cache")
+
+    def _size(self) -> Optional[int]:
+        """Count the cached embeddings."""
+        with self._lock:
+            try:
+                return self.conn.execute("SELECT COUNT(*) FROM embedding_cache").fetchone()[0]
+            except sqlite3.Error as e:
+                logger.error(f"Error counting embedding cache entries: {str(e)}")
+                return None
+
+    async def size(self) -> Optional[int]:
+        """Get the number of cached embeddings."""
+        return await asyncio.to_thread(self._size)
+
+    async def stats(self) -> Dict[str, Optional[float]]:
+        """Get hit/miss counters of this process and the shared cache size."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "entries": await self.size(),
+            "max_entries": self.max_entries
+        }
@@ -2,8 +2,9 @@
 """Standalone worker for embedding and visualization tasks."""
 import asyncio
 import logging
-from app.services.embedding import embedding_service
+from app.services.embedding import AsyncSessionLocal, embedding_service
 from app.services.faiss_service import get_faiss_service
+from app.services.visualization import ensure_dendrogram_table
 
 # Configure logging
 logging.basicConfig(
@@ -20,6 +21,9 @@ async def main():
         faiss_service = get_faiss_service()
         logger.info("FAISS service initialized")
         
+        async with AsyncSessionLocal() as session:
+            await ensure_dendrogram_table(session)
+        
         # Start background tasks
         logger.info("Starting embedding worker")
         await embedding_service.run_background_tasks()
@@ -0,0 +1,250 @@
+"""Lazy full-page extraction for news items ingested from feed entries alone."""
+import asyncio
+import logging
+import time
+import traceback
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional, Set
+from sqlalchemy import delete, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models.news import NewsEnrichment, NewsItem
+from app.services.db import AsyncSessionLocal
+
+logger = logging.getLogger(__name__)
+
+
+async def request_enrichment(db: AsyncSession, news_ids: Iterable[int]):
+    """
+    Ask the crawler to extract the article pages of feed-only news items.
+
+    Items that were ingested with their full page, or are already queued,
+    are left alone. Runs in a savepoint, so a failure never aborts the
+    caller's transaction; the caller commits.
+    """
+    news_ids = list(news_ids)
+    if not news_ids:
+        return
+    try:
+        async with db.begin_nested():
+            await db.execute(
+                update(NewsEnrichment)
+                .where(NewsEnrichment.news_id.in_(news_ids), NewsEnrichment.requested_at.is_(None))
+                .values(requested_at=datetime.now(timezone.utc))
+            )
+    except Exception as e:
+        logger.error(f"Error requesting enrichment of {len(news_ids)} news items: {str(e)}")
+
+
+class EnrichmentRequestBuffer:
+    """
+    Collects enrichment requests from page views and writes them in bulk.
+
+    Viewing a news item only adds its ID to an in-memory set; every
+    `interval` seconds the set is handed to request_enrichment in one
+    UPDATE, so GET handlers never write to the database themselves.
+    """
+
+    def __init__(self, session_factory: Callable[[], AsyncSession], interval: float = None):
+        """Initialize an empty buffer."""
+        self.session_factory = session_factory
+        self.interval = interval or settings.ENRICHMENT_REQUEST_FLUSH_INTERVAL
+        self._news_ids: Set[int] = set()
+        self._stopped = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self.running = False
+        self.requests = 0
+        self.flushes = 0
+        self.errors = 0
+
+    def add(self, news_ids: Iterable[int]):
+        """Queue the given news items for an enrichment request."""
+        for news_id in news_ids:
+            self._news_ids.add(news_id)
+            self.requests += 1
+
+    async def flush(self) -> int:
+        """Write all buffered requests; returns the number of news items written."""
+        async with self._flush_lock:
+            if not self._news_ids:
+                return 0
+
+            # Take the buffer so requests during the write start a new one
+            pending, self._news_ids = self._news_ids, set()
+            try:
+                async with self.session_factory() as session:
+                    await request_enrichment(session, pending)
+                    await session.commit()
+            except Exception as e:
+                self.errors += 1
+                logger.error(f"Error writing {len(pending)} buffered enrichment requests: {str(e)}")
+                self._news_ids |= pending
+                return 0
+            except BaseException:
+                # Cancelled mid-write; keep the requests for the final flush
+                self._news_ids |= pending
+                raise
+
+            self.flushes += 1
+            return len(pending)
+
+    async def run_forever(self):
+        """Flush every `interval` seconds until stopped, then once more."""
+        self.running = True
+        self._stopped.clear()
+        while self.running:
+            try:
+                await asyncio.wait_for(self._stopped.wait(), timeout=self.interval)
+            except asyncio.TimeoutError:
+                pass
+            await self.flush()
+
+    def stop(self):
+        """Flush once more and stop, without waiting for the interval."""
+        self.running = False
+        self._stopped.set()
+
+    def stats(self) -> Dict[str, Any]:
+        """Get the buffer's size and counters."""
+        return {
+            "buffered_items": len(self._news_ids),
+            "requests": self.requests,
+            "flushes": self.flushes,
+            "errors": self.errors
+        }
+
+
+class EnrichmentJob:
+    """
+    Replaces the feed summaries of requested news items with the article's.
+
+    Feed-only ingest stores items straight from their feed entries and queues
+    them in news_enrichment. Only items someone opened or that made it into
+    clusters are requested; every `interval` seconds up to `batch_size` of
+    them get their page fetched and extracted. An item is dropped from the
+    queue once enriched or after `max_attempts` failures.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], AsyncSession],
+        load: Callable[[str], Awaitable[Optional[Dict[str, str]]]],
+        batch_size: int = None,
+        interval: float = None,
+        max_attempts: int = None
+    ):
+        """Initialize the job."""
+        self.session_factory = session_factory
+        self.load = load  # Fetches and extracts an article
+        self.batch_size = batch_size or settings.ENRICHMENT_BATCH_SIZE
+        self.interval = interval or settings.ENRICHMENT_INTERVAL
+        self.max_attempts = max_attempts or settings.ENRICHMENT_MAX_ATTEMPTS
+        self.running = False
+        self.enriched = 0
+        self.failed = 0
+        self.last_run: Optional[Dict[str, Any]] = None
+
+    async def ensure_table(self):
+        """Create the enrichment queue table if the database predates it."""
+        try:
+            async with self.session_factory() as session:
+                await session.run_sync(
+                    lambda sync_session: NewsEnrichment.__table__.create(sync_session.connection(), checkfirst=True)
+                )
+                await session.commit()
+        except Exception as e:
+            logger.error(f"Error creating the news enrichment table: {str(e)}")
+
+    async def _enrich(self, news_id: int, url: str) -> bool:
+        """Fetch and extract one article and store its summary."""
+        try:
+            content = await self.load(url)
+        except Exception as e:
+            logger.error(f"Error fetching {url} for enrichment: {str(e)}")
+            content = None
+
+        async with self.session_factory() as session:
+            if content and content["summary"]:
+                await session.execute(
+                    update(NewsItem).where(NewsItem.id == news_id).values(summary=content["summary"])
+                )
+                await session.execute(delete(NewsEnrichment).where(NewsEnrichment.news_id == news_id))
+            else:
+                # Give up on pages that keep failing so they stop taking batch slots
+                await session.execute(
+                    update(NewsEnrichment)
+                    .where(NewsEnrichment.news_id == news_id)
+                    .values(attempts=NewsEnrichment.attempts + 1)
+                )
+                await session.execute(
+                    delete(NewsEnrichment).where(
+                        NewsEnrichment.news_id == news_id,
+                        NewsEnrichment.attempts >= self.max_attempts
+                    )
+                )
+            await session.commit()
+        return bool(content and content["summary"])
+
+    async def run_once(self) -> Dict[str, Any]:
+        """Enrich the next batch of requested items and return the run's metrics."""
+        started = time.monotonic()
+        run = {"requested": 0, "enriched": 0, "failed": 0, "duration_seconds": None}
+
+        try:
+            async with self.session_factory() as session:
+                result = await session.execute(
+                    select(NewsEnrichment.news_id, NewsItem.url)
+                    .join(NewsItem, NewsItem.id == NewsEnrichment.news_id)
+                    .where(NewsEnrichment.requested_at.is_not(None))
+                    .order_by(NewsEnrichment.requested_at)
+                    .limit(self.batch_size)
+                )
+                batch = result.all()
+
+            run["requested"] = len(batch)
+            outcomes = await asyncio.gather(
+                *[self._enrich(news_id, url) for news_id, url in batch],
+                return_exceptions=True
+            )
+            for outcome in outcomes:
+                if outcome is True:
+                    run["enriched"] += 1
+                else:
+                    run["failed"] += 1
+                    if isinstance(outcome, Exception):
+                        logger.error(f"Error enriching news item: {str(outcome)}")
+
+        except Exception as e:
+            logger.error(f"Error during news enrichment: {str(e)}\n{traceback.format_exc()}")
+
+        run["duration_seconds"] = time.monotonic() - started
+        self.enriched += run["enriched"]
+        self.failed += run["failed"]
+        self.last_run = run
+        if run["requested"]:
+            logger.info(f"Enriched {run['enriched']} of {run['requested']} requested news items")
+        return run
+
+    async def run_forever(self):
+        """Enrich requested items every `interval` seconds until stopped."""
+        self.running = True
+        while self.running:
+            await self.run_once()
+            await asyncio.sleep(self.interval)
+
+    def stop(self):
+        """Stop after the current batch."""
+        self.running = False
+
+    def stats(self) -> Dict[str, Any]:
+        """Get the job's counters and the metrics of its last batch."""
+        return {
+            "enriched": self.enriched,
+            "failed": self.failed,
+            "last_run": self.last_run
+        }
+
+
+# Buffers the enrichment requests of news item page views
+enrichment_requests = EnrichmentRequestBuffer(AsyncSessionLocal)
@@ -0,0 +1,215 @@
+"""Process pool for CPU-bound HTML extraction, kept off the crawler's event loop."""
+import asyncio
+import logging
+import multiprocessing
+import os
+import signal
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, List, Optional, Union
+
+from app.services.extractor import ContentExtractor
+
+logger = logging.getLogger(__name__)
+
+# Extractor of the current worker process
+_worker_extractor: Optional[ContentExtractor] = None
+
+
+def _init_worker(pids):
+    """Report the PID, then set up logging and the extractor of a worker process."""
+    global _worker_extractor
+    pids.put(os.getpid())
+    logging.basicConfig(level=logging.INFO)
+    _worker_extractor = ContentExtractor()
+
+
+def _extract_content(html: Union[str, bytes], url: str, encoding: Optional[str]) -> Optional[Dict[str, str]]:
+    """Extract an article's content in a worker process."""
+    return _worker_extractor.extract_content(html, url, encoding)
+
+
+def _extract_links(html: Union[str, bytes], base_url: str, encoding: Optional[str]) -> List[Dict[str, str]]:
+    """Extract a page's links in a worker process."""
+    return _worker_extractor.extract_links(html, base_url, encoding)
+
+
+class ExtractionExecutor:
+    """
+    Runs ContentExtractor calls in a pool of worker processes.
+
+    readability-lxml, BeautifulSoup and newspaper3k hold the GIL while they
+    parse, so running them in threads would still serialize the crawler onto
+    one core. Pages longer than `max_html_chars` are cut before they are sent
+    to a worker. No more calls are submitted than there are workers, so a call
+    runs as soon as it is submitted; one running longer than `timeout` seconds
+    is abandoned. As a stuck worker cannot be interrupted, the pool is then
+    replaced, and the calls that were running beside it are run once more on
+    the new pool.
+    """
+
+    def __init__(self, max_workers: int, timeout: float, max_html_chars: int):
+        """Initialize the executor and its metrics."""
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.max_html_chars = max_html_chars
+        self._executor = self._new_pool()
+        # Keeps calls waiting for a worker out of the pool's queue and off the timeout's clock
+        self._slots = asyncio.Semaphore(max_workers)
+        self.waiting = 0
+        self.running = 0
+        self.completed = 0
+        self.failed = 0
+        self.timed_out = 0
+        self.truncated = 0
+        self.restarts = 0
+        self.retried = 0  # Calls run again after another call's timeout replaced the pool
+        self.exec_seconds = 0.0  # Total time from submission to result
+        self.max_exec_seconds = 0.0
+
+    def _new_pool(self) -> ProcessPoolExecutor:
+        """Create a worker pool whose workers report their PIDs to self._worker_pids."""
+        # Forking a process that runs threads and an event loop is unsafe
+        context = multiprocessing.get_context("spawn")
+        self._worker_pids = context.SimpleQueue()
+        return ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=context,
+            initializer=_init_worker,
+            initargs=(self._worker_pids,)
+        )
+
+    def _restart(self):
+        """Replace the pool, terminating its workers."""
+        executor, pids = self._executor, self._worker_pids
+        self._executor = self._new_pool()
+        # ProcessPoolExecutor has no public way to stop a task that is running
+        while not pids.empty():
+            try:
+                os.kill(pids.get(), signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+        executor.shutdown(wait=False, cancel_futures=True)
+        pids.close()
+        self.restarts += 1
+
+    def _cap(self, html: Union[str, bytes], url: str) -> Union[str, bytes]:
+        """Cut a page down to max_html_chars characters, or bytes of a downloaded page."""
+        if html and len(html) > self.max_html_chars:
+            self.truncated += 1
+            logger.warning(f"Truncating {len(html)} characters of HTML from {url} to {self.max_html_chars}")
+            return html[:self.max_html_chars]
+        return html
+
+    async def _run(self, fn, html: Union[str, bytes], url: str, encoding: Optional[str]) -> Any:
+        """Run an extraction function in the pool once a worker is free; raises on timeout or failure."""
+        html = self._cap(html, url)
+        self.waiting += 1
+        try:
+            await self._slots.acquire()
+        finally:
+            self.waiting -= 1
+        try:
+            for attempt in range(2):
+                executor = self._executor
+                try:
+                    return await self._submit(executor, fn, html, url, encoding)
+                except BrokenProcessPool:
+                    if executor is self._executor:
+                        # A worker died; the first call to notice replaces the pool
+                        self.failed += 1
+                        self._restart()
+                        raise
+                    if attempt:
+                        self.failed += 1
+                        raise
+                    # Terminated along with a call that replaced the pool
+                    self.retried += 1
+                    logger.warning(f"Extraction from {url} was interrupted by a worker restart, retrying")
+        finally:
+            self._slots.release()
+
+    async def _submit(
+        self,
+        executor: ProcessPoolExecutor,
+        fn,
+        html: Union[str, bytes],
+        url: str,
+        encoding: Optional[str]
+    ) -> Any:
+        """Run an extraction function on a pool, restarting the pool if the call hangs."""
+        loop = asyncio.get_running_loop()
+        started = time.perf_counter()
+        self.running += 1
+        try:
+            result = await asyncio.wait_for(
+                loop.run_in_executor(executor, fn, html, url, encoding),
+                timeout=self.timeout
+            )
+            self.completed += 1
+            return result
+        except asyncio.TimeoutError:
+            self.timed_out += 1
+            logger.error(f"Extraction from {url} timed out after {self.timeout}s, restarting extraction workers")
+            if executor is self._executor:
+                self._restart()
+            raise
+        except BrokenProcessPool:
+            # Handled by _run, which knows whether another call replaced the pool
+            raise
+        except Exception:
+            self.failed += 1
+            raise
+        finally:
+            self.running -= 1
+            elapsed = time.perf_counter() - started
+            self.exec_seconds += elapsed
+            self.max_exec_seconds = max(self.max_exec_seconds, elapsed)
+
+    async def extract_content(
+        self,
+        html: Union[str, bytes],
+        url: str,
+        encoding: Optional[str] = None
+    ) -> Optional[Dict[str, str]]:
+        """Extract an article's title and summary; None if extraction failed or timed out."""
+        try:
+            return await self._run(_extract_content, html, url, encoding)
+        except Exception as e:
+            logger.error(f"Error extracting content from {url}: {type(e).__name__}: {str(e)}")
+            return None
+
+    async def extract_links(
+        self,
+        html: Union[str, bytes],
+        base_url: str,
+        encoding: Optional[str] = None
+    ) -> Optional[List[Dict[str, str]]]:
+        """Extract a page's news links; None if extraction failed or timed out."""
+        try:
+            return await self._run(_extract_links, html, base_url, encoding)
+        except Exception as e:
+            logger.error(f"Error extracting links from {base_url}: {type(e).__name__}: {str(e)}")
+            return None
+
+    def stats(self) -> Dict[str, Any]:
+        """Get task counts and execution time metrics."""
+        finished = self.completed + self.failed + self.timed_out
+        return {
+            "workers": self.max_workers,
+            "waiting": self.waiting,
+            "running": self.running,
+            "completed": self.completed,
+            "failed": self.failed,
+            "timed_out": self.timed_out,
+            "truncated": self.truncated,
+            "restarts": self.restarts,
+            "retried": self.retried,
+            "avg_exec_ms": 1000 * self.exec_seconds / finished if finished else 0.0,
+            "max_exec_ms": 1000 * self.max_exec_seconds
+        }
+
+    def shutdown(self):
+        """Stop the workers without waiting for running tasks."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
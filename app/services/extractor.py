@@ -1,14 +1,99 @@
 import re
 import logging
-from typing import Dict, List, Optional
-from bs4 import BeautifulSoup
+from typing import Dict, Iterator, List, Optional, Union
+import lxml.html
+from bs4 import BeautifulSoup, UnicodeDammit
+from lxml.html import HtmlElement
 from urllib.parse import urljoin, urlparse
 from readability import Document
-from newspaper import Article
-from newspaper.article import ArticleException
+from readability.cleaners import html_cleaner
+from readability.htmls import utf8_parser
+from newspaper.cleaners import DocumentCleaner
+from newspaper.configuration import Configuration as NewspaperConfiguration
+from newspaper.extractors import ContentExtractor as NewspaperExtractor
+from newspaper.outputformatters import OutputFormatter
+from newspaper.utils import get_available_languages
 
 logger = logging.getLogger(__name__)
 
+# Common noise in extracted article text, matched in a single pass
+NOISE_PATTERN = re.compile("|".join([
+    r'Share this:',
+    r'Follow us on Twitter',
+    r'Like us on Facebook',
+    r'Subscribe to our newsletter',
+    r'Comments?',
+    r'©\s*\d{4}',  # Copyright notices
+    r'All rights reserved',
+    r'Terms of [Ss]ervice',
+    r'Privacy [Pp]olicy'
+]))
+
+
+def decode_html(content: bytes, encoding: Optional[str] = None) -> str:
+    """Decode a downloaded page, detecting its encoding from the content if it declares none."""
+    if encoding:
+        return content.decode(encoding, "replace")
+    try:
+        return content.decode("utf-8")
+    except UnicodeDecodeError:
+        # Only pages that are neither declared nor valid UTF-8 pay for detection
+        return UnicodeDammit(content, is_html=True).unicode_markup or content.decode("utf-8", "replace")
+
+
+def parse_html(html: Union[str, bytes], encoding: Optional[str] = None) -> HtmlElement:
+    """Parse a page, as text or as downloaded bytes, into an lxml tree the way readability-lxml does."""
+    if isinstance(html, bytes):
+        html = decode_html(html, encoding)
+    # Encoding replaces characters lxml cannot handle, such as lone surrogates
+    return lxml.html.document_fromstring(html.encode("utf-8", "replace"), parser=utf8_parser)
+
+
+# Characters of the text around a link used when its own text is too short
+LINK_CONTEXT_LENGTH = 100
+
+# Tags whose text BeautifulSoup's get_text() leaves out, along with their descendants'
+NON_TEXT_TAGS = {"script", "style", "template", "rt", "rp"}
+
+
+def _text_nodes(element: HtmlElement, skip: bool = False) -> Iterator[str]:
+    """Yield the text nodes inside an element in document order, skipping comments and non-text tags."""
+    skip = skip or element.tag in NON_TEXT_TAGS
+    if not skip and isinstance(element.tag, str) and element.text:
+        yield element.text
+    for child in element:
+        yield from _text_nodes(child, skip)
+        if not skip and child.tail:
+            yield child.tail
+
+
+def _joined_text(element: HtmlElement, limit: Optional[int] = None) -> str:
+    """
+    Join an element's stripped text nodes like BeautifulSoup's get_text(strip=True).
+    
+    With a limit, only the first `limit` characters are collected, so a link's
+    context never walks more of a large container than it needs.
+    """
+    parts = []
+    length = 0
+    for text in _text_nodes(element):
+        text = text.strip()
+        if text:
+            parts.append(text)
+            length += len(text)
+            if limit is not None and length >= limit:
+                break
+    return "".join(parts)[:limit]
+
+
+class _TreeDocument(Document):
+    """readability-lxml Document that starts from a parsed tree instead of a string."""
+    
+    def _parse(self, input: HtmlElement) -> HtmlElement:
+        """Clean a copy of the tree, leaving the original for other extractors."""
+        return html_cleaner.clean_html(input)
+
+
 class ContentExtractor:
     """Service for extracting content and links from web pages."""
     
@@ -16,13 +101,24 @@ class ContentExtractor:
         self.min_content_length = 100
         self.max_summary_length = 2000
     
-    def extract_content(self, html: str, url: str) -> Optional[Dict[str, str]]:
+    def extract_content(
+        self,
+        html: Union[str, bytes],
+        url: str,
+        encoding: Optional[str] = None
+    ) -> Optional[Dict[str, str]]:
         """
         Extract content from an HTML page using multiple methods.
         
+        The page is parsed into a single lxml tree that both readability-lxml
+        and the newspaper3k fallback work on. The URL the page declares with
+        <link rel="canonical"> is returned as canonical_url, None if it
+        declares none.
+        
         Args:
-            html: The HTML content
+            html: The HTML content, or the page as downloaded
             url: The URL of the page
+            encoding: The encoding of a downloaded page, if known
             
         Returns:
             Dictionary with extracted content or None if extraction failed
@@ -30,12 +126,35 @@ class ContentExtractor:
         if not html:
             logger.warning(f"Empty HTML content for {url}")
             return None
-            
+        
+        try:
+            tree = parse_html(html, encoding)
+        except Exception as e:
+            logger.error(f"Failed to parse HTML of {url}: {str(e)}")
+            return None
+        
+        # Read before newspaper3k's cleaner modifies the tree
+        canonical_url = self._extract_canonical_url(tree, url)
+        content = self._extract_from_tree(tree, url)
+        if content:
+            content["canonical_url"] = canonical_url
+        return content
+    
+    def _extract_canonical_url(self, tree: HtmlElement, url: str) -> Optional[str]:
+        """Get the absolute URL of a page's <link rel="canonical">."""
+        for link in tree.iterfind(".//head/link[@href]"):
+            if "canonical" in (link.get("rel") or "").lower().split():
+                href = link.get("href").strip()
+                return urljoin(url, href) if href else None
+        return None
+    
+    def _extract_from_tree(self, tree: HtmlElement, url: str) -> Optional[Dict[str, str]]:
+        """Extract title and summary from a parsed page, falling back from readability-lxml to newspaper3k."""
         content = None
         
         # Try readability-lxml first
         try:
-            content = self._extract_with_readability(html)
+            content = self._extract_with_readability(tree)
             if content and len(content["summary"]) >= self.min_content_length:
                 logger.info(f"Successfully extracted content from {url} using readability-lxml")
                 return content
@@ -46,7 +165,7 @@ class ContentExtractor:
         
         # Fallback to newspaper3k
         try:
-            content = self._extract_with_newspaper(html, url)
+            content = self._extract_with_newspaper(tree, url)
             if content and len(content["summary"]) >= self.min_content_length:
                 logger.info(f"Successfully extracted content from {url} using newspaper3k")
                 return content
@@ -63,36 +182,53 @@ class ContentExtractor:
         logger.error(f"All content extraction methods failed for {url}")
         return None
     
-    def _extract_with_readability(self, html: str) -> Optional[Dict[str, str]]:
+    def _extract_with_readability(self, tree: HtmlElement) -> Optional[Dict[str, str]]:
         """Extract content using readability-lxml."""
-        doc = Document(html)
+        doc = _TreeDocument(tree)
         title = doc.title()
-        summary = doc.summary()
+        doc.summary()
         
-        # Clean up the summary
-        soup = BeautifulSoup(summary, "lxml")
-        clean_text = self._clean_text(soup.get_text())
+        # After summary() the document holds the cleaned article element
+        clean_text = self._clean_text(doc.html.text_content())
         
         return {
             "title": title,
             "summary": self._truncate_text(clean_text)
         }
     
-    def _extract_with_newspaper(self, html: str, url: str) -> Optional[Dict[str, str]]:
-        """Extract content using newspaper3k."""
-        article = Article(url)
-        article.set_html(html)
-        article.parse()
+    def _extract_with_newspaper(self, tree: HtmlElement, url: str) -> Optional[Dict[str, str]]:
+        """
+        Extract content using newspaper3k.
+        
+        Runs the title and body text steps of newspaper's Article.parse()
+        on the tree, which it modifies, instead of re-parsing the page.
+        """
+        config = NewspaperConfiguration()
+        extractor = NewspaperExtractor(config)
+        output_formatter = OutputFormatter(config)
+        
+        title = (extractor.get_title(tree) or "")[:config.MAX_TITLE]
+        if config.use_meta_language:
+            meta_lang = extractor.get_meta_lang(tree)
+            if meta_lang in get_available_languages():
+                extractor.update_language(meta_lang)
+                output_formatter.update_language(meta_lang)
+        
+        # Before any computations on the body, clean DOM object
+        top_node = extractor.calculate_best_node(DocumentCleaner(config).clean(tree))
+        if top_node is None:
+            return None
+        text, _ = output_formatter.get_formatted(extractor.post_cleanup(top_node))
         
         # Get the text content
-        text = article.text
+        text = text[:config.MAX_TEXT]
         if not text:
             return None
             
         clean_text = self._clean_text(text)
         
         return {
-            "title": article.title,
+            "title": title,
             "summary": self._truncate_text(clean_text)
         }
     
@@ -105,20 +241,7 @@ class ContentExtractor:
         text = ' '.join(text.split())
         
         # Remove common noise patterns
-        noise_patterns = [
-            r'Share this:', 
-            r'Follow us on Twitter',
-            r'Like us on Facebook',
-            r'Subscribe to our newsletter',
-            r'Comments?',
-            r'©\s*\d{4}',  # Copyright notices
-            r'All rights reserved',
-            r'Terms of [Ss]ervice',
-            r'Privacy [Pp]olicy'
-        ]
-        
-        for pattern in noise_patterns:
-            text = re.sub(pattern, '', text)
+        text = NOISE_PATTERN.sub('', text)
         
         return text.strip()
     
@@ -128,28 +251,57 @@ class ContentExtractor:
             return text[:self.max_summary_length] + "..."
         return text
     
-    def extract_links(self, html: str, base_url: str) -> List[Dict[str, str]]:
+    def extract_summary(self, html: str) -> str:
+        """
+        Get the clean text of a feed entry's summary or description.
+        
+        Args:
+            html: The summary, usually an HTML fragment but sometimes plain text
+            
+        Returns:
+            The summary's text, cleaned and truncated like extracted content
+        """
+        if not html or not html.strip():
+            return ""
+        
+        try:
+            # Separate the text of adjacent paragraphs, which feeds rarely put whitespace between
+            text = " ".join(lxml.html.fragment_fromstring(html, create_parent="div").itertext())
+        except Exception as e:
+            logger.debug(f"Treating unparseable feed summary as text: {str(e)}")
+            text = html
+        
+        return self._truncate_text(self._clean_text(text))
+    
+    def extract_links(
+        self,
+        html: Union[str, bytes],
+        base_url: str,
+        encoding: Optional[str] = None
+    ) -> List[Dict[str, str]]:
         """
         Extract links from an HTML page.
         
         Args:
-            html: The HTML content
+            html: The HTML content, or the page as downloaded
             base_url: The base URL for resolving relative links
+            encoding: The encoding of a downloaded page, if known
             
         Returns:
             List of dictionaries containing link info (title, url)
         """
         links = []
+        seen = set()
         
         try:
-            soup = BeautifulSoup(html, "lxml")
+            tree = parse_html(html, encoding)
             
             # Get domain of the base URL for filtering
             base_domain = urlparse(base_url).netloc
             
             # Find all links
-            for a_tag in soup.find_all("a", href=True):
-                href = a_tag["href"]
+            for a_tag in tree.iter("a"):
+                href = a_tag.get("href")
                 
                 # Skip empty links
                 if not href or href.startswith("#"):
@@ -168,27 +320,21 @@ class ContentExtractor:
                     continue
                 
                 # Get title from text or title attribute
-                title = a_tag.get_text(strip=True) or a_tag.get("title", "")
+                title = _joined_text(a_tag) or a_tag.get("title", "")
                 if not title:
                     continue
                 
-                # Get content around the link to improve title quality
-                parent = a_tag.parent
-                context = ""
-                if parent:
-                    context = parent.get_text(strip=True)
-                    if len(context) > 100:
-                        context = context[:100]
-                
-                # Use context if title is too short
-                if len(title) < 10 and len(context) > len(title):
-                    title = context
+                # Use the content around the link if the title is too short
+                if len(title) < 10:
+                    parent = a_tag.getparent()
+                    context = _joined_text(parent, LINK_CONTEXT_LENGTH) if parent is not None else ""
+                    if len(context) > len(title):
+                        title = context
                 
                 # Add link if not already in the list and title is not too short
-                if len(title) >= 5:
-                    link_info = {"title": title, "url": absolute_url}
-                    if link_info not in links:
-                        links.append(link_info)
+                if len(title) >= 5 and (absolute_url, title) not in seen:
+                    seen.add((absolute_url, title))
+                    links.append({"title": title, "url": absolute_url})
             
             logger.info(f"Extracted {len(links)} links from {base_url}")
             return links
@@ -229,7 +375,7 @@ class ContentExtractor:
                 
                 # Extract description/summary
                 description_tag = item.find(["description", "summary", "content"])
-                description = description_tag.get_text(strip=True) if description_tag else ""
+                description = self.extract_summary(description_tag.get_text()) if description_tag else ""
                 
                 # Only add if title and link are not empty
                 if title and link:
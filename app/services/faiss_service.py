@@ -1,29 +1,159 @@
 """FAISS service for in-memory vector operations."""
+import json
 import logging
+import os
+import threading
+import time
 import traceback
 from datetime import datetime, timedelta, timezone
 from typing import Dict, List, Optional, Tuple
 import numpy as np
 import faiss
-from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models.news import NewsItem
+from app.services.clustering import single_linkage_tree, transitive_clusters
+from app.services.compute import get_compute_executor
+from app.services.vector_loader import VectorBatch, load_vectors
 from app.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Re-read rows slightly older than the watermark so rows committed late by a
+# long-running transaction are not skipped; re-applying a known row is harmless
+WATERMARK_OVERLAP = timedelta(minutes=5)
+
+# Map index storage from the snapshot file where this FAISS build can; before
+# IO_FLAG_MMAP_IFC (not in faiss-cpu 1.7.4) only inverted lists are mapped, so
+# flat snapshots are searched through MappedFlatIndex instead
+SNAPSHOT_READ_FLAGS = getattr(faiss, "IO_FLAG_MMAP_IFC", faiss.IO_FLAG_MMAP) | faiss.IO_FLAG_READ_ONLY
+
+
+def build_index(
+    factory: str,
+    dimension: int,
+    training_vectors: Optional[np.ndarray] = None,
+    search_params: str = ""
+) -> faiss.Index:
+    """
+    Create an empty index keyed by news ID from a FAISS index factory string.
+    
+    Indexes that need training (IVF, PQ, SQ) are trained on the given vectors.
+    If there are too few of them, a flat index is used instead until the next
+    rebuild.
+    
+    Args:
+        factory: FAISS index factory string, e.g. "Flat", "HNSW32", "IVF256,PQ64", "SQ8"
+        dimension: Vector dimensions
+        training_vectors: Normalized vectors to train on
+        search_params: FAISS ParameterSpace string, e.g. "nprobe=16" or "efSearch=64"
+    """
+    # Using L2 distance, normalize vectors for cosine similarity
+    index = faiss.index_factory(dimension, factory, faiss.METRIC_L2)
+    
+    if not index.is_trained:
+        try:
+            if training_vectors is None or len(training_vectors) == 0:
+                raise ValueError("no training vectors")
+            index.train(np.ascontiguousarray(training_vectors, dtype=np.float32))
+        except Exception as e:
+            logger.warning(f"Cannot train FAISS index '{factory}' ({str(e)}), using a flat index")
+            return faiss.IndexIDMap2(faiss.IndexFlatL2(dimension))
+    
+    if search_params:
+        try:
+            faiss.ParameterSpace().set_index_parameters(index, search_params)
+        except RuntimeError as e:
+            logger.warning(f"Cannot apply search parameters '{search_params}' to FAISS index '{factory}': {str(e)}")
+    
+    # IVF indexes store external IDs in their inverted lists and remove by ID
+    # themselves; wrapping them would desync the ID map after removals
+    if faiss.try_extract_index_ivf(index) is not None:
+        return index
+    return faiss.IndexIDMap2(index)
+
+
+def is_flat(index: faiss.Index) -> bool:
+    """Check whether an index searches its vectors exhaustively and exactly."""
+    if isinstance(index, faiss.IndexIDMap):
+        index = faiss.downcast_index(index.index)
+    return isinstance(index, faiss.IndexFlat)
+
+
+class MappedFlatIndex:
+    """
+    Exact search over a snapshot's memory-mapped vectors, in place of its flat index.
+
+    A flat index read from a snapshot is a private copy in every process,
+    unless FAISS can map it. The snapshot's vectors.npy holds the same
+    normalized vectors and is mapped by every web worker, so searching it
+    directly keeps one copy in the page cache. Results match IndexFlatL2:
+    squared L2 distances in ascending order, news IDs, -1 padding.
+    """
+
+    def __init__(self, vectors: np.ndarray, ids: np.ndarray):
+        """Wrap normalized vectors and the news IDs of their rows."""
+        self.vectors = vectors
+        self.ids = ids
+        self.ntotal = len(ids)
+
+    def search(self, queries: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Get the distances and IDs of the k nearest vectors to each query."""
+        distances = np.full((len(queries), k), np.inf, dtype=np.float32)
+        labels = np.full((len(queries), k), -1, dtype=np.int64)
+        found = min(k, self.ntotal)
+        if found == 0:
+            return distances, labels
+        
+        similarities = queries @ self.vectors.T
+        top = np.argpartition(-similarities, found - 1, axis=1)[:, :found]
+        top_similarities = np.take_along_axis(similarities, top, axis=1)
+        order = np.argsort(-top_similarities, axis=1, kind="stable")
+        top = np.take_along_axis(top, order, axis=1)
+        # For unit vectors: L2^2 = 2(1 - cos_sim)
+        distances[:, :found] = 2 * (1 - np.take_along_axis(top_similarities, order, axis=1))
+        labels[:, :found] = self.ids[top]
+        return distances, labels
+
+
 class FaissService:
     """Service for managing vector operations using FAISS."""
     
     def __init__(self):
         """Initialize the FAISS index."""
         self.dimension = settings.VECTOR_DIMENSIONS
-        # Using L2 distance, normalize vectors for cosine similarity
-        self.index = faiss.IndexFlatL2(self.dimension)
-        self.news_ids = []  # Keep track of news IDs in same order as vectors
+        self.factory = settings.FAISS_INDEX_FACTORY
+        self.trainable = not faiss.index_factory(self.dimension, self.factory).is_trained
+        self.snapshot_dir = settings.FAISS_SNAPSHOT_DIR
+        # Serializes index mutations with searches running on compute workers
+        self._index_lock = threading.Lock()
+        self._reset()
         self.last_update = None
-        self.vectors = None  # Store vectors for clustering
+        self._last_snapshot_check = 0.0
+        
+    def _new_index(self, training_vectors: Optional[np.ndarray] = None) -> faiss.Index:
+        """Create an empty index whose vectors are keyed by news ID."""
+        self._trained_on = 0 if training_vectors is None else len(training_vectors)
+        return build_index(self.factory, self.dimension, training_vectors, settings.FAISS_SEARCH_PARAMS)
+        
+    def _reindex_from_memory(self):
+        """Rebuild (and retrain) the index from the vectors held in memory."""
+        self.index = self._new_index(self.vectors if self.trainable else None)
+        if len(self.news_ids):
+            self.index.add_with_ids(self.vectors, np.asarray(self.news_ids, dtype=np.int64))
+        
+    def _reset(self):
+        """Drop all indexed vectors and the sync watermark."""
+        # Placeholder until the first batch of vectors arrives so it can be trained on them
+        self.index = faiss.IndexIDMap2(faiss.IndexFlatL2(self.dimension))
+        self._trained_on = 0
+        self.news_ids = []  # Keep track of news IDs in same order as vectors
+        self.vectors = np.empty((0, self.dimension), dtype=np.float32)  # Store vectors for clustering
+        self.last_seen = np.empty(0, dtype=np.float64)  # last_seen_at timestamps in same order
+        self._positions: Dict[int, int] = {}  # News ID -> row in vectors
+        self.watermark: Optional[datetime] = None
+        self.hours: Optional[int] = None
+        self.snapshot_version: Optional[int] = None  # Version loaded from or published to disk
+        self.read_only = False  # Set when serving a memory-mapped snapshot
         
     def _normalize_vector(self, vector: np.ndarray) -> np.ndarray:
         """Normalize vector for cosine similarity."""
@@ -32,128 +162,269 @@ class FaissService:
         except Exception as e:
             logger.error(f"Error normalizing vector: {str(e)}\nVector shape: {vector.shape}\nVector: {vector}")
             raise
+            
+    def _normalize_rows(self, ids: np.ndarray, vectors: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Normalize a matrix of vectors, dropping rows that cannot be normalized."""
+        norms = np.linalg.norm(vectors, axis=1)
+        valid = norms > 0
+        if not valid.all():
+            logger.error(f"Skipping zero vectors for news items {ids[~valid].tolist()}")
+        return valid, vectors[valid] / norms[valid, None]
+        
+    async def rebuild_index(self, db: AsyncSession, hours: int = 48):
+        """Rebuild the FAISS index from scratch with all vectors in the window."""
+        self._reset()
+        await self.update_index(db, hours)
         
     async def update_index(self, db: AsyncSession, hours: int = 48):
-        """Update the FAISS index with recent vectors from PostgreSQL."""
+        """
+        Sync the FAISS index with PostgreSQL.
+        
+        Only rows created or seen since the last sync are loaded. Known items get
+        their last_seen_at refreshed, new ones are added, and items that left the
+        time window are evicted. A full load happens on the first sync or when
+        the window size changes.
+        """
         try:
+            if self.hours != hours or self.read_only:
+                self._reset()
+                self.hours = hours
+            
             # Get recent news items using timezone-aware UTC time
             time_filter = datetime.now(timezone.utc) - timedelta(hours=hours)
-            stmt = select(NewsItem).filter(
-                NewsItem.last_seen_at >= time_filter,
-                NewsItem.embedding.is_not(None)
+            batch = await load_vectors(
+                db,
+                since=time_filter,
+                changed_after=self.watermark - WATERMARK_OVERLAP if self.watermark else None
             )
             
-            result = await db.execute(stmt)
-            news_items = result.scalars().all()
+            evicted = await get_compute_executor().run(self._sync_batch, batch, time_filter)
+            if len(batch):
+                # Advance the watermark using database timestamps to avoid clock skew
+                self.watermark = max(batch.changed_at, self.watermark or time_filter)
             
-            if not news_items:
-                logger.warning("No news items found for indexing")
-                return
-            
-            # Reset index
-            self.index = faiss.IndexFlatL2(self.dimension)
-            self.news_ids = []
-            self.vectors = []
-            
-            # Add vectors to index
-            for item in news_items:
-                try:
-                    vector = np.array(item.embedding, dtype=np.float32)
-                    if vector.shape != (self.dimension,):
-                        logger.error(f"Invalid vector shape for news item {item.id}: {vector.shape}")
-                        continue
-                    vector = self._normalize_vector(vector)
-                    self.vectors.append(vector)
-                    self.news_ids.append(item.id)
-                except Exception as e:
-                    logger.error(f"Error processing vector for news item {item.id}: {str(e)}")
-                    continue
-            
-            if not self.vectors:
-                logger.warning("No valid vectors found for indexing")
-                return
-                
-            vectors_array = np.array(self.vectors)
-            self.index.add(vectors_array)
             self.last_update = datetime.now(timezone.utc)
             
-            logger.info(f"Updated FAISS index with {len(self.vectors)} vectors")
+            logger.info(
+                f"Synced FAISS index: {len(batch)} changed rows, {evicted} evicted, "
+                f"{self.index.ntotal} vectors"
+            )
             
         except Exception as e:
             logger.error(f"Error updating FAISS index: {str(e)}\n{traceback.format_exc()}")
             raise
             
-    async def get_clusters(self, db: AsyncSession, hours: int, min_similarity: float) -> Dict[int, List[dict]]:
-        """Get news clusters using FAISS similarity search."""
+    def _sync_batch(self, batch: VectorBatch, cutoff: datetime) -> int:
+        """Apply a batch of changed rows and evict stale items; runs on a compute worker."""
+        with self._index_lock:
+            if len(batch):
+                self._apply_batch(batch)
+            return self._evict_before(cutoff)
+            
+    def _apply_batch(self, batch: VectorBatch):
+        """Refresh last_seen_at of known items and add vectors for new ones."""
+        positions = np.fromiter(
+            (self._positions.get(nid, -1) for nid in batch.ids.tolist()),
+            dtype=np.int64,
+            count=len(batch)
+        )
+        known = positions >= 0
+        self.last_seen[positions[known]] = batch.last_seen[known]
+        
+        new = ~known
+        if not new.any():
+            return
+        
+        ids = batch.ids[new]
+        valid, vectors = self._normalize_rows(ids, batch.vectors[new])
+        new_seen = batch.last_seen[new]
+        ids = ids[valid]
+        
+        if self.index.ntotal == 0:
+            self.index = self._new_index(vectors if self.trainable else None)
+        
+        self.index.add_with_ids(vectors, ids)
+        offset = len(self.news_ids)
+        self.news_ids.extend(ids.tolist())
+        self._positions.update((nid, offset + i) for i, nid in enumerate(ids.tolist()))
+        self.vectors = np.vstack([self.vectors, vectors])
+        self.last_seen = np.concatenate([self.last_seen, new_seen[valid]])
+        
+        # Retrain once the window has outgrown the data the index was trained on
+        if self._trained_on and len(self.news_ids) > settings.FAISS_RETRAIN_FACTOR * self._trained_on:
+            logger.info(f"Retraining FAISS index on {len(self.news_ids)} vectors")
+            self._reindex_from_memory()
+        
+    def _evict_before(self, cutoff: datetime) -> int:
+        """
+        Remove items whose last_seen_at is older than the cutoff, then the least
+        recently seen items beyond FAISS_MAX_VECTORS.
+        """
+        stale = self.last_seen < cutoff.timestamp()
+        overflow = len(self.news_ids) - int(stale.sum()) - settings.FAISS_MAX_VECTORS
+        if overflow > 0:
+            oldest_kept = np.argsort(np.where(stale, np.inf, self.last_seen), kind="stable")[:overflow]
+            stale[oldest_kept] = True
+        if not stale.any():
+            return 0
+        
+        keep = ~stale
+        stale_ids = np.asarray(self.news_ids, dtype=np.int64)[stale]
+        self.vectors = np.ascontiguousarray(self.vectors[keep])
+        self.last_seen = self.last_seen[keep]
+        self.news_ids = [nid for nid, k in zip(self.news_ids, keep) if k]
+        self._positions = {nid: i for i, nid in enumerate(self.news_ids)}
+        
         try:
-            # Update index if needed
-            now = datetime.now(timezone.utc)
-            if not self.last_update or \
-               (now - self.last_update) > timedelta(hours=1):
-                await self.update_index(db, hours)
+            self.index.remove_ids(stale_ids)
+        except RuntimeError:
+            # Graph indexes such as HNSW cannot remove vectors
+            self._reindex_from_memory()
+        return len(stale_ids)
             
-            if self.index.ntotal == 0 or not self.vectors:
-                logger.warning("No vectors in FAISS index")
-                return {}
+    def _snapshot_path(self, name: str) -> str:
+        """Get the path of a file in the snapshot directory."""
+        return os.path.join(self.snapshot_dir, name)
+        
+    def publish_snapshot(self):
+        """
+        Write the current index to disk as a new snapshot version.
+        
+        Each version gets its own files; the CURRENT pointer is swapped with an
+        atomic rename only after they are complete, so readers never see a
+        partial snapshot. Older versions beyond FAISS_SNAPSHOT_KEEP are removed
+        (processes that still map them keep their pages until they swap).
+        """
+        try:
+            os.makedirs(self.snapshot_dir, exist_ok=True)
+            version = time.time_ns()
             
-            # Convert similarity threshold to L2 distance
-            # For normalized vectors: cos_sim = 1 - L2^2/2
-            # Therefore: L2^2 = 2(1 - cos_sim)
-            max_l2_squared = 2 * (1 - min_similarity)
+            faiss.write_index(self.index, self._snapshot_path(f"index-{version}.faiss"))
+            np.save(self._snapshot_path(f"vectors-{version}.npy"), self.vectors)
+            np.save(self._snapshot_path(f"ids-{version}.npy"), np.asarray(self.news_ids, dtype=np.int64))
+            np.save(self._snapshot_path(f"seen-{version}.npy"), self.last_seen)
+            with open(self._snapshot_path(f"meta-{version}.json"), "w") as f:
+                json.dump({
+                    "version": version,
+                    "hours": self.hours,
+                    "watermark": self.watermark.isoformat() if self.watermark else None,
+                    "last_update": self.last_update.isoformat() if self.last_update else None,
+                    "flat": is_flat(self.index)
+                }, f)
             
-            # Find clusters using transitive clustering
-            clusters = {}
-            used_indices = set()
-            cluster_id = 0
+            pointer = self._snapshot_path("CURRENT.tmp")
+            with open(pointer, "w") as f:
+                f.write(str(version))
+            os.replace(pointer, self._snapshot_path("CURRENT"))
+            self.snapshot_version = version
             
-            vectors_array = np.array(self.vectors)
+            self._prune_snapshots(version)
+            logger.info(f"Published FAISS snapshot {version} with {self.index.ntotal} vectors")
             
-            for i in range(len(vectors_array)):
-                if i in used_indices:
-                    continue
-                    
+        except Exception as e:
+            logger.error(f"Error publishing FAISS snapshot: {str(e)}\n{traceback.format_exc()}")
+            
+    def _prune_snapshots(self, current: int):
+        """Delete snapshot files older than the most recent versions."""
+        versions = sorted({
+            int(name.split("-", 1)[1].split(".", 1)[0])
+            for name in os.listdir(self.snapshot_dir)
+            if name.startswith("meta-")
+        })
+        for version in versions[:-settings.FAISS_SNAPSHOT_KEEP]:
+            if version == current:
+                continue
+            for prefix, ext in (("index", "faiss"), ("vectors", "npy"), ("ids", "npy"), ("seen", "npy"), ("meta", "json")):
                 try:
-                    # Search for similar vectors
-                    D, I = self.index.search(vectors_array[i:i+1], self.index.ntotal)
-                    
-                    # Filter by distance threshold and create cluster
-                    similar_indices = set(I[0][D[0] <= max_l2_squared])
+                    os.remove(self._snapshot_path(f"{prefix}-{version}.{ext}"))
+                except FileNotFoundError:
+                    pass
                     
-                    if len(similar_indices) > 1:  # At least 2 items to form a cluster
-                        # Use transitive similarity: add items similar to any cluster member
-                        cluster_growing = True
-                        while cluster_growing:
-                            size_before = len(similar_indices)
-                            
-                            # Check similarity to all current cluster members
-                            for idx in list(similar_indices):
-                                if idx >= 0:  # Valid index
-                                    D_new, I_new = self.index.search(vectors_array[idx:idx+1], self.index.ntotal)
-                                    new_similar = set(I_new[0][D_new[0] <= max_l2_squared])
-                                    similar_indices.update(new_similar)
-                            
-                            cluster_growing = len(similar_indices) > size_before
-                        
-                        # Create cluster items
-                        cluster_items = []
-                        for idx in similar_indices:
-                            if idx >= 0 and idx not in used_indices:  # Valid index and not used
-                                used_indices.add(idx)
-                                # Calculate similarity to cluster center
-                                D_center, _ = self.index.search(vectors_array[i:i+1], 1)
-                                similarity = 1 - (float(D_center[0][0]) / 2)  # Convert L2 squared to similarity
-                                cluster_items.append({
-                                    'id': self.news_ids[idx],
-                                    'similarity': similarity
-                                })
-                        
-                        if len(cluster_items) > 1:  # Ensure cluster has at least 2 items
-                            clusters[cluster_id] = cluster_items
-                            cluster_id += 1
-                            
-                except Exception as e:
-                    logger.error(f"Error processing cluster for vector {i}: {str(e)}\n{traceback.format_exc()}")
-                    continue
+    def load_snapshot(self, hours: int) -> bool:
+        """
+        Swap in the newest published snapshot if it is newer than the current one.
+        
+        Returns:
+            True if the service is serving an up-to-date snapshot for this window
+        """
+        now = time.monotonic()
+        if self.snapshot_version is not None and \
+           now - self._last_snapshot_check < settings.FAISS_SNAPSHOT_CHECK_INTERVAL:
+            return self.hours == hours
+        self._last_snapshot_check = now
+        
+        try:
+            with open(self._snapshot_path("CURRENT")) as f:
+                version = int(f.read().strip())
+        except (FileNotFoundError, ValueError):
+            return False
+        
+        if version == self.snapshot_version:
+            return self.hours == hours
+        
+        try:
+            with open(self._snapshot_path(f"meta-{version}.json")) as f:
+                meta = json.load(f)
+            if meta["hours"] != hours:
+                return False
+            
+            vectors = np.load(self._snapshot_path(f"vectors-{version}.npy"), mmap_mode="r")
+            ids = np.load(self._snapshot_path(f"ids-{version}.npy"))
+            last_seen = np.load(self._snapshot_path(f"seen-{version}.npy"))
+            if meta.get("flat"):
+                # Search the shared vectors instead of a private copy of the same matrix
+                index = MappedFlatIndex(vectors, ids)
+            else:
+                index = faiss.read_index(self._snapshot_path(f"index-{version}.faiss"), SNAPSHOT_READ_FLAGS)
+            news_ids = ids.tolist()
+        except Exception as e:
+            logger.error(f"Error loading FAISS snapshot {version}: {str(e)}")
+            return False
+        
+        # Swap everything in without yielding to the event loop in between
+        self.index = index
+        self.vectors = vectors
+        self.news_ids = news_ids
+        self.last_seen = last_seen
+        self._positions = {nid: i for i, nid in enumerate(news_ids)}
+        self.hours = meta["hours"]
+        self.watermark = datetime.fromisoformat(meta["watermark"]) if meta["watermark"] else None
+        self.last_update = datetime.fromisoformat(meta["last_update"]) if meta["last_update"] else None
+        self.snapshot_version = version
+        self.read_only = True
+        
+        logger.info(f"Loaded FAISS snapshot {version} with {index.ntotal} vectors")
+        return True
+            
+    async def _ensure_fresh(self, db: AsyncSession, hours: int):
+        """Update the index if it has never been built or is older than an hour."""
+        # Prefer the snapshot published by the embedding worker over a database scan
+        if self.load_snapshot(hours):
+            return
+        
+        now = datetime.now(timezone.utc)
+        if not self.last_update or \
+           (now - self.last_update) > timedelta(hours=1):
+            await self.update_index(db, hours)
+            
+    async def get_clusters(self, db: AsyncSession, hours: int, min_similarity: float) -> Dict[int, List[dict]]:
+        """Get news clusters using FAISS similarity search."""
+        try:
+            # Update index if needed
+            await self._ensure_fresh(db, hours)
+            
+            if self.index.ntotal == 0:
+                logger.warning("No vectors in FAISS index")
+                return {}
+            
+            # Single pass over the thresholded similarity graph instead of
+            # one full index scan per cluster member
+            clusters = await get_compute_executor().run(
+                transitive_clusters,
+                self.vectors,
+                list(self.news_ids),
+                min_similarity
+            )
             
             logger.info(f"Generated {len(clusters)} clusters")
             return clusters
@@ -162,6 +433,44 @@ class FaissService:
             logger.error(f"Error getting clusters: {str(e)}\n{traceback.format_exc()}")
             raise
 
+    async def get_dendrogram(
+        self,
+        db: AsyncSession,
+        hours: int,
+        floor_similarity: float
+    ) -> Tuple[List[int], List[List[float]]]:
+        """
+        Compute the single-linkage cluster tree of the indexed vectors.
+        
+        Returns:
+            Tuple of (news_ids, edges) where edges are [row, col, similarity]
+            sorted by descending similarity and rows/cols index into news_ids
+        """
+        try:
+            await self._ensure_fresh(db, hours)
+            
+            if self.index.ntotal == 0:
+                logger.warning("No vectors in FAISS index")
+                return [], []
+            
+            news_ids = list(self.news_ids)
+            rows, cols, sims = await get_compute_executor().run(
+                single_linkage_tree,
+                self.vectors,
+                floor_similarity
+            )
+            edges = [
+                [int(row), int(col), float(sim)]
+                for row, col, sim in zip(rows, cols, sims)
+            ]
+            
+            logger.info(f"Generated cluster tree with {len(edges)} edges over {len(news_ids)} vectors")
+            return news_ids, edges
+            
+        except Exception as e:
+            logger.error(f"Error getting cluster tree: {str(e)}\n{traceback.format_exc()}")
+            raise
+
     async def search_similar(
         self, 
         db: AsyncSession,
@@ -171,6 +480,8 @@ class FaissService:
     ) -> List[Tuple[int, float]]:
         """Search for similar vectors."""
         try:
+            await self._ensure_fresh(db, settings.VISUALIZATION_TIME_RANGE)
+            
             if self.index.ntotal == 0:
                 return []
             
@@ -180,16 +491,16 @@ class FaissService:
             # Convert similarity threshold to L2 distance
             max_l2_squared = 2 * (1 - min_similarity)
             
-            # Search
-            D, I = self.index.search(vector, k)
+            # Search on a compute worker
+            D, I = await get_compute_executor().run(self._search, vector, k)
             
             # Convert L2 distances to similarities and filter
             results = []
-            for i, idx in enumerate(I[0]):
-                if idx != -1:  # Valid index
+            for i, news_id in enumerate(I[0]):
+                if news_id != -1:  # Valid index
                     similarity = 1 - (D[0][i] / 2)  # Convert L2 squared to similarity
                     if similarity >= min_similarity:
-                        results.append((self.news_ids[idx], float(similarity)))
+                        results.append((int(news_id), float(similarity)))
             
             return results
             
@@ -197,6 +508,11 @@ class FaissService:
             logger.error(f"Error searching similar vectors: {str(e)}\n{traceback.format_exc()}")
             raise
 
+    def _search(self, vectors: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Search the index without racing a concurrent sync."""
+        with self._index_lock:
+            return self.index.search(np.ascontiguousarray(vectors, dtype=np.float32), k)
+
 # Global instance
 faiss_service = FaissService()
 
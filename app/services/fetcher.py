@@ -0,0 +1,219 @@
+"""Streaming, size-capped page downloads."""
+import asyncio
+import codecs
+import logging
+import time
+from collections import defaultdict
+from contextlib import nullcontext
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+from bs4.dammit import EncodingDetector
+import httpx
+
+from app.services.scheduler import HostLimiter
+
+logger = logging.getLogger(__name__)
+
+# Content types of pages the extractor can parse
+HTML_TYPES = ("text/html", "application/xhtml+xml")
+# Content types feeds are served with in practice, HTML for homepages
+FEED_TYPES = HTML_TYPES + (
+    "application/rss+xml",
+    "application/atom+xml",
+    "application/rdf+xml",
+    "application/xml",
+    "text/xml",
+    "text/plain"
+)
+
+# Histogram bucket upper bounds
+BYTE_BUCKETS = (16 * 1024, 64 * 1024, 256 * 1024, 1024 * 1024, 4 * 1024 * 1024)
+LATENCY_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Bytes searched for a byte order mark, <meta charset> or XML declaration
+SNIFF_BYTES = 1024
+
+
+class FetchRejected(Exception):
+    """Raised for a response whose content type the caller does not accept."""
+
+
+@dataclass
+class FetchedPage:
+    """A downloaded page, cut at the byte budget."""
+    url: str
+    status_code: int
+    headers: httpx.Headers
+    content: bytes
+    encoding: Optional[str]  # From the headers or the page itself, None to detect from the content
+    truncated: bool = False
+
+
+class Histogram:
+    """Counts observations in cumulative buckets."""
+
+    def __init__(self, bounds: Tuple[float, ...]):
+        """Initialize empty buckets."""
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)  # The last bucket takes everything above the bounds
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        """Record one observation."""
+        for i, bound in enumerate(self.bounds):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        else:
+            self.counts[-1] += 1
+        self.count += 1
+        self.sum += value
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Get the cumulative bucket counts, count and sum."""
+        buckets = {}
+        total = 0
+        for bound, count in zip(list(self.bounds) + ["+Inf"], self.counts):
+            total += count
+            buckets[f"le_{bound}"] = total
+        return {"buckets": buckets, "count": self.count, "sum": self.sum}
+
+
+def _normalize_encoding(name: Optional[str]) -> Optional[str]:
+    """Get Python's name for an encoding, or None if it is unknown."""
+    if not name:
+        return None
+    try:
+        return codecs.lookup(name.strip().strip("\"'")).name
+    except LookupError:
+        return None
+
+
+def declared_encoding(content_type: str, head: bytes) -> Optional[str]:
+    """
+    Find the encoding a page declares without decoding it.
+
+    A byte order mark wins, then the charset of the Content-Type header,
+    then a <meta charset> or XML declaration near the start of the page.
+    """
+    _, encoding = EncodingDetector.strip_byte_order_mark(head)
+    if encoding:
+        return _normalize_encoding(encoding)
+
+    for param in content_type.split(";")[1:]:
+        key, _, value = param.partition("=")
+        if key.strip().lower() == "charset":
+            encoding = _normalize_encoding(value)
+            if encoding:
+                return encoding
+
+    return _normalize_encoding(EncodingDetector.find_declared_encoding(head, is_html=True))
+
+
+class Fetcher:
+    """
+    Downloads pages through a stream, reading no more than `max_bytes`.
+
+    The content type is checked before the body is read, so PDFs, videos
+    and other pages the crawler cannot parse cost one round trip only. The
+    body is kept as bytes along with the encoding the page declares;
+    decoding and any encoding detection happen where the page is parsed.
+    Bytes and latency of each source's downloads are kept in histograms.
+    """
+
+    def __init__(self, client: httpx.AsyncClient, host_limiter: HostLimiter, max_bytes: int):
+        """Initialize the fetcher and its metrics."""
+        self.client = client
+        self.host_limiter = host_limiter
+        self.max_bytes = max_bytes
+        self.fetched = 0
+        self.rejected = 0
+        self.truncated = 0
+        self._bytes: Dict[str, Histogram] = defaultdict(lambda: Histogram(BYTE_BUCKETS))
+        self._latency: Dict[str, Histogram] = defaultdict(lambda: Histogram(LATENCY_BUCKETS))
+
+    async def fetch(
+        self,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+        accept: Tuple[str, ...] = HTML_TYPES,
+        source: Optional[str] = None,
+        limit: Optional[asyncio.Semaphore] = None
+    ) -> FetchedPage:
+        """
+        GET a URL within the per-host request limits.
+
+        Args:
+            url: The URL to download
+            headers: Extra request headers
+            accept: Content types to read; a response without a content type is read too
+            source: The source the download is counted for in the histograms
+            limit: Semaphore bounding requests across hosts, taken only once
+                the host's slot is held so waiting on a busy host blocks no one else
+
+        Returns:
+            The page; its content is empty for 304 Not Modified
+
+        Raises:
+            httpx.HTTPStatusError: For error statuses
+            FetchRejected: For content types not in `accept`
+        """
+        async with self.host_limiter.slot(url), limit or nullcontext():
+            started = time.monotonic()
+            async with self.client.stream("GET", url, headers=headers) as response:
+                if response.status_code == 304:
+                    return FetchedPage(url, 304, response.headers, b"", None)
+                response.raise_for_status()
+
+                content_type = response.headers.get("Content-Type", "")
+                media_type = content_type.split(";")[0].strip().lower()
+                if media_type and media_type not in accept:
+                    self.rejected += 1
+                    raise FetchRejected(f"Not fetching {url}, its content type is {media_type}")
+
+                chunks: List[bytes] = []
+                size = 0
+                truncated = False
+                async for chunk in response.aiter_bytes():
+                    chunks.append(chunk)
+                    size += len(chunk)
+                    if size > self.max_bytes:
+                        truncated = True
+                        break
+
+        content = b"".join(chunks)
+        if truncated:
+            self.truncated += 1
+            logger.warning(f"Cut the body of {url} at {self.max_bytes} bytes")
+            content = content[:self.max_bytes]
+
+        self.fetched += 1
+        if source:
+            self._bytes[source].observe(len(content))
+            self._latency[source].observe(time.monotonic() - started)
+
+        return FetchedPage(
+            url,
+            response.status_code,
+            response.headers,
+            content,
+            declared_encoding(content_type, content[:SNIFF_BYTES]),
+            truncated
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        """Get download counts and each source's byte and latency histograms."""
+        return {
+            "max_bytes": self.max_bytes,
+            "fetched": self.fetched,
+            "rejected": self.rejected,
+            "truncated": self.truncated,
+            "sources": {
+                source: {
+                    "bytes": self._bytes[source].snapshot(),
+                    "latency_seconds": self._latency[source].snapshot()
+                }
+                for source in self._bytes
+            }
+        }
@@ -0,0 +1,145 @@
+"""Write-behind buffer coalescing sightings of known news items."""
+import asyncio
+import logging
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# One row rewrite per buffered URL, however often it was seen
+FLUSH_STATEMENT = text("""
+    UPDATE news
+    SET hit_count = news.hit_count + hits.hits,
+        last_seen_at = GREATEST(news.last_seen_at, hits.seen_at),
+        updated_at = NOW()
+    FROM unnest(
+        cast(:urls as text[]),
+        cast(:hits as integer[]),
+        cast(:seen_at as timestamptz[])
+    ) AS hits(url, hits, seen_at)
+    WHERE news.url = hits.url
+""")
+
+
+class HitBuffer:
+    """
+    Aggregates sightings of known news items in memory and writes them in bulk.
+
+    Each URL's sightings are coalesced into a hit count and the time it was
+    last seen, and all buffered URLs are written with one UPDATE every
+    `interval` seconds, or sooner once `max_urls` URLs are waiting. A
+    homepage linking to the same known articles on every crawl then costs
+    one row rewrite per article and flush instead of one per sighting.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], AsyncSession],
+        interval: float = None,
+        max_urls: int = None
+    ):
+        """Initialize an empty buffer."""
+        self.session_factory = session_factory
+        self.interval = interval or settings.HIT_FLUSH_INTERVAL
+        self.max_urls = max_urls or settings.HIT_BUFFER_MAX_URLS
+        self._hits: Dict[str, Tuple[int, datetime]] = {}  # URL -> (hits, last seen)
+        self._full = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self.running = False
+        self.sightings = 0
+        self.flushes = 0
+        self.rows_written = 0
+        self.errors = 0
+        self.last_flush: Optional[Dict[str, Any]] = None
+
+    def add(self, urls: Iterable[str], seen_at: Optional[datetime] = None):
+        """Record one sighting of each of the given known URLs."""
+        seen_at = seen_at or datetime.now(timezone.utc)
+        for url in urls:
+            hits, _ = self._hits.get(url, (0, seen_at))
+            self._hits[url] = (hits + 1, seen_at)
+            self.sightings += 1
+        if len(self._hits) >= self.max_urls:
+            self._full.set()
+
+    async def flush(self) -> int:
+        """Write all buffered sightings; returns the number of updated rows."""
+        async with self._flush_lock:
+            if not self._hits:
+                return 0
+
+            # Take the buffer so sightings during the write start a new one
+            pending, self._hits = self._hits, {}
+            self._full.clear()
+            started = time.monotonic()
+            urls = list(pending)
+            try:
+                async with self.session_factory() as session:
+                    result = await session.execute(
+                        FLUSH_STATEMENT,
+                        {
+                            "urls": urls,
+                            "hits": [pending[url][0] for url in urls],
+                            "seen_at": [pending[url][1] for url in urls]
+                        }
+                    )
+                    await session.commit()
+            except Exception as e:
+                self.errors += 1
+                logger.error(f"Error flushing {len(pending)} buffered news item hits: {str(e)}")
+                self._restore(pending)
+                return 0
+            except BaseException:
+                # Cancelled mid-write; keep the sightings for the final flush
+                self._restore(pending)
+                raise
+
+            self.flushes += 1
+            self.rows_written += result.rowcount
+            self.last_flush = {
+                "flushed_at": datetime.now(timezone.utc).isoformat(),
+                "urls": len(urls),
+                "hits": sum(hits for hits, _ in pending.values()),
+                "rows": result.rowcount,
+                "duration_seconds": time.monotonic() - started
+            }
+            return result.rowcount
+
+    def _restore(self, pending: Dict[str, Tuple[int, datetime]]):
+        """Merge sightings that were not written back so the next flush retries them."""
+        for url, (hits, seen_at) in pending.items():
+            newer_hits, newer_seen_at = self._hits.get(url, (0, seen_at))
+            self._hits[url] = (hits + newer_hits, max(seen_at, newer_seen_at))
+
+    async def run_forever(self):
+        """Flush every `interval` seconds, or as soon as the buffer is full, until stopped."""
+        self.running = True
+        while self.running:
+            try:
+                await asyncio.wait_for(self._full.wait(), timeout=self.interval)
+            except asyncio.TimeoutError:
+                pass
+            await self.flush()
+
+    def stop(self):
+        """Flush once more and stop, without waiting for the interval."""
+        self.running = False
+        self._full.set()
+
+    def stats(self) -> Dict[str, Any]:
+        """Get the buffer's size, counters and the metrics of its last flush."""
+        return {
+            "buffered_urls": len(self._hits),
+            "sightings": self.sightings,
+            "flushes": self.flushes,
+            "rows_written": self.rows_written,
+            # Sightings per row rewrite; higher means more write amplification avoided
+            "coalescing_ratio": self.sightings / self.rows_written if self.rows_written else 0.0,
+            "errors": self.errors,
+            "last_flush": self.last_flush
+        }
@@ -0,0 +1,194 @@
+"""MinHash LSH index of news items for finding republished copies of a story."""
+import hashlib
+import logging
+import re
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.news import NewsFingerprint, NewsItem
+
+logger = logging.getLogger(__name__)
+
+# Words per shingle
+SHINGLE_SIZE = 3
+
+# Texts with fewer words are too short to fingerprint reliably
+MIN_WORDS = 10
+
+# Hash functions per signature
+NUM_HASHES = 128
+
+# Lowest chance that a pair at the threshold shares a band
+MIN_RECALL = 0.95
+
+WORD_PATTERN = re.compile(r"\w+")
+
+# Fixed seeds, so signatures stay comparable across restarts
+_random = np.random.RandomState(20240601)
+_MULTIPLIERS = _random.randint(0, 1 << 64, size=NUM_HASHES, dtype=np.uint64) | np.uint64(1)
+_INCREMENTS = _random.randint(0, 1 << 64, size=NUM_HASHES, dtype=np.uint64)
+
+
+def minhash(text: str) -> Optional[np.ndarray]:
+    """
+    Get the MinHash signature of a text's word shingles.
+
+    The share of equal positions in two signatures estimates the Jaccard
+    similarity of the texts' shingle sets. Returns None for texts shorter
+    than MIN_WORDS words.
+    """
+    words = WORD_PATTERN.findall(text.lower())
+    if len(words) < MIN_WORDS:
+        return None
+
+    shingles = {" ".join(words[i:i + SHINGLE_SIZE]) for i in range(len(words) - SHINGLE_SIZE + 1)}
+    hashes = np.frombuffer(
+        b"".join(hashlib.blake2b(shingle.encode("utf-8"), digest_size=4).digest() for shingle in shingles),
+        dtype=">u4"
+    ).astype(np.uint64)
+    # Multiply-add-shift hashing of the 32-bit shingle hashes; the sums wrap around at 64 bits
+    permuted = (hashes[:, None] * _MULTIPLIERS + _INCREMENTS) >> np.uint64(32)
+    return permuted.min(axis=0).astype(np.uint32)
+
+
+def _lsh_shape(threshold: float) -> Tuple[int, int]:
+    """
+    Get the bands and rows per band for an LSH threshold.
+
+    Longer bands make fewer candidates to compare, so this takes the
+    longest bands that still make a pair exactly at the threshold a
+    candidate with probability MIN_RECALL.
+    """
+    shape = (NUM_HASHES, 1)
+    for rows in range(2, NUM_HASHES + 1):
+        bands = NUM_HASHES // rows
+        if 1 - (1 - threshold ** rows) ** bands < MIN_RECALL:
+            break
+        shape = (bands, rows)
+    return shape
+
+
+class NearDuplicateIndex:
+    """
+    In-memory MinHash LSH index of news items, persisted in news_fingerprints.
+
+    Two items whose title and summary have an estimated Jaccard similarity
+    of at least `threshold` over word shingles are near-duplicates. Each
+    signature is split into bands sized so that such pairs likely share a
+    band, and a lookup only compares the signatures sharing a band with
+    the query.
+    """
+
+    def __init__(self, session_factory: Callable[[], AsyncSession], threshold: float):
+        """Initialize an empty index."""
+        self.session_factory = session_factory
+        self.threshold = threshold
+        self.bands, self.rows = _lsh_shape(threshold)
+        self._buckets: List[Dict[bytes, Set[int]]] = [{} for _ in range(self.bands)]
+        self._items: Dict[int, Tuple[np.ndarray, str]] = {}  # News ID -> (signature, URL)
+        self.lookups = 0
+        self.matches = 0
+        self.lookup_seconds = 0.0
+        self.max_lookup_seconds = 0.0
+        self.loaded_at: Optional[datetime] = None
+
+    async def ensure_table(self):
+        """Create the fingerprint table if the database predates it."""
+        try:
+            async with self.session_factory() as session:
+                await session.run_sync(
+                    lambda sync_session: NewsFingerprint.__table__.create(sync_session.connection(), checkfirst=True)
+                )
+                await session.commit()
+        except Exception as e:
+            logger.error(f"Error creating the news fingerprint table: {str(e)}")
+
+    async def load(self):
+        """Replace the index with the signatures of all stored news items."""
+        try:
+            async with self.session_factory() as session:
+                result = await session.execute(
+                    select(NewsFingerprint.news_id, NewsFingerprint.minhash, NewsItem.url)
+                    .join(NewsItem, NewsItem.id == NewsFingerprint.news_id)
+                )
+                rows = result.all()
+        except Exception as e:
+            logger.error(f"Error loading news fingerprints: {str(e)}")
+            return
+
+        self._buckets = [{} for _ in range(self.bands)]
+        self._items = {}
+        for news_id, stored, url in rows:
+            signature = np.frombuffer(stored, dtype=">u4").astype(np.uint32)
+            if len(signature) == NUM_HASHES:
+                self.add(news_id, url, signature)
+        self.loaded_at = datetime.now(timezone.utc)
+        logger.info(f"Loaded {len(self._items)} news fingerprints")
+
+    def _band_keys(self, signature: np.ndarray) -> List[bytes]:
+        """Get the bucket key of each band of a signature."""
+        return [signature[i * self.rows:(i + 1) * self.rows].tobytes() for i in range(self.bands)]
+
+    def add(self, news_id: int, url: str, signature: np.ndarray):
+        """Index a news item's signature."""
+        self._items[news_id] = (signature, url)
+        for key, buckets in zip(self._band_keys(signature), self._buckets):
+            buckets.setdefault(key, set()).add(news_id)
+
+    def remove(self, news_id: int):
+        """Drop a news item from the index."""
+        item = self._items.pop(news_id, None)
+        if item is None:
+            return
+        for key, buckets in zip(self._band_keys(item[0]), self._buckets):
+            bucket = buckets.get(key)
+            if bucket is not None:
+                bucket.discard(news_id)
+                if not bucket:
+                    del buckets[key]
+
+    def find(self, signature: np.ndarray) -> Optional[Tuple[int, str]]:
+        """Get the ID and URL of the most similar indexed item at or above the threshold, if any."""
+        started = time.perf_counter()
+        candidates: Set[int] = set()
+        for key, buckets in zip(self._band_keys(signature), self._buckets):
+            candidates.update(buckets.get(key, ()))
+
+        best = None
+        best_similarity = self.threshold
+        for news_id in candidates:
+            similarity = float(np.mean(self._items[news_id][0] == signature))
+            if similarity >= best_similarity:
+                best, best_similarity = news_id, similarity
+
+        elapsed = time.perf_counter() - started
+        self.lookups += 1
+        self.lookup_seconds += elapsed
+        self.max_lookup_seconds = max(self.max_lookup_seconds, elapsed)
+        if best is None:
+            return None
+        self.matches += 1
+        return best, self._items[best][1]
+
+    @staticmethod
+    def row(news_id: int, signature: np.ndarray) -> NewsFingerprint:
+        """Get the row persisting a news item's signature."""
+        return NewsFingerprint(news_id=news_id, minhash=signature.astype(">u4").tobytes())
+
+    def stats(self) -> Dict[str, Any]:
+        """Get the index size, match count and lookup latency."""
+        return {
+            "size": len(self._items),
+            "threshold": self.threshold,
+            "bands": self.bands,
+            "rows_per_band": self.rows,
+            "lookups": self.lookups,
+            "matches": self.matches,
+            "avg_lookup_ms": 1000 * self.lookup_seconds / self.lookups if self.lookups else 0.0,
+            "max_lookup_ms": 1000 * self.max_lookup_seconds,
+            "loaded_at": self.loaded_at.isoformat() if self.loaded_at else None
+        }
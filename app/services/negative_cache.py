@@ -0,0 +1,140 @@
+"""Persistent negative cache of article URLs that failed to be ingested."""
+import logging
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterable
+from sqlalchemy import DateTime, Float, String, any_, bindparam, delete, func, literal, select, text
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models.news import FailedURL
+from app.utils.helpers import canonicalize_url
+
+logger = logging.getLogger(__name__)
+
+# Failures of the item rather than its page; sources keep no validators while one is suppressed
+RETRY_REASONS = ("embed",)
+
+# A failure within the entry's lifetime doubles the delay before the next try, up to the TTL
+RECORD_STATEMENT = text("""
+    INSERT INTO failed_urls AS failed (url, reason, failures, first_failed_at, last_failed_at, retry_at, expires_at)
+    VALUES (
+        :url, :reason, 1, :now, :now,
+        :now + make_interval(secs => :retry_delay),
+        :now + make_interval(secs => :ttl)
+    )
+    ON CONFLICT (url) DO UPDATE SET
+        reason = EXCLUDED.reason,
+        failures = CASE WHEN failed.expires_at < :now THEN 1 ELSE failed.failures + 1 END,
+        first_failed_at = CASE WHEN failed.expires_at < :now THEN :now ELSE failed.first_failed_at END,
+        last_failed_at = :now,
+        retry_at = :now + make_interval(secs => LEAST(
+            :retry_delay * power(2.0, CASE WHEN failed.expires_at < :now THEN 0 ELSE LEAST(failed.failures, 30) END),
+            :ttl
+        )),
+        expires_at = EXCLUDED.expires_at
+""").bindparams(
+    bindparam("now", type_=DateTime(timezone=True)),
+    bindparam("retry_delay", type_=Float),
+    bindparam("ttl", type_=Float)
+)
+
+
+class NegativeCache:
+    """
+    Remembers article URLs whose fetch, extraction or embedding failed.
+
+    A failed URL is skipped for `retry_delay` seconds, twice as long after
+    each further failure, up to `ttl`. An entry is forgotten `ttl` seconds
+    after its last failure, so a URL that stops being linked eventually
+    leaves the cache and starts over if it comes back. Entries are keyed by
+    canonicalized URL and kept in PostgreSQL, so they survive restarts.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], AsyncSession],
+        retry_delay: float = None,
+        ttl: float = None
+    ):
+        """Initialize the cache."""
+        self.session_factory = session_factory
+        self.retry_delay = retry_delay or settings.NEGATIVE_CACHE_RETRY_DELAY
+        self.ttl = ttl or settings.NEGATIVE_CACHE_TTL
+        self.recorded: Counter = Counter()  # Failures recorded per reason
+        self.suppressed = 0
+        self.pruned = 0
+
+    @staticmethod
+    def key(url: str) -> str:
+        """Get the cache key of a URL."""
+        return canonicalize_url(url) or url
+
+    async def ensure_table(self):
+        """Create the failed URL table if the database predates it."""
+        try:
+            async with self.session_factory() as session:
+                await session.run_sync(
+                    lambda sync_session: FailedURL.__table__.create(sync_session.connection(), checkfirst=True)
+                )
+                await session.commit()
+        except Exception as e:
+            logger.error(f"Error creating the failed URL table: {str(e)}")
+
+    def lookup_query(self, keys: Iterable[str]):
+        """
+        Select the given keys that are still to be skipped.
+
+        The rows have the same (matched URL, item URL, failed, retry) shape
+        as the known URL lookup, so both can be answered by one query; retry
+        is true for failures in RETRY_REASONS.
+        """
+        return select(
+            FailedURL.url,
+            literal(None, String).label("item_url"),
+            literal(True).label("failed"),
+            FailedURL.reason.in_(RETRY_REASONS).label("retry")
+        ).where(
+            FailedURL.url == any_(bindparam("failed_keys", list(keys), type_=ARRAY(String))),
+            FailedURL.retry_at > func.now()
+        )
+
+    async def record(self, url: str, reason: str):
+        """Remember that ingesting a URL failed and when to try it again."""
+        try:
+            async with self.session_factory() as session:
+                await session.execute(
+                    RECORD_STATEMENT,
+                    {
+                        "url": self.key(url),
+                        "reason": reason[:50],
+                        "now": datetime.now(timezone.utc),
+                        "retry_delay": self.retry_delay,
+                        "ttl": self.ttl
+                    }
+                )
+                await session.commit()
+            self.recorded[reason] += 1
+        except Exception as e:
+            logger.error(f"Error recording failed URL {url}: {str(e)}")
+
+    async def prune(self) -> int:
+        """Forget expired entries; returns the number deleted."""
+        try:
+            async with self.session_factory() as session:
+                result = await session.execute(delete(FailedURL).where(FailedURL.expires_at < func.now()))
+                await session.commit()
+            self.pruned += result.rowcount
+            return result.rowcount
+        except Exception as e:
+            logger.error(f"Error pruning failed URLs: {str(e)}")
+            return 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Get the recorded failures per reason and the number of suppressed fetches."""
+        return {
+            "recorded": dict(self.recorded),
+            "suppressed": self.suppressed,
+            "pruned": self.pruned
+        }
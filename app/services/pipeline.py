@@ -0,0 +1,192 @@
+"""Staged ingest pipeline connected by bounded queues."""
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class IngestJob:
+    """A discovered news link on its way through the pipeline."""
+    title: str
+    url: str
+    source_url: str
+    result: asyncio.Future  # True if added, False if skipped, None if worth retrying
+    html: Optional[bytes] = None  # The article page as downloaded
+    encoding: Optional[str] = None  # The page's declared encoding, if any
+    content: Optional[Dict[str, str]] = None
+    signature: Optional[Any] = None  # MinHash of title and summary, indexed once the item is stored
+    embedding: Optional[List[float]] = None
+    enrich: bool = False  # Built from its feed entry, the page is extracted on demand later
+    aliases: List[str] = field(default_factory=list)  # Other URLs of the article, such as the one it was found by
+
+    def finish(self, outcome: Optional[bool]):
+        """Report the job's outcome to whoever submitted it."""
+        if not self.result.done():
+            self.result.set_result(outcome)
+
+
+# A stage handler returns True to pass the job on, or finishes it and returns False
+StageHandler = Callable[[IngestJob], Awaitable[bool]]
+
+
+class Stage:
+    """
+    A pool of workers taking jobs from a bounded queue.
+
+    A worker whose next stage's queue is full waits before taking another job,
+    so a slow stage pushes back on the stages before it instead of letting
+    jobs pile up in memory.
+    """
+
+    def __init__(self, name: str, handler: StageHandler, workers: int, queue_size: int):
+        """Initialize the stage."""
+        self.name = name
+        self.handler = handler
+        self.workers = workers
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.next: Optional["Stage"] = None
+        self._tasks: List[asyncio.Task] = []
+        self.processed = 0
+        self.failed = 0
+        self.busy_seconds = 0.0  # Time spent in the handler
+        self.blocked_seconds = 0.0  # Time spent waiting for room in the next stage
+
+    def start(self):
+        """Start the stage's workers."""
+        self._tasks = [asyncio.ensure_future(self._work()) for _ in range(self.workers)]
+
+    async def stop(self):
+        """Cancel the stage's workers."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def _work(self):
+        """Process jobs until cancelled."""
+        while True:
+            job = await self.queue.get()
+            try:
+                started = time.perf_counter()
+                try:
+                    forward = await self.handler(job)
+                except Exception as e:
+                    logger.error(f"Error in {self.name} stage for {job.url}: {str(e)}")
+                    self.failed += 1
+                    job.finish(None)
+                    continue
+                finally:
+                    self.busy_seconds += time.perf_counter() - started
+                self.processed += 1
+
+                if forward:
+                    if self.next is None:
+                        job.finish(True)
+                        continue
+                    started = time.perf_counter()
+                    await self.next.queue.put(job)
+                    self.blocked_seconds += time.perf_counter() - started
+            finally:
+                self.queue.task_done()
+
+    def stats(self) -> Dict[str, Any]:
+        """Get the stage's queue depth and timings."""
+        return {
+            "workers": self.workers,
+            "queued": self.queue.qsize(),
+            "queue_size": self.queue.maxsize,
+            "processed": self.processed,
+            "failed": self.failed,
+            "avg_seconds": self.busy_seconds / self.processed if self.processed else 0.0,
+            "busy_seconds": self.busy_seconds,
+            "blocked_seconds": self.blocked_seconds
+        }
+
+
+class IngestPipeline:
+    """
+    Chains stages so every discovered link flows through them in order.
+
+    Links are submitted to the first stage; a submitter waits when that
+    stage's queue is full, which throttles discovery to what the slowest
+    stage can absorb.
+    """
+
+    def __init__(self, stages: List[Stage]):
+        """Link the stages in order."""
+        self.stages = stages
+        for stage, next_stage in zip(stages, stages[1:]):
+            stage.next = next_stage
+        self._in_flight: Dict[str, asyncio.Future] = {}
+        self.started = False
+
+    def start(self):
+        """Start all stages."""
+        if not self.started:
+            for stage in self.stages:
+                stage.start()
+            self.started = True
+
+    async def stop(self):
+        """Stop all stages."""
+        for stage in self.stages:
+            await stage.stop()
+        self.started = False
+
+    async def submit(
+        self,
+        title: str,
+        url: str,
+        source_url: str,
+        content: Optional[Dict[str, str]] = None,
+        start: Optional[str] = None,
+        enrich: bool = False
+    ) -> Optional[bool]:
+        """
+        Send a link through the pipeline and wait for its outcome.
+
+        A link whose content is already known can enter at a later stage,
+        named by `start`, skipping the stages before it.
+
+        Returns:
+            True if a new item was added, False if it was skipped or is already
+            being ingested for another source, None if it failed in a way
+            worth retrying
+        """
+        self.start()
+
+        # The same article is often linked by several sources at once
+        pending = self._in_flight.get(url)
+        if pending is not None:
+            await asyncio.shield(pending)
+            return False
+
+        first = next(stage for stage in self.stages if stage.name == start) if start else self.stages[0]
+        job = IngestJob(
+            title, url, source_url, asyncio.get_running_loop().create_future(), content=content, enrich=enrich
+        )
+        self._in_flight[url] = job.result
+        try:
+            await first.queue.put(job)
+        except asyncio.CancelledError:
+            # Never queued, release anyone waiting on the same URL
+            job.finish(None)
+            self._in_flight.pop(url, None)
+            raise
+
+        try:
+            return await asyncio.shield(job.result)
+        finally:
+            if job.result.done():
+                self._in_flight.pop(url, None)
+            else:
+                # The submitter was cancelled; forget the job once it completes
+                job.result.add_done_callback(lambda _: self._in_flight.pop(url, None))
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Get the metrics of every stage."""
+        return {stage.name: stage.stats() for stage in self.stages}
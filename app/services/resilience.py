@@ -0,0 +1,119 @@
+"""Rate limiting and circuit breaking for calls to external services."""
+import asyncio
+import logging
+import random
+import time
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """
+    Async token-bucket rate limiter.
+
+    Tokens refill continuously at `rate` per second up to `capacity`; every
+    call takes one token and waits for it if the bucket is empty.
+    """
+
+    def __init__(self, rate: float, capacity: int):
+        """Initialize a full bucket."""
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float):
+        """Add the tokens earned since the last update."""
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self, deadline: Optional[float] = None) -> bool:
+        """
+        Take a token, waiting for one if needed.
+
+        Args:
+            deadline: time.monotonic() value after which to give up
+
+        Returns:
+            False if no token would be available before the deadline
+        """
+        while True:
+            now = time.monotonic()
+            self._refill(now)
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return True
+
+            wait = (1 - self.tokens) / self.rate
+            if deadline is not None and now + wait > deadline:
+                return False
+            await asyncio.sleep(wait)
+
+
+class CircuitBreaker:
+    """
+    Stops calls to a failing service for a cooldown period.
+
+    After `threshold` consecutive failures the breaker opens and rejects calls
+    for `cooldown` seconds, then lets a single probe call through; its outcome
+    closes the breaker again or restarts the cooldown. A probe that ends
+    without an outcome must call end_probe() so the next call can probe.
+    """
+
+    def __init__(self, name: str, threshold: int, cooldown: float):
+        """Initialize a closed breaker."""
+        self.name = name
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._probing = False
+
+    @property
+    def state(self) -> str:
+        """Get the breaker state: closed, open or half-open."""
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.cooldown:
+            return "half-open"
+        return "open"
+
+    def allow(self) -> bool:
+        """Check whether a call may go through now."""
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "half-open" and not self._probing:
+            self._probing = True
+            return True
+        return False
+
+    def end_probe(self):
+        """Free the half-open probe slot after a probe that recorded no outcome."""
+        self._probing = False
+
+    def record_success(self):
+        """Close the breaker after a successful call."""
+        if self.opened_at is not None:
+            logger.info(f"Circuit breaker '{self.name}' closed")
+        self.failures = 0
+        self.opened_at = None
+        self._probing = False
+
+    def record_failure(self):
+        """Count a failed call, opening the breaker at the threshold."""
+        self.failures += 1
+        if self._probing or self.failures >= self.threshold:
+            if self.opened_at is None or self._probing:
+                logger.warning(
+                    f"Circuit breaker '{self.name}' opened for {self.cooldown}s "
+                    f"after {self.failures} consecutive failures"
+                )
+            self.opened_at = time.monotonic()
+            self._probing = False
+
+
+def backoff_delay(attempt: int, base: float, cap: float) -> float:
+    """Exponential backoff with full jitter for the given retry attempt."""
+    return random.uniform(0, min(cap, base * 2 ** attempt))
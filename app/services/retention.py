@@ -0,0 +1,128 @@
+"""Scheduled retention cleanup of old news items."""
+import asyncio
+import logging
+import time
+import traceback
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Optional
+from sqlalchemy import delete, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models.news import NewsItem
+
+logger = logging.getLogger(__name__)
+
+
+class RetentionJob:
+    """
+    Deletes news items beyond the retention limits in small batches.
+
+    Items not seen for NEWS_RETENTION_DAYS are deleted first, then the least
+    recently seen items beyond NEWS_MAX_ITEMS. Each batch is its own short
+    transaction followed by a pause, so the cleanup never holds long locks or
+    saturates the database while the crawler is ingesting.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], AsyncSession],
+        batch_size: int = None,
+        batch_pause: float = None,
+        interval: int = None
+    ):
+        """Initialize the job."""
+        self.session_factory = session_factory
+        self.batch_size = batch_size or settings.NEWS_RETENTION_BATCH_SIZE
+        self.batch_pause = settings.NEWS_RETENTION_BATCH_PAUSE if batch_pause is None else batch_pause
+        self.interval = interval or settings.NEWS_RETENTION_INTERVAL
+        self.running = False
+        self.runs = 0
+        self.errors = 0
+        self.total_deleted = 0
+        self.last_run: Optional[Dict[str, Any]] = None
+
+    async def _delete_batch(self, ids_query) -> int:
+        """Delete one batch of the items selected by an ID subquery."""
+        async with self.session_factory() as session:
+            result = await session.execute(
+                delete(NewsItem).where(NewsItem.id.in_(ids_query)).execution_options(synchronize_session=False)
+            )
+            await session.commit()
+            return result.rowcount
+
+    async def run_once(self) -> Dict[str, Any]:
+        """Delete everything beyond the retention limits and return the run's metrics."""
+        started = time.monotonic()
+        run = {
+            "started_at": datetime.now(timezone.utc).isoformat(),
+            "deleted_by_age": 0,
+            "deleted_by_limit": 0,
+            "batches": 0,
+            "duration_seconds": None
+        }
+
+        try:
+            # Delete items older than retention period using timezone-aware UTC time
+            retention_date = datetime.now(timezone.utc) - timedelta(days=settings.NEWS_RETENTION_DAYS)
+            while True:
+                deleted = await self._delete_batch(
+                    select(NewsItem.id).where(NewsItem.last_seen_at < retention_date).limit(self.batch_size)
+                )
+                run["deleted_by_age"] += deleted
+                run["batches"] += 1
+                if deleted < self.batch_size:
+                    break
+                await asyncio.sleep(self.batch_pause)
+
+            # If we're over the max items limit, delete the oldest items
+            async with self.session_factory() as session:
+                result = await session.execute(select(func.count(NewsItem.id)))
+                overflow = result.scalar() - settings.NEWS_MAX_ITEMS
+
+            while overflow > 0:
+                await asyncio.sleep(self.batch_pause)
+                deleted = await self._delete_batch(
+                    select(NewsItem.id).order_by(NewsItem.last_seen_at.asc()).limit(min(self.batch_size, overflow))
+                )
+                run["deleted_by_limit"] += deleted
+                run["batches"] += 1
+                if deleted == 0:
+                    break
+                overflow -= deleted
+
+        except Exception as e:
+            self.errors += 1
+            run["error"] = str(e)
+            logger.error(f"Error during news cleanup: {str(e)}\n{traceback.format_exc()}")
+
+        run["duration_seconds"] = time.monotonic() - started
+        self.runs += 1
+        self.total_deleted += run["deleted_by_age"] + run["deleted_by_limit"]
+        self.last_run = run
+        logger.info(
+            f"Completed news items cleanup in {run['duration_seconds']:.1f}s: "
+            f"{run['deleted_by_age']} expired and {run['deleted_by_limit']} over the limit deleted "
+            f"in {run['batches']} batches"
+        )
+        return run
+
+    async def run_forever(self):
+        """Run the cleanup every NEWS_RETENTION_INTERVAL seconds until stopped."""
+        self.running = True
+        while self.running:
+            await self.run_once()
+            await asyncio.sleep(self.interval)
+
+    def stop(self):
+        """Stop after the current run."""
+        self.running = False
+
+    def stats(self) -> Dict[str, Any]:
+        """Get the job's counters and the metrics of its last run."""
+        return {
+            "runs": self.runs,
+            "errors": self.errors,
+            "total_deleted": self.total_deleted,
+            "last_run": self.last_run
+        }
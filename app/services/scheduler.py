@@ -0,0 +1,148 @@
+"""Concurrent crawl scheduling with per-host politeness limits."""
+import asyncio
+import logging
+import time
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional
+from urllib.parse import urlparse
+
+from app.models.url import URL
+
+logger = logging.getLogger(__name__)
+
+
+class HostLimiter:
+    """
+    Limits concurrent connections to each host and spaces out request starts.
+
+    Each host gets its own connection slots, and consecutive requests to the
+    same host start at least `delay` seconds apart.
+    """
+
+    def __init__(self, connections: int, delay: float):
+        """Initialize the limiter."""
+        self.connections = connections
+        self.delay = delay
+        self._slots: Dict[str, asyncio.Semaphore] = defaultdict(lambda: asyncio.Semaphore(self.connections))
+        self._next_start: Dict[str, float] = defaultdict(float)
+
+    @asynccontextmanager
+    async def slot(self, url: str):
+        """Hold a connection slot for the URL's host, waiting for its turn."""
+        host = urlparse(url).netloc.lower()
+        async with self._slots[host]:
+            # Reserve the next start time before sleeping so waiters queue up in order
+            now = time.monotonic()
+            start = max(now, self._next_start[host])
+            self._next_start[host] = start + self.delay
+            if start > now:
+                await asyncio.sleep(start - now)
+            yield
+
+
+class CrawlScheduler:
+    """
+    Crawls sources concurrently within a per-cycle time budget.
+
+    At most `max_sources` sources are crawled at once. Sources still running
+    when the cycle's time budget is spent are cancelled and picked up again in
+    the next cycle.
+    """
+
+    def __init__(self, crawl: Callable[[URL], Awaitable[Any]], max_sources: int, cycle_timeout: float):
+        """Initialize the scheduler."""
+        self.crawl = crawl
+        self.max_sources = max_sources
+        self.cycle_timeout = cycle_timeout
+        self.last_cycle: Optional[Dict[str, Any]] = None
+        self.sources: Dict[int, Dict[str, Any]] = {}  # URL ID -> timings of its last crawl
+
+    async def _crawl_source(
+        self,
+        url_item: URL,
+        semaphore: asyncio.Semaphore,
+        cycle_started_at: datetime,
+        cycle_sources: Dict[int, Dict[str, Any]]
+    ):
+        """Crawl one source once a slot is free and record its timings."""
+        async with semaphore:
+            started = time.monotonic()
+            started_at = datetime.now(timezone.utc)
+            # Sources never crawled before became due when the cycle started
+            due_at = url_item.next_crawl_at or cycle_started_at
+            if due_at.tzinfo is None:
+                due_at = due_at.replace(tzinfo=timezone.utc)
+            stats = {
+                "url": url_item.url,
+                "started_at": started_at.isoformat(),
+                # Time from when the source was due until its crawl started
+                "lag_seconds": max((started_at - due_at).total_seconds(), 0.0),
+                "duration_seconds": None,
+                "status": "running"
+            }
+            self.sources[url_item.id] = stats
+            cycle_sources[url_item.id] = stats
+            try:
+                await self.crawl(url_item)
+                stats["status"] = "ok"
+            except asyncio.CancelledError:
+                stats["status"] = "timed_out"
+                raise
+            except Exception as e:
+                stats["status"] = "failed"
+                logger.error(f"Error crawling {url_item.url}: {str(e)}")
+            finally:
+                stats["duration_seconds"] = time.monotonic() - started
+
+    async def run_cycle(self, urls: List[URL]) -> Dict[str, Any]:
+        """Crawl all given sources and return the cycle's metrics."""
+        cycle_start = time.monotonic()
+        started_at = datetime.now(timezone.utc)
+        semaphore = asyncio.Semaphore(self.max_sources)
+        cycle_sources: Dict[int, Dict[str, Any]] = {}
+        tasks = [
+            asyncio.ensure_future(self._crawl_source(url_item, semaphore, started_at, cycle_sources))
+            for url_item in urls
+        ]
+
+        timed_out = 0
+        if tasks:
+            _, pending = await asyncio.wait(tasks, timeout=self.cycle_timeout)
+            timed_out = len(pending)
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+                logger.warning(f"Crawl cycle hit its {self.cycle_timeout}s budget, cancelled {timed_out} sources")
+
+        crawled = list(cycle_sources.values())
+        lags = [stats["lag_seconds"] for stats in crawled]
+        self.last_cycle = {
+            "started_at": started_at.isoformat(),
+            "duration_seconds": time.monotonic() - cycle_start,
+            "sources": len(urls),
+            "ok": sum(1 for stats in crawled if stats["status"] == "ok"),
+            "failed": sum(1 for stats in crawled if stats["status"] == "failed"),
+            "timed_out": timed_out,
+            "max_lag_seconds": max(lags) if lags else 0.0
+        }
+        logger.info(
+            f"Crawl cycle finished in {self.last_cycle['duration_seconds']:.1f}s: "
+            f"{self.last_cycle['ok']} ok, {self.last_cycle['failed']} failed, {timed_out} timed out "
+            f"of {len(urls)} sources"
+        )
+        return self.last_cycle
+
+    def prune(self, url_ids: Iterable[int]):
+        """Forget the metrics of sources that are not among the given, existing ones."""
+        current = set(url_ids)
+        self.sources = {url_id: stats for url_id, stats in self.sources.items() if url_id in current}
+
+    def stats(self) -> Dict[str, Any]:
+        """Get the metrics of the last cycle and of each source."""
+        return {
+            "last_cycle": self.last_cycle,
+            "sources": list(self.sources.values())
+        }
@@ -0,0 +1,95 @@
+"""Aliases mapping other URLs of an article to its news item."""
+import logging
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+from sqlalchemy import String, any_, bindparam, literal, select, union_all
+from sqlalchemy.dialects.postgresql import ARRAY, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.news import NewsItem, NewsURLAlias
+
+logger = logging.getLogger(__name__)
+
+
+class URLAliases:
+    """
+    Resolves URLs to news items by their own URL or a recorded alias.
+
+    When a fetched article declares a <link rel="canonical"> other than the
+    URL it was discovered by, the discovered URL is recorded as an alias of
+    the canonical item. Later sightings of the alias are then resolved in
+    the discover stage's lookup and never fetched or embedded again.
+    """
+
+    def __init__(self, session_factory: Callable[[], AsyncSession]):
+        """Initialize the resolver."""
+        self.session_factory = session_factory
+        self.resolved = 0  # Discovered URLs matched to an item through an alias
+        self.duplicates = 0  # Fetched pages whose canonical item already existed
+        self.recorded = 0
+
+    async def ensure_table(self):
+        """Create the alias table if the database predates it."""
+        try:
+            async with self.session_factory() as session:
+                await session.run_sync(
+                    lambda sync_session: NewsURLAlias.__table__.create(sync_session.connection(), checkfirst=True)
+                )
+                await session.commit()
+        except Exception as e:
+            logger.error(f"Error creating the news URL alias table: {str(e)}")
+
+    def lookup_query(self, urls: Iterable[str]):
+        """
+        Select the news items with any of the given URLs as their URL or an alias.
+
+        The rows are (matched URL, item URL, failed, retry) like the negative
+        cache's, so both can be answered by one query.
+        """
+        urls = bindparam("urls", list(urls), type_=ARRAY(String))
+        return union_all(
+            select(
+                NewsItem.url,
+                NewsItem.url.label("item_url"),
+                literal(False).label("failed"),
+                literal(False).label("retry")
+            ).where(NewsItem.url == any_(urls)),
+            select(NewsURLAlias.alias, NewsItem.url, literal(False), literal(False))
+            .join(NewsItem, NewsItem.id == NewsURLAlias.news_id)
+            .where(NewsURLAlias.alias == any_(urls))
+        )
+
+    async def find_item(self, urls: Iterable[str]) -> Optional[Tuple[int, str]]:
+        """Get the ID and URL of the news item with any of the given URLs or aliases."""
+        urls = bindparam("urls", list(urls), type_=ARRAY(String))
+        async with self.session_factory() as session:
+            result = await session.execute(
+                union_all(
+                    select(NewsItem.id, NewsItem.url).where(NewsItem.url == any_(urls)),
+                    select(NewsItem.id, NewsItem.url)
+                    .join(NewsURLAlias, NewsURLAlias.news_id == NewsItem.id)
+                    .where(NewsURLAlias.alias == any_(urls))
+                ).limit(1)
+            )
+            return result.first()
+
+    async def add(self, news_id: int, aliases: Iterable[str], session: Optional[AsyncSession] = None):
+        """Record aliases of a news item, in the given session or a new one."""
+        values = [{"alias": alias, "news_id": news_id} for alias in aliases]
+        if not values:
+            return
+        statement = insert(NewsURLAlias).values(values).on_conflict_do_nothing(index_elements=["alias"])
+        if session is not None:
+            await session.execute(statement)
+        else:
+            async with self.session_factory() as own_session:
+                await own_session.execute(statement)
+                await own_session.commit()
+        self.recorded += len(values)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get the numbers of resolved, duplicate and recorded URLs."""
+        return {
+            "resolved": self.resolved,
+            "duplicates": self.duplicates,
+            "recorded": self.recorded
+        }
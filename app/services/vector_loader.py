@@ -0,0 +1,124 @@
+"""Streamed, column-projected loading of news embeddings from PostgreSQL."""
+import logging
+from dataclasses import dataclass
+from datetime import datetime
+from typing import List, Optional
+import numpy as np
+from sqlalchemy import select, func, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.news import NewsItem
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# pgvector binary format: uint16 dimensions, uint16 unused, then big-endian float32s
+VECTOR_HEADER_BYTES = 4
+
+
+@dataclass
+class VectorBatch:
+    """News embeddings loaded as contiguous arrays in row order."""
+    ids: np.ndarray  # int64, shape (n,)
+    vectors: np.ndarray  # float32, shape (n, dimension), not normalized
+    last_seen: np.ndarray  # float64 epoch seconds, shape (n,)
+    changed_at: Optional[datetime]  # Latest created_at / last_seen_at among the rows
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+
+def decode_vectors(payloads: List[bytes], out: np.ndarray):
+    """Decode pgvector binary payloads straight into the rows of a float32 matrix."""
+    dimension = out.shape[1]
+    row_bytes = VECTOR_HEADER_BYTES + 4 * dimension
+    raw = b"".join(payloads)
+    if len(raw) != row_bytes * len(payloads):
+        raise ValueError(f"Unexpected vector payload size, expected {dimension} dimensions")
+    # Strided big-endian view over the payloads, skipping each row's header
+    rows = np.ndarray(
+        shape=(len(payloads), dimension),
+        dtype=">f4",
+        buffer=raw,
+        offset=VECTOR_HEADER_BYTES,
+        strides=(row_bytes, 4)
+    )
+    out[:] = rows
+
+
+async def load_vectors(
+    db: AsyncSession,
+    since: datetime,
+    changed_after: Optional[datetime] = None,
+    batch_size: Optional[int] = None
+) -> VectorBatch:
+    """
+    Load (id, embedding, last_seen_at) of news items seen since a point in time.
+
+    Only the needed columns are selected, rows are streamed through a
+    server-side cursor in batches, and embeddings are transferred in pgvector's
+    binary format and decoded into one preallocated float32 matrix.
+
+    Args:
+        db: Database session
+        since: Only include items with last_seen_at at or after this time
+        changed_after: Only include items created or seen after this time
+        batch_size: Rows fetched per round trip
+
+    Returns:
+        VectorBatch with the loaded rows
+    """
+    batch_size = batch_size or settings.VECTOR_LOAD_BATCH_SIZE
+    dimension = settings.VECTOR_DIMENSIONS
+
+    filters = [
+        NewsItem.last_seen_at >= since,
+        NewsItem.embedding.is_not(None)
+    ]
+    if changed_after is not None:
+        filters.append(or_(
+            NewsItem.created_at > changed_after,
+            NewsItem.last_seen_at > changed_after
+        ))
+
+    # Size the matrix up front; rows inserted meanwhile grow it below
+    result = await db.execute(select(func.count(NewsItem.id)).filter(*filters))
+    capacity = result.scalar() or 0
+
+    ids = np.empty(capacity, dtype=np.int64)
+    vectors = np.empty((capacity, dimension), dtype=np.float32)
+    last_seen = np.empty(capacity, dtype=np.float64)
+    changed_at = None
+    count = 0
+
+    stmt = select(
+        NewsItem.id,
+        func.vector_send(NewsItem.embedding),
+        NewsItem.last_seen_at,
+        NewsItem.created_at
+    ).filter(*filters).execution_options(yield_per=batch_size)
+
+    stream = await db.stream(stmt)
+    async for partition in stream.partitions(batch_size):
+        end = count + len(partition)
+        if end > capacity:
+            capacity = max(end, capacity * 2)
+            ids = np.resize(ids, capacity)
+            vectors = np.resize(vectors, (capacity, dimension))
+            last_seen = np.resize(last_seen, capacity)
+
+        decode_vectors([row[1] for row in partition], vectors[count:end])
+        ids[count:end] = [row[0] for row in partition]
+        last_seen[count:end] = [row[2].timestamp() for row in partition]
+
+        latest = max(max(row[2], row[3]) for row in partition)
+        changed_at = latest if changed_at is None else max(changed_at, latest)
+        count = end
+
+    logger.info(f"Loaded {count} vectors in batches of {batch_size}")
+    return VectorBatch(
+        ids=ids[:count],
+        vectors=vectors[:count],
+        last_seen=last_seen[:count],
+        changed_at=changed_at
+    )
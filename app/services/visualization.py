@@ -8,13 +8,59 @@ import numpy as np
 from sqlalchemy import select, text, update, func
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models.news import NewsItem, NewsClusters, NewsUMAP
+from app.models.news import NewsItem, NewsClusters, NewsDendrogram, NewsUMAP
 from app.models.preference_vector import PreferenceVector
+from app.services.clustering import cut_tree
+from app.services.enrichment import request_enrichment
+from app.services.vector_loader import load_vectors
 from app.services.faiss_service import get_faiss_service
 from app.config import settings
 
 logger = logging.getLogger(__name__)
 
+async def enrich_clusters(db: AsyncSession, clusters: Dict[int, List[dict]]) -> Dict[int, List[dict]]:
+    """Attach news item details from the database to clusters of {id, similarity} items."""
+    # Get all clustered news items in a single query
+    news_ids = [item['id'] for items in clusters.values() for item in items]
+    stmt = select(NewsItem).filter(NewsItem.id.in_(news_ids))
+    result = await db.execute(stmt)
+    news_items = {item.id: item for item in result.scalars().all()}
+    
+    enriched_clusters: Dict[int, List[dict]] = {}
+    
+    for cluster_id, items in clusters.items():
+        try:
+            # Create enriched items
+            enriched_items = []
+            for item in items:
+                news_item = news_items.get(item['id'])
+                if news_item:
+                    enriched_items.append({
+                        "id": news_item.id,
+                        "title": news_item.title,
+                        "summary": news_item.summary,
+                        "url": news_item.url,
+                        "source_url": news_item.source_url,
+                        "first_seen_at": news_item.first_seen_at.isoformat() if news_item.first_seen_at else None,
+                        "last_seen_at": news_item.last_seen_at.isoformat() if news_item.last_seen_at else None,
+                        "hit_count": news_item.hit_count,
+                        "created_at": news_item.created_at.isoformat() if news_item.created_at else None,
+                        "updated_at": news_item.updated_at.isoformat() if news_item.updated_at else None,
+                        "similarity": item['similarity'],
+                        "cluster_id": cluster_id
+                    })
+            
+            if enriched_items:
+                enriched_clusters[cluster_id] = enriched_items
+            else:
+                logger.warning(f"No news items found for cluster {cluster_id}")
+                
+        except Exception as e:
+            logger.error(f"Error enriching cluster {cluster_id}: {str(e)}\n{traceback.format_exc()}")
+            continue
+    
+    return enriched_clusters
+
 async def generate_clusters(db: AsyncSession, hours: int, min_similarity: float) -> Dict[int, List[dict]]:
     """Generate news clusters using FAISS vector similarity."""
     try:
@@ -29,48 +75,7 @@ async def generate_clusters(db: AsyncSession, hours: int, min_similarity: float)
             return {}
             
         # Enrich cluster data with additional news item details from database
-        enriched_clusters: Dict[int, List[dict]] = {}
-        
-        for cluster_id, items in clusters.items():
-            try:
-                # Get all news IDs in this cluster
-                news_ids = [item['id'] for item in items]
-                
-                # Get full news items from database
-                stmt = select(NewsItem).filter(NewsItem.id.in_(news_ids))
-                result = await db.execute(stmt)
-                news_items = {item.id: item for item in result.scalars().all()}
-                
-                if not news_items:
-                    logger.warning(f"No news items found for cluster {cluster_id}")
-                    continue
-                
-                # Create enriched items
-                enriched_items = []
-                for item in items:
-                    news_item = news_items.get(item['id'])
-                    if news_item:
-                        enriched_items.append({
-                            "id": news_item.id,
-                            "title": news_item.title,
-                            "summary": news_item.summary,
-                            "url": news_item.url,
-                            "source_url": news_item.source_url,
-                            "first_seen_at": news_item.first_seen_at.isoformat() if news_item.first_seen_at else None,
-                            "last_seen_at": news_item.last_seen_at.isoformat() if news_item.last_seen_at else None,
-                            "hit_count": news_item.hit_count,
-                            "created_at": news_item.created_at.isoformat() if news_item.created_at else None,
-                            "updated_at": news_item.updated_at.isoformat() if news_item.updated_at else None,
-                            "similarity": item['similarity'],
-                            "cluster_id": cluster_id
-                        })
-                
-                if enriched_items:
-                    enriched_clusters[cluster_id] = enriched_items
-                    
-            except Exception as e:
-                logger.error(f"Error enriching cluster {cluster_id}: {str(e)}\n{traceback.format_exc()}")
-                continue
+        enriched_clusters = await enrich_clusters(db, clusters)
         
         logger.info(f"Generated {len(enriched_clusters)} enriched clusters")
         return enriched_clusters
@@ -79,6 +84,74 @@ async def generate_clusters(db: AsyncSession, hours: int, min_similarity: float)
         logger.error(f"Clustering error: {str(e)}\n{traceback.format_exc()}")
         raise
 
+async def get_clusters_at_threshold(db: AsyncSession, hours: int, min_similarity: float) -> Dict[int, List[dict]]:
+    """
+    Get news clusters for an arbitrary similarity threshold.
+    
+    Cuts the pre-generated cluster tree when one exists for the time range and
+    covers the threshold, otherwise falls back to generating clusters directly.
+    """
+    try:
+        result = await db.execute(
+            select(NewsDendrogram).filter(NewsDendrogram.hours == hours)
+        )
+        dendrogram = result.scalar_one_or_none()
+        
+        if not dendrogram or min_similarity < dendrogram.floor_similarity:
+            logger.info(f"No cluster tree covers {hours}h at {min_similarity} similarity, generating clusters")
+            return await generate_clusters(db, hours, min_similarity)
+        
+        clusters = cut_tree(dendrogram.news_ids, dendrogram.edges, min_similarity)
+        if not clusters:
+            return {}
+        
+        return await enrich_clusters(db, clusters)
+        
+    except Exception as e:
+        logger.error(f"Error cutting cluster tree: {str(e)}\n{traceback.format_exc()}")
+        raise
+
+async def ensure_dendrogram_table(db: AsyncSession):
+    """Create the cluster tree table if the database predates it."""
+    try:
+        await db.run_sync(
+            lambda sync_session: NewsDendrogram.__table__.create(sync_session.connection(), checkfirst=True)
+        )
+        await db.commit()
+    except Exception as e:
+        logger.error(f"Error creating the news dendrogram table: {str(e)}")
+        await db.rollback()
+
+async def update_dendrogram(db: AsyncSession, hours: int):
+    """Recompute and store the single-linkage cluster tree for a time range."""
+    floor_similarity = settings.CLUSTER_SIMILARITY_FLOOR
+    
+    faiss_service = get_faiss_service()
+    news_ids, edges = await faiss_service.get_dendrogram(db, hours, floor_similarity)
+    
+    result = await db.execute(
+        select(NewsDendrogram).filter(NewsDendrogram.hours == hours)
+    )
+    existing = result.scalar_one_or_none()
+    
+    if existing:
+        stmt = update(NewsDendrogram).where(
+            NewsDendrogram.hours == hours
+        ).values(
+            floor_similarity=floor_similarity,
+            news_ids=news_ids,
+            edges=edges,
+            created_at=func.now()
+        )
+        await db.execute(stmt)
+    else:
+        db.add(NewsDendrogram(
+            hours=hours,
+            floor_similarity=floor_similarity,
+            news_ids=news_ids,
+            edges=edges
+        ))
+
 async def generate_umap_visualization(db: AsyncSession, hours: int, min_similarity: float) -> List[dict]:
     """Generate UMAP visualization data."""
     try:
@@ -95,18 +168,27 @@ async def generate_umap_visualization(db: AsyncSession, hours: int, min_similari
         now = datetime.now(timezone.utc)
         time_filter = now - timedelta(hours=hours)
         
-        # Get all news items with embeddings from the specified time period
-        stmt = select(NewsItem).filter(
-            NewsItem.last_seen_at >= time_filter,
-            NewsItem.embedding.is_not(None)
-        ).order_by(NewsItem.last_seen_at.desc())
+        # Stream id/embedding/last_seen_at of all news items with embeddings
+        # from the specified time period, newest first
+        batch = await load_vectors(db, since=time_filter)
         
-        result = await db.execute(stmt)
-        news_items = result.scalars().all()
-        
-        if not news_items:
+        if not len(batch):
             logger.warning("No news items found for UMAP visualization")
             return []
+        
+        order = np.argsort(-batch.last_seen, kind="stable")
+        news_ids = batch.ids[order].tolist()
+        
+        # Get the display columns only, without embeddings
+        stmt = select(
+            NewsItem.id,
+            NewsItem.title,
+            NewsItem.url,
+            NewsItem.source_url,
+            NewsItem.last_seen_at
+        ).filter(NewsItem.id.in_(news_ids))
+        result = await db.execute(stmt)
+        news_rows = {row.id: row for row in result.all()}
 
         # Get preference vectors from PostgreSQL
         stmt = select(PreferenceVector).filter(PreferenceVector.embedding.is_not(None))
@@ -120,19 +202,13 @@ async def generate_umap_visualization(db: AsyncSession, hours: int, min_similari
         is_pref_vector = []  # Track which items are preference vectors
 
         # Add news item embeddings
-        for item in news_items:
-            try:
-                # Convert pgvector to numpy array
-                vector = np.array(item.embedding.tolist(), dtype=np.float32)
-                if vector.shape != (settings.VECTOR_DIMENSIONS,):
-                    logger.error(f"Invalid vector shape for news item {item.id}: {vector.shape}")
-                    continue
-                all_embeddings.append(vector)
-                all_items.append(item)
-                is_pref_vector.append(False)
-            except Exception as e:
-                logger.error(f"Error processing embedding for news item {item.id}: {str(e)}")
+        for news_id, vector in zip(news_ids, batch.vectors[order]):
+            item = news_rows.get(news_id)
+            if item is None:
                 continue
+            all_embeddings.append(vector)
+            all_items.append(item)
+            is_pref_vector.append(False)
 
         # Add preference vector embeddings
         for vector in preference_vectors:
@@ -295,6 +371,17 @@ async def update_visualizations(db: AsyncSession):
                     clusters=clusters_data
                 )
                 db.add(clusters)
+            
+            # Clustered feed-only items are worth their full article
+            await request_enrichment(db, [item["id"] for items in clusters_data.values() for item in items])
+            
+            # Store the cluster tree so other thresholds can be served without reclustering;
+            # in a savepoint, so a failure keeps the visualization and clusters above
+            try:
+                async with db.begin_nested():
+                    await update_dendrogram(db, hours)
+            except Exception as e:
+                logger.error(f"Error updating the cluster tree for {hours}h: {str(e)}\n{traceback.format_exc()}")
                 
         except Exception as e:
             logger.error(f"Error updating visualizations for {hours}h and {min_similarity} similarity: {str(e)}\n{traceback.format_exc()}")
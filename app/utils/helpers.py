@@ -48,6 +48,10 @@ def normalize_url(url: str, base_url: str = None) -> Optional[str]:
         # Reconstruct the URL without fragments
         normalized = f"{parsed.scheme}://{parsed.netloc}{parsed.path}"
         
+        # Keep ;parameters of the last path segment, they can be part of the address
+        if parsed.params:
+            normalized = f"{normalized};{parsed.params}"
+        
         # Add query parameters if they exist
         if parsed.query:
             normalized = f"{normalized}?{parsed.query}"
@@ -57,6 +61,109 @@ def normalize_url(url: str, base_url: str = None) -> Optional[str]:
         logger.error(f"Error normalizing URL {url}: {str(e)}")
         return None
 
+# Query parameters that only track where a visitor came from
+TRACKING_PARAMS = {
+    "fbclid", "gclid", "gclsrc", "dclid", "msclkid", "yclid", "igshid", "mc_cid", "mc_eid",
+    "_ga", "_gl", "cmpid", "ocid", "ncid", "smid", "mbid", "ref_src", "ref_url", "sr_share",
+    "s_cid", "wt_mc", "at_medium", "at_campaign", "amp", "outputtype"
+}
+TRACKING_PARAM_PREFIXES = ("utm_",)
+
+# Session IDs servers add as ;jsessionid=... path parameters or to the query
+SESSION_PARAMS = {"jsessionid", "phpsessid"}
+
+# Ports implied by the scheme
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+def _is_tracking_param(key: str) -> bool:
+    """Check if a lowercased query parameter name is a tracking parameter."""
+    return key in TRACKING_PARAMS or key.startswith(TRACKING_PARAM_PREFIXES)
+
+def strip_tracking_params(url: str, base_url: str = None) -> Optional[str]:
+    """
+    Get the address to fetch and store for a discovered URL.
+    
+    On top of normalize_url, drops session IDs and tracking and AMP query
+    parameters, keeping everything else as written. Returns None for URLs
+    that are not http(s).
+    """
+    normalized = normalize_url(url, base_url)
+    if not normalized:
+        return None
+    
+    try:
+        parsed = urlparse(normalized)
+        if parsed.scheme.lower() not in DEFAULT_PORTS or not parsed.hostname:
+            return None
+        
+        stripped = f"{parsed.scheme}://{parsed.netloc}{parsed.path}"
+        path_params = [
+            param
+            for param in parsed.params.split(";")
+            if param and param.split("=", 1)[0].lower() not in SESSION_PARAMS
+        ]
+        if path_params:
+            stripped = f"{stripped};{';'.join(path_params)}"
+        
+        params = [
+            param
+            for param in parsed.query.split("&")
+            if param and not _is_tracking_param(param.split("=", 1)[0].lower())
+            and param.split("=", 1)[0].lower() not in SESSION_PARAMS
+        ]
+        if params:
+            stripped = f"{stripped}?{'&'.join(params)}"
+        return stripped
+    except Exception as e:
+        logger.error(f"Error stripping tracking parameters from URL {url}: {str(e)}")
+        return None
+
+def canonicalize_url(url: str, base_url: str = None) -> Optional[str]:
+    """
+    Canonicalize a URL so that variants of the same article compare equal.
+    
+    Only meant as a lookup key; the URL to fetch and store is the one from
+    strip_tracking_params. On top of that, lowercases the scheme and host,
+    drops default ports and a trailing /amp path segment, and sorts the
+    query parameters. Returns None for URLs that are not http(s).
+    """
+    stripped = strip_tracking_params(url, base_url)
+    if not stripped:
+        return None
+    
+    try:
+        parsed = urlparse(stripped)
+        scheme = parsed.scheme.lower()
+        host = parsed.hostname.rstrip(".")
+        if parsed.port and parsed.port != DEFAULT_PORTS[scheme]:
+            host = f"{host}:{parsed.port}"
+        userinfo, _, _ = parsed.netloc.rpartition("@")
+        if userinfo:
+            host = f"{userinfo}@{host}"
+        
+        path = parsed.path or "/"
+        trailing_slash = "/" if path.endswith("/") else ""
+        if path.rstrip("/").endswith("/amp"):
+            path = path.rstrip("/")[:-len("/amp")] + trailing_slash or "/"
+        if parsed.params:
+            path = f"{path};{parsed.params}"
+        
+        canonical = f"{scheme}://{host}{path}"
+        if parsed.query:
+            canonical = f"{canonical}?{'&'.join(sorted(parsed.query.split('&')))}"
+        return canonical
+    except Exception as e:
+        logger.error(f"Error canonicalizing URL {url}: {str(e)}")
+        return None
+
+def alternate_scheme(url: str) -> str:
+    """Get the https URL of an http URL and vice versa."""
+    if url.startswith("http://"):
+        return "https://" + url[len("http://"):]
+    if url.startswith("https://"):
+        return "http://" + url[len("https://"):]
+    return url
+
 def extract_domain(url: str) -> Optional[str]:
     """Extract the domain from a URL."""
     try:
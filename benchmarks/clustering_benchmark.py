@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""Check the similarity-graph clustering against the previous FAISS scan clustering.
+
+Run with:
+    python -m benchmarks.clustering_benchmark --vectors 1000 10000 50000 --thresholds 0.4 0.55 0.7
+
+Both implementations cluster the same fixed-seed synthetic corpus of
+normalized, topic-clustered vectors. The benchmark reports the time each
+takes and whether they find the same clusters, with the same members and
+numbered in the same order; it exits with status 1 if any differ. The
+previous implementation scans the whole index once per cluster member and
+growth round, so it is only run up to --reference-max vectors.
+"""
+import argparse
+import logging
+import sys
+import time
+from typing import Dict, List, Sequence
+import numpy as np
+import faiss
+
+from app.services.clustering import transitive_clusters
+from benchmarks.corpus import synthetic_corpus
+
+logging.basicConfig(
+    level=logging.WARNING,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+
+logger = logging.getLogger(__name__)
+
+
+def reference_clusters(vectors: np.ndarray, news_ids: Sequence[int], min_similarity: float) -> Dict[int, List[dict]]:
+    """
+    Cluster the way FaissService.get_clusters did before the similarity graph, kept as the baseline.
+
+    Every unclustered vector searches the whole index, then every cluster
+    member searches it again until a round adds no member.
+    """
+    index = faiss.IndexFlatL2(vectors.shape[1])
+    index.add(vectors)
+
+    # For normalized vectors: L2^2 = 2(1 - cos_sim)
+    max_l2_squared = 2 * (1 - min_similarity)
+
+    clusters = {}
+    used_indices = set()
+    cluster_id = 0
+    for i in range(len(vectors)):
+        if i in used_indices:
+            continue
+
+        D, I = index.search(vectors[i:i + 1], index.ntotal)
+        similar_indices = set(I[0][D[0] <= max_l2_squared])
+        if len(similar_indices) <= 1:
+            continue
+
+        cluster_growing = True
+        while cluster_growing:
+            size_before = len(similar_indices)
+            for idx in list(similar_indices):
+                if idx >= 0:
+                    D_new, I_new = index.search(vectors[idx:idx + 1], index.ntotal)
+                    similar_indices.update(I_new[0][D_new[0] <= max_l2_squared])
+            cluster_growing = len(similar_indices) > size_before
+
+        cluster_items = []
+        for idx in similar_indices:
+            if idx >= 0 and idx not in used_indices:
+                used_indices.add(idx)
+                D_center, _ = index.search(vectors[i:i + 1], 1)
+                cluster_items.append({'id': news_ids[idx], 'similarity': 1 - (float(D_center[0][0]) / 2)})
+
+        if len(cluster_items) > 1:
+            clusters[cluster_id] = cluster_items
+            cluster_id += 1
+
+    return clusters
+
+
+def cluster_members(clusters: Dict[int, List[dict]]) -> Dict[int, List[int]]:
+    """Get each cluster's sorted member IDs; similarities are not compared."""
+    return {cluster_id: sorted(item['id'] for item in items) for cluster_id, items in clusters.items()}
+
+
+def run(sizes: List[int], thresholds: List[float], dimension: int, reference_max: int) -> bool:
+    """Cluster each corpus size at each threshold with both implementations and report the results."""
+    identical = True
+    print(f"{'vectors':>8} {'threshold':>9} {'clusters':>8} {'new s':>8} {'old s':>8} {'speedup':>8}  result")
+    for n in sizes:
+        vectors = synthetic_corpus(n, dimension, topics=max(n // 50, 1))
+        news_ids = list(range(n))
+        for threshold in thresholds:
+            start = time.perf_counter()
+            clusters = transitive_clusters(vectors, news_ids, threshold)
+            new_seconds = time.perf_counter() - start
+
+            if n > reference_max:
+                print(f"{n:>8} {threshold:>9.2f} {len(clusters):>8} {new_seconds:>8.3f} {'-':>8} {'-':>8}  reference skipped")
+                continue
+
+            start = time.perf_counter()
+            expected = reference_clusters(vectors, news_ids, threshold)
+            old_seconds = time.perf_counter() - start
+
+            same = cluster_members(clusters) == cluster_members(expected)
+            identical = identical and same
+            print(
+                f"{n:>8} {threshold:>9.2f} {len(clusters):>8} {new_seconds:>8.3f} {old_seconds:>8.3f} "
+                f"{old_seconds / new_seconds:>7.1f}x  {'identical' if same else 'DIFFERENT'}"
+            )
+    return identical
+
+
+def main():
+    """Parse arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--vectors", type=int, nargs="+", default=[1000, 10000, 50000], help="Corpus sizes")
+    parser.add_argument("--thresholds", type=float, nargs="+", default=[0.4, 0.55, 0.7], help="Similarity thresholds")
+    parser.add_argument("--dimension", type=int, default=1024, help="Vector dimensions")
+    parser.add_argument(
+        "--reference-max",
+        type=int,
+        default=10000,
+        help="Largest corpus the previous implementation is run on"
+    )
+    args = parser.parse_args()
+
+    if not run(args.vectors, args.thresholds, args.dimension, args.reference_max):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
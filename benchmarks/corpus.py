@@ -0,0 +1,13 @@
+"""Synthetic embedding corpora shared by the benchmarks."""
+import numpy as np
+
+
+def synthetic_corpus(n: int, dimension: int, topics: int, seed: int = 42) -> np.ndarray:
+    """Generate normalized vectors scattered around a set of topic centers."""
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(topics, dimension)).astype(np.float32)
+    assignments = rng.integers(0, topics, size=n)
+    noise = rng.normal(size=(n, dimension)).astype(np.float32)
+    spread = rng.uniform(0.5, 1.5, size=(n, 1)).astype(np.float32)
+    vectors = centers[assignments] + noise * spread
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
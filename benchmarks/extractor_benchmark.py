@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""Benchmark content and link extraction against the previous extractor.
+
+Run with:
+    python -m benchmarks.extractor_benchmark --pages fixtures/articles --repeat 3
+    python -m benchmarks.extractor_benchmark --mode links --pages fixtures/homepages
+
+Every *.html file in the pages directory is treated as a saved page of the
+host it is named after (www.example.com.html is https://www.example.com/),
+which links are resolved against. The benchmark reports pages/second for
+both extractors and how many pages they extract identically; pages whose
+output differs are listed.
+"""
+import argparse
+import difflib
+import logging
+import re
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import urljoin, urlparse
+from bs4 import BeautifulSoup
+from newspaper import Article
+from readability import Document
+
+from app.services.extractor import ContentExtractor
+
+logging.basicConfig(
+    level=logging.WARNING,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+
+logger = logging.getLogger(__name__)
+
+
+class ReferenceExtractor(ContentExtractor):
+    """
+    The extractor before the single-parse paths, kept as the baseline.
+
+    For content, readability-lxml parses the page, BeautifulSoup re-parses
+    its summary, newspaper3k parses the page a third time, and each noise
+    pattern is a separate re.sub pass. For links, every anchor's whole
+    parent is walked for context and duplicates are found by list search.
+    """
+
+    def extract_content(self, html: str, url: str) -> Optional[Dict[str, str]]:
+        """Extract content with readability-lxml, falling back to newspaper3k."""
+        if not html:
+            return None
+
+        content = None
+        try:
+            content = self._extract_with_readability(html)
+            if content and len(content["summary"]) >= self.min_content_length:
+                return content
+        except Exception:
+            pass
+
+        try:
+            content = self._extract_with_newspaper(html, url)
+            if content and len(content["summary"]) >= self.min_content_length:
+                return content
+        except Exception:
+            pass
+
+        if content and content["summary"]:
+            return content
+        return None
+
+    def _extract_with_readability(self, html: str) -> Optional[Dict[str, str]]:
+        """Extract content using readability-lxml."""
+        doc = Document(html)
+        title = doc.title()
+        summary = doc.summary()
+
+        soup = BeautifulSoup(summary, "lxml")
+        clean_text = self._clean_text(soup.get_text())
+
+        return {
+            "title": title,
+            "summary": self._truncate_text(clean_text)
+        }
+
+    def _extract_with_newspaper(self, html: str, url: str) -> Optional[Dict[str, str]]:
+        """Extract content using newspaper3k."""
+        article = Article(url, fetch_images=False)
+        article.set_html(html)
+        article.parse()
+
+        text = article.text
+        if not text:
+            return None
+
+        clean_text = self._clean_text(text)
+
+        return {
+            "title": article.title,
+            "summary": self._truncate_text(clean_text)
+        }
+
+    def extract_links(self, html: str, base_url: str) -> List[Dict[str, str]]:
+        """Extract same-site links with BeautifulSoup, deduplicating by list search."""
+        links = []
+
+        try:
+            soup = BeautifulSoup(html, "lxml")
+            base_domain = urlparse(base_url).netloc
+
+            for a_tag in soup.find_all("a", href=True):
+                href = a_tag["href"]
+                if not href or href.startswith("#"):
+                    continue
+
+                absolute_url = urljoin(base_url, href)
+                url_domain = urlparse(absolute_url).netloc
+                if not url_domain.endswith(base_domain) and base_domain not in url_domain:
+                    continue
+                if not absolute_url.startswith(("http://", "https://")):
+                    continue
+
+                title = a_tag.get_text(strip=True) or a_tag.get("title", "")
+                if not title:
+                    continue
+
+                parent = a_tag.parent
+                context = ""
+                if parent:
+                    context = parent.get_text(strip=True)
+                    if len(context) > 100:
+                        context = context[:100]
+
+                if len(title) < 10 and len(context) > len(title):
+                    title = context
+
+                if len(title) >= 5:
+                    link_info = {"title": title, "url": absolute_url}
+                    if link_info not in links:
+                        links.append(link_info)
+
+            return links
+
+        except Exception:
+            return []
+
+    def _clean_text(self, text: str) -> str:
+        """Clean extracted text content."""
+        if not text:
+            return ""
+
+        text = ' '.join(text.split())
+
+        noise_patterns = [
+            r'Share this:',
+            r'Follow us on Twitter',
+            r'Like us on Facebook',
+            r'Subscribe to our newsletter',
+            r'Comments?',
+            r'©\s*\d{4}',  # Copyright notices
+            r'All rights reserved',
+            r'Terms of [Ss]ervice',
+            r'Privacy [Pp]olicy'
+        ]
+
+        for pattern in noise_patterns:
+            text = re.sub(pattern, '', text)
+
+        return text.strip()
+
+
+def load_pages(directory: str) -> List[Tuple[str, str, str]]:
+    """Load the saved pages as (name, URL, HTML) tuples."""
+    pages = []
+    for path in sorted(Path(directory).glob("*.html")):
+        html = path.read_text(encoding="utf-8", errors="replace")
+        pages.append((path.name, f"https://{path.stem}/", html))
+    return pages
+
+
+def measure(
+    extract: Callable[[str, str], Any],
+    pages: List[Tuple[str, str, str]],
+    repeat: int
+) -> Tuple[float, List[Any]]:
+    """Extract every page `repeat` times; returns pages/second and the last results."""
+    results = []
+    start = time.perf_counter()
+    for _ in range(repeat):
+        results = [extract(html, url) for _, url, html in pages]
+    return len(pages) * repeat / (time.perf_counter() - start), results
+
+
+def run(mode: str, directory: str, repeat: int):
+    """Benchmark both extractors on the saved pages and compare their output."""
+    pages = load_pages(directory)
+    # Per-page extraction logs would drown the report
+    logging.getLogger("app.services.extractor").setLevel(logging.CRITICAL)
+    if not pages:
+        print(f"No *.html pages found in {directory}")
+        return
+
+    reference, current = ReferenceExtractor(), ContentExtractor()
+    if mode == "links":
+        reference_pps, expected = measure(reference.extract_links, pages, repeat)
+        current_pps, actual = measure(current.extract_links, pages, repeat)
+    else:
+        reference_pps, expected = measure(reference.extract_content, pages, repeat)
+        current_pps, actual = measure(current.extract_content, pages, repeat)
+        # The reference extractor does not read canonical links
+        actual = [
+            {key: value for key, value in content.items() if key != "canonical_url"} if content else content
+            for content in actual
+        ]
+
+    print(f"{'extractor':<12} {'pages/s':>10}")
+    print(f"{'reference':<12} {reference_pps:>10.1f}")
+    print(f"{'current':<12} {current_pps:>10.1f}")
+    print(f"speedup: {current_pps / reference_pps:.2f}x over {len(pages)} pages")
+
+    different = [
+        (name, old, new)
+        for (name, _, _), old, new in zip(pages, expected, actual)
+        if old != new
+    ]
+    print(f"identical output: {len(pages) - len(different)}/{len(pages)} pages")
+    for name, old, new in different:
+        if mode == "links":
+            print(f"  {name}: {len(old)} links before, {len(new)} now, {sum(1 for link in new if link not in old)} new")
+            continue
+        old_summary = old["summary"] if old else ""
+        new_summary = new["summary"] if new else ""
+        similarity = difflib.SequenceMatcher(None, old_summary, new_summary).ratio()
+        same_title = (old or {}).get("title") == (new or {}).get("title")
+        print(f"  {name}: summary similarity {similarity:.3f}, title {'same' if same_title else 'differs'}")
+
+
+def main():
+    """Parse arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--mode", choices=["content", "links"], default="content", help="What to extract")
+    parser.add_argument("--pages", required=True, help="Directory of saved article pages (*.html)")
+    parser.add_argument("--repeat", type=int, default=1, help="Passes over the pages per extractor")
+    args = parser.parse_args()
+    run(args.mode, args.pages, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""Benchmark FAISS index factories for recall, query throughput and memory.
+
+Run with:
+    python -m benchmarks.faiss_benchmark --vectors 50000 --factories Flat HNSW32 "IVF1024,PQ64" SQ8
+
+Recall@k is measured against exact (Flat) search on a synthetic corpus of
+normalized, topic-clustered vectors shaped like the news embeddings.
+"""
+import argparse
+import logging
+import os
+import time
+from typing import List, Optional
+import numpy as np
+import faiss
+
+from app.services.faiss_service import build_index
+from benchmarks.corpus import synthetic_corpus
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+
+logger = logging.getLogger(__name__)
+
+
+def resident_memory() -> Optional[int]:
+    """Get the resident set size of this process in bytes (Linux only)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except Exception:
+        return None
+
+
+def run(n: int, queries: int, dimension: int, k: int, factories: List[str], search_params: str):
+    """Build each index type over the same corpus and report its metrics."""
+    corpus = synthetic_corpus(n + queries, dimension, topics=max(n // 50, 1))
+    data, query_vectors = corpus[:n], corpus[n:]
+    ids = np.arange(n, dtype=np.int64)
+
+    exact = build_index("Flat", dimension)
+    exact.add_with_ids(data, ids)
+    _, truth = exact.search(query_vectors, k)
+    del exact
+
+    print(f"{'factory':<20} {'build s':>8} {'recall@' + str(k):>10} {'QPS':>10} {'index MB':>9} {'RSS +MB':>8}")
+    for factory in factories:
+        rss_before = resident_memory()
+        start = time.perf_counter()
+        index = build_index(factory, dimension, data, search_params)
+        index.add_with_ids(data, ids)
+        build_seconds = time.perf_counter() - start
+        rss_after = resident_memory()
+
+        start = time.perf_counter()
+        _, found = index.search(query_vectors, k)
+        qps = queries / (time.perf_counter() - start)
+
+        recall = np.mean([
+            len(set(found[i]) & set(truth[i])) / k
+            for i in range(queries)
+        ])
+        index_mb = faiss.serialize_index(index).nbytes / 2**20
+        rss_mb = (rss_after - rss_before) / 2**20 if rss_before and rss_after else float("nan")
+
+        print(f"{factory:<20} {build_seconds:>8.2f} {recall:>10.3f} {qps:>10.0f} {index_mb:>9.1f} {rss_mb:>8.1f}")
+        del index
+
+
+def main():
+    """Parse arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--vectors", type=int, default=10000, help="Corpus size")
+    parser.add_argument("--queries", type=int, default=1000, help="Number of queries")
+    parser.add_argument("--dimension", type=int, default=1024, help="Vector dimensions")
+    parser.add_argument("--k", type=int, default=10, help="Neighbours per query for recall@k")
+    parser.add_argument("--search-params", default="", help="FAISS ParameterSpace string, e.g. nprobe=16")
+    parser.add_argument(
+        "--factories",
+        nargs="+",
+        default=["Flat", "HNSW32", "IVF256,SQ8", "IVF256,PQ64", "SQ8"],
+        help="FAISS index factory strings to compare"
+    )
+    args = parser.parse_args()
+
+    run(args.vectors, args.queries, args.dimension, args.k, args.factories, args.search_params)
+
+
+if __name__ == "__main__":
+    main()
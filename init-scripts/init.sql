@@ -86,6 +86,57 @@ CREATE TABLE IF NOT EXISTS news_clusters (
 -- Create index on hours and min_similarity for quick lookups
 CREATE INDEX IF NOT EXISTS news_clusters_lookup_idx ON news_clusters(hours, min_similarity);
 
+-- Create table for pre-generated single-linkage cluster trees
+CREATE TABLE IF NOT EXISTS news_dendrogram (
+    id SERIAL PRIMARY KEY,
+    hours INTEGER NOT NULL UNIQUE,
+    floor_similarity FLOAT NOT NULL,
+    news_ids JSONB NOT NULL,
+    edges JSONB NOT NULL,
+    created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW()
+);
+
+-- Create table for feed-only news items waiting for their article page to be extracted
+CREATE TABLE IF NOT EXISTS news_enrichment (
+    news_id INTEGER PRIMARY KEY REFERENCES news(id) ON DELETE CASCADE,
+    requested_at TIMESTAMP WITH TIME ZONE,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW()
+);
+
+-- Create index on request time for picking the next items to enrich
+CREATE INDEX IF NOT EXISTS news_enrichment_requested_idx ON news_enrichment(requested_at);
+
+-- Create table for other URLs of a news item's article, resolved through <link rel="canonical">
+CREATE TABLE IF NOT EXISTS news_url_aliases (
+    alias TEXT PRIMARY KEY,
+    news_id INTEGER NOT NULL REFERENCES news(id) ON DELETE CASCADE,
+    created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW()
+);
+
+-- Create index on news_id for deleting aliases with their item
+CREATE INDEX IF NOT EXISTS news_url_aliases_news_id_idx ON news_url_aliases(news_id);
+
+-- Create table for the MinHash signatures used to find near-duplicate news items
+CREATE TABLE IF NOT EXISTS news_fingerprints (
+    news_id INTEGER PRIMARY KEY REFERENCES news(id) ON DELETE CASCADE,
+    minhash BYTEA NOT NULL
+);
+
+-- Create table for article URLs that recently failed to be ingested
+CREATE TABLE IF NOT EXISTS failed_urls (
+    url TEXT PRIMARY KEY,
+    reason VARCHAR(50) NOT NULL,
+    failures INTEGER NOT NULL DEFAULT 1,
+    first_failed_at TIMESTAMP WITH TIME ZONE NOT NULL,
+    last_failed_at TIMESTAMP WITH TIME ZONE NOT NULL,
+    retry_at TIMESTAMP WITH TIME ZONE NOT NULL,
+    expires_at TIMESTAMP WITH TIME ZONE NOT NULL
+);
+
+-- Create index on expiry time for pruning expired entries
+CREATE INDEX IF NOT EXISTS failed_urls_expires_idx ON failed_urls(expires_at);
+
 -- Create table for pre-generated UMAP visualizations
 CREATE TABLE IF NOT EXISTS news_umap (
     id SERIAL PRIMARY KEY,